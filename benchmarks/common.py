@@ -0,0 +1,95 @@
+"""helpers shared by the benchmark scripts"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def timed(results, name):
+    """Adds the wall time of the block to `results[name]` (a list of samples)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        results.setdefault(name, []).append(time.perf_counter() - start)
+
+
+def summarize(samples):
+    """Reduces the samples of every metric to their median"""
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def write_report(path, params, metrics):
+    """Writes a JSON report containing the benchmark parameters and metrics"""
+    report = {
+        "params": params,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def compare(metrics, baseline_path, tolerance, min_delta=0.01):
+    """
+    Compares metrics to a baseline report and prints a table.
+
+    Returns the names of all metrics which are more than `tolerance` (relative) and
+    `min_delta` (absolute) slower than the baseline.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.loads(f.read())
+    if baseline.get("params") is not None:
+        print(f"baseline params: {baseline['params']}")
+    regressions = []
+    for name in sorted(metrics.keys()):
+        current = metrics[name]
+        previous = baseline["metrics"].get(name)
+        if previous is None:
+            print(f"{name:<48} {current:>10.4f}          (new)")
+            continue
+        ratio = current / previous if previous > 0 else float("inf")
+        flag = ""
+        if current > previous * (1 + tolerance) and current - previous > min_delta:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {current:>10.4f} {previous:>10.4f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def print_metrics(metrics):
+    """Prints all metrics as a table"""
+    for name in sorted(metrics.keys()):
+        print(f"{name:<48} {metrics[name]:>10.4f}")
+
+
+def add_report_arguments(parser):
+    """Adds the `--save`, `--baseline` and `--tolerance` options shared by all benchmarks"""
+    parser.add_argument("--save", default=None, help="write a JSON report")
+    parser.add_argument("--baseline", default=None, help="compare to a JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+
+
+def report_metrics(args, params, metrics, min_delta=0.01):
+    """
+    Saves and compares the metrics as requested by the options of `add_report_arguments`.
+
+    Returns the exit status of the benchmark, 1 if a metric regressed compared to the baseline.
+    """
+    if args.save is not None:
+        write_report(args.save, params, metrics)
+    if args.baseline is None:
+        print_metrics(metrics)
+        return 0
+    regressions = compare(metrics, args.baseline, args.tolerance, min_delta)
+    if len(regressions) > 0:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
@@ -0,0 +1,314 @@
+"""
+Benchmarks Odoo module discovery on generated addon trees.
+
+The trees mimic a real deployment: Odoo core, enterprise and OCA style repositories (nested addons
+directories), custom modules including duplicates, a symlinked external addons directory, large manifests
+and noise which must not be searched (`vendor/`, `.git`, `node_modules`). `discover_modules` is timed
+with and without the module index and workers, and the `modules list` (text, markdown, `--save`) and
+`modules generate_addons_path` commands are run in process. Every scenario runs in a new interpreter
+and reports its median wall time, the filesystem calls made from Python and the peak RSS of the process.
+
+Usage (from the repository root):
+```
+python -m benchmarks.modules_bench --sizes 100,2000,20000 --save benchmarks/results/modules.json
+python -m benchmarks.modules_bench --sizes 100,2000,20000 --baseline benchmarks/results/modules.json
+```
+"""
+
+import argparse
+import builtins
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+from click.testing import CliRunner
+
+from benchmarks.common import add_report_arguments, report_metrics, summarize, timed
+from hitchhiker.cli.cli import cli
+from hitchhiker.odoo import module as odoo_mod
+from hitchhiker.odoo import walk
+from hitchhiker.odoo.index import ModuleIndex
+
+SCENARIOS = [
+    "walk",
+    "parse",
+    "parse_threads",
+    "parse_processes",
+    "index_cold",
+    "index_warm",
+    "list_text",
+    "list_text_no_cache",
+    "list_markdown",
+    "list_save",
+    "generate_addons_path",
+]
+# filesystem calls counted while a scenario runs, the wrappers are installed on the os module
+COUNTED_CALLS = ["stat", "lstat", "scandir", "listdir", "open"]
+
+
+def _write_module(path, name, rng, large):
+    """Creates a module directory with a manifest, large manifests list many data files and assets"""
+    os.makedirs(os.path.join(path, "static", "description"))
+    with open(os.path.join(path, "__init__.py"), "w", encoding="utf-8") as f:
+        f.write("from . import models\n")
+    manifest = {
+        "name": name.replace("_", " ").title(),
+        "version": f"16.0.{rng.randrange(10)}.{rng.randrange(10)}.{rng.randrange(10)}",
+        "depends": ["base", *rng.sample(["web", "mail", "sale", "stock"], 2)],
+        "license": "LGPL-3",
+        "installable": True,
+    }
+    if large:
+        manifest["data"] = [f"views/view_{i}.xml" for i in range(200)]
+        manifest["assets"] = {
+            "web.assets_backend": [
+                f"{name}/static/src/js/file_{i}.js" for i in range(50)
+            ]
+        }
+        manifest["description"] = "Lorem ipsum dolor sit amet. " * 200
+    with open(os.path.join(path, "__manifest__.py"), "w", encoding="utf-8") as f:
+        f.write(repr(manifest))
+
+
+def _write_noise(root, rng):
+    """Creates directories which are pruned by the walker"""
+    for i in range(20):
+        _write_module(
+            os.path.join(root, "vendor", "lib", f"vendored_{i}"), "v", rng, False
+        )
+    for i in range(256):
+        objdir = os.path.join(root, ".git", "objects", f"{i:02x}")
+        os.makedirs(objdir)
+        for j in range(8):
+            with open(os.path.join(objdir, f"{j:038x}"), "wb"):
+                pass
+    for i in range(50):
+        os.makedirs(os.path.join(root, "node_modules", f"pkg{i}", "lib", "dist"))
+
+
+def generate_tree(path, modules, seed):
+    """
+    Generates an addon tree with the given number of modules below `path/root`.
+
+    About 5 % of the modules are in `path/external`, which is symlinked into the tree,
+    and about 1 % of the OCA modules reuse the name of a custom module.
+    """
+    rng = random.Random(seed)
+    root = os.path.join(path, "root")
+    external = os.path.join(path, "external")
+    os.makedirs(root)
+    os.makedirs(external)
+    os.symlink(external, os.path.join(root, "linked"))
+    _write_noise(root, rng)
+    custom = []
+    for i in range(modules):
+        share = i * 100 // modules
+        if share < 10:
+            moddir, name = os.path.join(root, "odoo", "addons"), f"core_{i}"
+        elif share < 30:
+            moddir, name = os.path.join(root, "enterprise"), f"enterprise_{i}"
+        elif share < 70:
+            moddir = os.path.join(root, "oca", f"repo_{i // 25}")
+            name = rng.choice(custom) if custom and i % 100 == 0 else f"oca_{i}"
+        elif share < 95:
+            moddir, name = os.path.join(root, "custom", "addons"), f"custom_{i}"
+            custom.append(name)
+        else:
+            moddir, name = external, f"external_{i}"
+        _write_module(os.path.join(moddir, name), name, rng, i % 10 == 0)
+    with open(os.path.join(root, "README.md"), "w", encoding="utf-8") as f:
+        f.write(
+            "<!-- BEGIN HITCHHIKER MODULES LIST -->\n<!-- END HITCHHIKER MODULES LIST -->\n"
+        )
+    return root
+
+
+@contextmanager
+def count_calls(counts):
+    """Counts the calls of the filesystem functions in `COUNTED_CALLS` made from Python"""
+    originals = {
+        name: getattr(builtins if name == "open" else os, name)
+        for name in COUNTED_CALLS
+    }
+
+    def wrap(name, func):
+        def counted(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return func(*args, **kwargs)
+
+        return counted
+
+    for name, func in originals.items():
+        setattr(builtins if name == "open" else os, name, wrap(name, func))
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(builtins if name == "open" else os, name, func)
+
+
+def _invoke(jobs, *args):
+    """Runs `hitchhiker modules` in process"""
+    result = CliRunner().invoke(cli, ["modules", "-j", str(jobs), *args])
+    assert result.exit_code == 0, result.output
+
+
+def _command_args(name, root, glob):
+    """Returns the arguments of `hitchhiker modules` run by a command scenario"""
+    return {
+        "list_text": ["list", "--glob", glob],
+        "list_text_no_cache": ["--no-cache", "list", "--glob", glob],
+        "list_markdown": ["list", "--glob", glob, "--output-format", "markdown"],
+        "list_save": [
+            "list",
+            "--glob",
+            glob,
+            "--save",
+            os.path.join(root, "README.md"),
+        ],
+        "generate_addons_path": ["generate_addons_path", "--glob", glob],
+    }.get(name)
+
+
+def _scenario(name, root, index_path, jobs):
+    """Returns a function running the scenario once and a function preparing every run"""
+    glob = f"{root}/**/__manifest__.py"
+    manifests = walk.find_manifests_glob(glob)
+
+    def remove_index():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+    def discover_indexed():
+        # a new index per run, like a new CLI invocation
+        return odoo_mod.discover_modules(manifests, ModuleIndex(index_path))
+
+    def nothing():
+        pass
+
+    runs = {
+        "walk": partial(walk.find_manifests_glob, glob),
+        "parse": partial(odoo_mod.discover_modules, manifests),
+        "parse_threads": partial(odoo_mod.discover_modules, manifests, jobs=jobs),
+        "parse_processes": partial(
+            odoo_mod.discover_modules, manifests, jobs=jobs, processes=True
+        ),
+        "index_cold": discover_indexed,
+        "index_warm": discover_indexed,
+    }
+    args = _command_args(name, root, glob)
+    if args is not None:
+        if name != "list_text_no_cache":
+            # warm up the module index
+            _invoke(jobs, "list", "--glob", glob)
+        return nothing, partial(_invoke, jobs, *args)
+    if name not in runs:
+        raise ValueError(f"unknown scenario {name}")
+    if name == "index_warm":
+        discover_indexed()
+    return remove_index if name == "index_cold" else nothing, runs[name]
+
+
+def _maxrss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(name, root, cachedir, jobs, repeat):
+    """Runs a scenario in the current process, returns its samples, call counts and peak RSS"""
+    os.environ["XDG_CACHE_HOME"] = cachedir
+    index_path = os.path.join(cachedir, "hitchhiker", "modules.json")
+    prepare, run = _scenario(name, root, index_path, jobs)
+    samples = {}
+    for _ in range(repeat):
+        prepare()
+        with timed(samples, "wall"):
+            run()
+    counts = {}
+    prepare()
+    with count_calls(counts):
+        run()
+    return samples["wall"], counts, _maxrss_mb()
+
+
+def parse_args(argv):
+    """Parses the command line of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="100,2000,20000", help="comma separated numbers of modules"
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="keep the generated trees here and reuse them on later runs",
+    )
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def ensure_tree(workdir, size, seed):
+    """Generates the tree of a size unless it was kept from an earlier run, returns its root"""
+    treedir = os.path.join(workdir, f"modules-{size}-{seed}")
+    root = os.path.join(treedir, "root")
+    if not os.path.isdir(root):
+        generated = {}
+        with timed(generated, "generate"):
+            generate_tree(treedir, size, seed)
+        print(f"{size} modules: tree ready in {generated['generate'][0]:.2f}s")
+    return root
+
+
+def bench_size(args, workdir, size, samples, metrics):
+    """Runs all scenarios on the tree of a size"""
+    root = ensure_tree(workdir, size, args.seed)
+    # a new interpreter per scenario, so the peak RSS of one scenario does not hide another
+    ctx = multiprocessing.get_context("spawn")
+    for name in args.scenarios.split(","):
+        cachedir = tempfile.mkdtemp(prefix="cache-", dir=workdir)
+        with ProcessPoolExecutor(1, mp_context=ctx) as executor:
+            wall, counts, rss = executor.submit(
+                run_scenario, name, root, cachedir, args.jobs, args.repeat
+            ).result()
+        shutil.rmtree(cachedir, ignore_errors=True)
+        samples[f"{size}/{name}/wall"] = wall
+        for call in COUNTED_CALLS:
+            metrics[f"{size}/{name}/calls/{call}"] = counts.get(call, 0)
+        metrics[f"{size}/{name}/rss_peak_mb"] = rss
+
+
+def main(argv=None):
+    """Runs the benchmark, returns the exit status"""
+    args = parse_args(argv)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="hitchhiker-bench-")
+    samples = {}
+    metrics = {}
+    try:
+        for size in args.sizes.split(","):
+            bench_size(args, workdir, int(size), samples, metrics)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    metrics.update(summarize(samples))
+    params = {
+        k: v
+        for k, v in vars(args).items()
+        if k not in ["workdir", "save", "baseline", "tolerance", "repeat"]
+    }
+    return report_metrics(args, params, metrics)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
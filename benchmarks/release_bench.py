@@ -0,0 +1,235 @@
+"""
+Benchmarks `hitchhiker release version` on generated monorepos.
+
+The repositories are built with the helpers from `tests/cli/release/git_fixtures.py`,
+the history is generated with `git fast-import` so large repositories are created in seconds.
+Every phase of a release is timed separately, once with an empty commit cache (cold)
+and once with the cache written by the cold run (warm).
+
+Usage (from the repository root):
+```
+python -m benchmarks.release_bench --commits 10000 --projects 500 --save benchmarks/results/release.json
+python -m benchmarks.release_bench --commits 10000 --projects 500 --baseline benchmarks/results/release.json
+```
+"""
+
+import argparse
+import copy
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import git
+
+from benchmarks.common import add_report_arguments, report_metrics, summarize, timed
+from hitchhiker.cli.release import config, tagfix
+from hitchhiker.release import changelog, enums
+from hitchhiker.release.version import commit, tags
+from tests.cli.release.git_fixtures import create_configs, create_git_repo
+
+MODES = {"pyproject": ("pyproject.toml", False), "setup.cfg": ("setup.cfg", True)}
+MESSAGES = [
+    "fix: fix a bug",
+    "feat: add a feature",
+    "feat!: change the api",
+    "chore: update dependencies",
+    "docs: update the documentation",
+    "refactor: move code around",
+    "not a conventional commit",
+    "fix(scope): fix a bug\n\nsome body\n\nRefs: #123",
+]
+
+
+def _data(text):
+    raw = text.encode("utf-8")
+    return b"data %d\n%s\n" % (len(raw), raw)
+
+
+def _fast_import_stream(args, projects):
+    """Builds a `git fast-import` stream with the generated tags and commits"""
+    rng = random.Random(args.seed)
+    out = []
+    mark = 0
+    when = 1700000000
+    ident = b"example <example@example.com>"
+
+    def add_commit(ref, message, parents):
+        nonlocal mark, when
+        mark += 1
+        when += 60
+        out.append(b"commit %s\nmark :%d\n" % (ref, mark))
+        out.append(b"committer %s %d +0000\n" % (ident, when))
+        out.append(_data(message))
+        for i, parent in enumerate(parents):
+            out.append(b"%s %s\n" % (b"from" if i == 0 else b"merge", parent))
+        for _ in range(args.files_per_commit):
+            project = rng.choice(projects)
+            path = f"{project}/src/file{rng.randrange(args.files_per_project)}.txt"
+            out.append(b"M 644 inline %s\n" % path.encode("utf-8"))
+            out.append(_data(f"{mark}\n"))
+        out.append(b"\n")
+        return b":%d" % mark
+
+    tip = b"refs/heads/main^0"
+    # tagged history before the benchmarked range
+    for i in range(args.tags):
+        tip = add_commit(b"refs/heads/main", f"fix: release {i}", [tip])
+        out.append(b"tag v0.0.%d\nfrom %s\n" % (i + 1, tip))
+        out.append(b"tagger %s %d +0000\n" % (ident, when))
+        out.append(_data(f"v0.0.{i + 1}"))
+    merge_every = args.commits // (args.merges + 1) if args.merges > 0 else 0
+    merges = 0
+    for i in range(args.commits):
+        if merge_every > 0 and merges < args.merges and (i + 1) % merge_every == 0:
+            side = add_commit(b"refs/heads/side", rng.choice(MESSAGES), [tip])
+            tip = add_commit(b"refs/heads/main", "Merge branch 'side'", [tip, side])
+            merges += 1
+        else:
+            tip = add_commit(b"refs/heads/main", rng.choice(MESSAGES), [tip])
+    return b"".join(out)
+
+
+def generate_repo(path, args, mode):
+    """Generates a repository at path for the given mode, reusing an existing one"""
+    if os.path.isdir(os.path.join(path, ".git")):
+        return git.Repo(path)
+    os.makedirs(path, exist_ok=True)
+    repo = create_git_repo(path)
+    projects = [f"project{i}" for i in range(args.projects)]
+    create_configs(
+        repo,
+        [(project, "0.0.0", False) for project in projects],
+        "0.0.0",
+        is_odoo=MODES[mode][1],
+    )
+    repo.git.add(A=True)
+    repo.git.commit(m="Initial commit")
+    subprocess.run(
+        ["git", "fast-import", "--quiet", "--force"],
+        cwd=path,
+        input=_fast_import_stream(args, projects),
+        check=True,
+    )
+    repo.git.reset("--hard", "main")
+    return repo
+
+
+def run_release(repo, mode, args, samples, prefix):
+    """Runs all phases of `release version` once, mirroring `hitchhiker.cli.release.version`"""
+    cfgname, is_odoo = MODES[mode]
+    with timed(samples, f"{prefix}/config_load"):
+        conf = config.create_context_from_raw_config(
+            os.path.join(repo.working_tree_dir, cfgname), repo, is_odoo
+        )
+        conf["jobs"] = args.jobs
+    with timed(samples, f"{prefix}/tag_scan"):
+        conf["tag_index"] = tags.TagIndex.from_repo(conf)
+    old_projects = copy.deepcopy(conf["projects"])
+    with timed(samples, f"{prefix}/history_walk"):
+        change_commits = _bump_projects(conf)
+    with timed(samples, f"{prefix}/changelog"):
+        changelog.gen_changelog(
+            change_commits,
+            conf["version"],
+            old_projects,
+            conf["projects"],
+            parsed_commits=conf["parsed_commits"],
+        )
+    head = repo.head.commit.hexsha
+    with timed(samples, f"{prefix}/commit_tag"):
+        newtag = _commit_and_tag(repo, conf, change_commits)
+    # undo the release so every repetition sees the same repository
+    repo.git.tag("-d", newtag)
+    repo.git.reset("--hard", head)
+
+
+def _bump_projects(conf):
+    """Bumps the versions of all projects and the repository, returns the commits of the bumped projects"""
+    change_commits = {}
+    mainbump = enums.VersionBump.NONE
+    for project in conf["projects"]:
+        bump, commits = commit.find_next_version(conf, project, project["prerelease"])
+        mainbump = bump if bump > mainbump else mainbump
+        if bump != enums.VersionBump.NONE:
+            project["version"].bump(bump, project["prerelease"])
+            change_commits[project["name"]] = (
+                project["version"],
+                [c for c, _ in commits],
+            )
+    conf["version"].bump(mainbump, False)
+    return change_commits
+
+
+def _commit_and_tag(repo, conf, change_commits):
+    """Writes the new versions, commits them and creates the release tag, returns the tag"""
+    changedfiles = []
+    for project in conf["projects"]:
+        if project["name"] in change_commits:
+            changedfiles += config.set_version(conf, project)
+    changedfiles += config.set_version(conf, conf)
+    newtag = tagfix.add_branch_to_tag(conf, f"v{conf['version']}")
+    repo.git.add(changedfiles)
+    repo.git.commit(m=f"{conf['version']}\n\nAutogenerated by hitchhiker")
+    repo.git.tag("-a", newtag, m=newtag)
+    return newtag
+
+
+def parse_args(argv):
+    """Parses the command line of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tags", type=int, default=20)
+    parser.add_argument("--merges", type=int, default=10)
+    parser.add_argument("--files-per-commit", type=int, default=3)
+    parser.add_argument("--files-per-project", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=[*MODES.keys(), "all"], default="all")
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="keep the generated repositories here and reuse them on later runs",
+    )
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the benchmark, returns the exit status"""
+    args = parse_args(argv)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="hitchhiker-bench-")
+    modes = list(MODES.keys()) if args.mode == "all" else [args.mode]
+    samples = {}
+    try:
+        for mode in modes:
+            name = f"{mode}-{args.commits}c-{args.projects}p-{args.tags}t-{args.merges}m-{args.seed}"
+            generated = {}
+            with timed(generated, "generate"):
+                repo = generate_repo(os.path.join(workdir, name), args, mode)
+            print(f"{mode}: repository ready in {generated['generate'][0]:.2f}s")
+            cache = os.path.join(repo.git_dir, "hitchhiker", "commits.json")
+            for _ in range(args.repeat):
+                if os.path.exists(cache):
+                    os.remove(cache)
+                run_release(repo, mode, args, samples, f"{mode}/cold")
+                run_release(repo, mode, args, samples, f"{mode}/warm")
+            repo.close()
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    params = {
+        k: v
+        for k, v in vars(args).items()
+        if k not in ["workdir", "save", "baseline", "tolerance", "repeat"]
+    }
+    return report_metrics(args, params, summarize(samples))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
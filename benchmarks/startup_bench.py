@@ -0,0 +1,154 @@
+"""
+Benchmarks the startup time and latency of short `hitchhiker` commands.
+
+Every command is run in a new interpreter against fixtures generated once per run
+(Odoo modules created with `tests/cli/modules/mod_fixtures.py` and a repository created with
+`tests/cli/release/git_fixtures.py`). The wall time is measured cold (without cached bytecode,
+like the first run after an update) and warm (median of repeated runs). The import time reported
+by `python -X importtime` is summed up per top level package, so new or slower imports are visible.
+
+Usage (from the repository root):
+```
+python -m benchmarks.startup_bench --save benchmarks/results/startup.json
+python -m benchmarks.startup_bench --baseline benchmarks/results/startup.json
+```
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import add_report_arguments, report_metrics, summarize, timed
+from tests.cli.modules.mod_fixtures import create_odoo_mod
+from tests.cli.release.git_fixtures import (
+    create_commits,
+    create_configs,
+    create_git_repo,
+)
+
+
+def create_fixtures(path, modules):
+    """Creates the module directory and the release repository, returns their paths"""
+    moddir = os.path.join(path, "modules")
+    os.makedirs(moddir)
+    for i in range(modules):
+        create_odoo_mod(moddir, f"module_{i}", f"16.0.1.{i}.0")
+    repodir = os.path.join(path, "repo")
+    repo = create_git_repo(repodir)
+    create_configs(repo, [(f"project{i}", "0.0.0", False) for i in range(5)], "0.0.0")
+    create_commits(repo, [["Initial commit", ""], ["fix: something", "project1"]])
+    repo.close()
+    return moddir, repodir
+
+
+def get_commands(moddir, repodir):
+    """Returns the benchmarked commands as `{name: (arguments, working directory)}`"""
+    return {
+        "help": (["--help"], moddir),
+        "modules_list": (["modules", "list"], moddir),
+        "generate_addons_path": (["modules", "generate_addons_path"], moddir),
+        "release_version_show": (
+            ["release", "--workdir", repodir, "version", "--show"],
+            repodir,
+        ),
+    }
+
+
+def run(args, cwd, env, python_args=()):
+    """Runs hitchhiker in a new interpreter and returns its stderr"""
+    result = subprocess.run(
+        [sys.executable, *python_args, "-m", "hitchhiker", *args],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"hitchhiker {' '.join(args)} failed:\n{result.stderr}")
+    return result.stderr
+
+
+def parse_importtime(stderr):
+    """Sums up the self time (in seconds) of `-X importtime` output per top level package"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selftime, _, name = line.split(":", 1)[1].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(selftime) / 1e6
+    return packages
+
+
+def parse_args(argv):
+    """Parses the command line of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="warm runs per command")
+    parser.add_argument("--cold-repeat", type=int, default=3)
+    parser.add_argument("--modules", type=int, default=50)
+    parser.add_argument(
+        "--top", type=int, default=8, help="packages reported per command"
+    )
+    add_report_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def get_env(tmp):
+    """Returns the environment of the benchmarked commands"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.getcwd(), *filter(None, [env.get("PYTHONPATH")])]
+    )
+    # the module index is written below the temporary directory, not to the user's cache
+    env["XDG_CACHE_HOME"] = os.path.join(tmp, "cache")
+    return env
+
+
+def bench_command(args, tmp, name, command, samples):
+    """Times a command (`(arguments, working directory)`) cold and warm, returns the import times per package"""
+    cmd, cwd = command
+    env = get_env(tmp)
+    cmd = ["--conf", os.path.join(tmp, "config.json"), *cmd]
+    for i in range(args.cold_repeat):
+        cold_env = dict(env)
+        cold_env["PYTHONPYCACHEPREFIX"] = os.path.join(tmp, f"pycache-{i}")
+        with timed(samples, f"{name}/cold"):
+            run(cmd, cwd, cold_env)
+    run(cmd, cwd, env)
+    for _ in range(args.repeat):
+        with timed(samples, f"{name}/warm"):
+            run(cmd, cwd, env)
+    return parse_importtime(run(cmd, cwd, env, python_args=["-X", "importtime"]))
+
+
+def main(argv=None):
+    """Runs the benchmark, returns the exit status"""
+    args = parse_args(argv)
+    tmp = tempfile.mkdtemp(prefix="hitchhiker-bench-")
+    samples = {}
+    imports = {}
+    try:
+        moddir, repodir = create_fixtures(tmp, args.modules)
+        for name, command in get_commands(moddir, repodir).items():
+            imports[name] = bench_command(args, tmp, name, command, samples)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    metrics = summarize(samples)
+    for name, packages in imports.items():
+        metrics[f"{name}/import_total"] = sum(packages.values())
+        top = sorted(packages.items(), key=lambda p: p[1], reverse=True)[: args.top]
+        print(f"{name}: slowest imports")
+        for package, seconds in top:
+            print(f"    {package:<36} {seconds:>10.4f}")
+            metrics[f"{name}/import/{package}"] = seconds
+    return report_metrics(args, {"modules": args.modules}, metrics, min_delta=0.005)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import json
+import os
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class JsonCacheStore:
+    """Persistent JSON file of key-value tables ordered from least to most recently used"""
+
+    def __init__(
+        self, path: str, version: int, limits: Dict[str, int], name: str
+    ) -> None:
+        """
+        Initializes a cache store stored at the specified path.
+
+        Parameters:
+            path (str): The path to the cache file.
+            version (int): The format version, files written with another version are ignored.
+            limits (dict): Maps the name of every table to the maximum number of entries kept in it.
+            name (str): What is stored, used in warnings (e.g. "commit cache").
+
+        Description:
+        The cache file is only read on first access.
+        If the cache file is missing, unreadable or was written by another version it is ignored.
+        When a table has more entries than its limit the least recently used ones are evicted on save.
+
+        Example:
+        ```
+        store = JsonCacheStore(path, 1, {"entries": 1000}, "commit cache")
+        store.set("entries", sha, [paths, bump])
+        store.save()
+        ```
+
+        """
+        self._fpath = path
+        self._version = version
+        self._limits = limits
+        self._name = name
+        self._tables: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the tables, reading the cache file on first access.
+
+        Returns:
+            dict: Maps the name of every table to its entries.
+        """
+        if self._tables is not None:
+            return self._tables
+        self._tables = {table: {} for table in self._limits}
+        try:
+            with open(self._fpath, "r", encoding="utf-8") as f:
+                read = json.loads(f.read())
+            if (
+                isinstance(read, dict)
+                and read.get("version") == self._version
+                and all(isinstance(read.get(table), dict) for table in self._limits)
+            ):
+                self._tables = {table: read[table] for table in self._limits}
+        except (OSError, ValueError):
+            pass
+        return self._tables
+
+    def get(self, table: str, key: str) -> Any:
+        """
+        Looks up an entry and marks it as the most recently used one.
+
+        Parameters:
+            table (str): The name of the table.
+            key (str): The key of the entry.
+
+        Returns:
+            Any: The entry, or None if there is none.
+        """
+        entries = self._load()[table]
+        entry = entries.pop(key, None)
+        if entry is None:
+            return None
+        # re-insert to keep the entries ordered from least to most recently used,
+        # the order is only persisted together with new entries to keep warm runs read-only
+        entries[key] = entry
+        return entry
+
+    def set(self, table: str, key: str, entry: Any) -> None:
+        """
+        Adds or replaces an entry.
+
+        Parameters:
+            table (str): The name of the table.
+            key (str): The key of the entry.
+            entry (Any): The entry, must be serializable as JSON.
+        """
+        entries = self._load()[table]
+        entries.pop(key, None)
+        entries[key] = entry
+        self._dirty = True
+
+    def remove(self, table: str, key: str) -> None:
+        """
+        Removes an entry if there is one.
+
+        Parameters:
+            table (str): The name of the table.
+            key (str): The key of the entry.
+        """
+        if self._load()[table].pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Writes the cache to disk if it was changed, evicting the least recently used entries.
+
+        Description:
+        The cache is written to a temporary file which then replaces the cache file,
+        so an interrupted write can never leave a truncated cache behind.
+        If the cache cannot be written (e.g. a read-only home directory) a warning is issued and the cache stays unsaved,
+        the cache never makes a command fail.
+        """
+        if self._tables is None or not self._dirty:
+            return
+        for table, limit in self._limits.items():
+            entries = self._tables[table]
+            for key in list(entries.keys())[: max(len(entries) - limit, 0)]:
+                del entries[key]
+        tmppath = f"{self._fpath}.{os.getpid()}.tmp"
+        try:
+            Path(self._fpath).resolve().parent.mkdir(parents=True, exist_ok=True)
+            with open(tmppath, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": self._version, **self._tables}))
+            os.replace(tmppath, self._fpath)
+        except OSError as e:
+            warnings.warn(f"cannot write the {self._name} {self._fpath}: {e}")
+            try:
+                os.remove(tmppath)
+            except OSError:
+                pass
+            return
+        self._dirty = False
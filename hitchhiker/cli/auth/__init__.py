@@ -0,0 +1,2 @@
+# shown by `hitchhiker --help` without importing the commands (see LazyGroup)
+SHORT_HELP = "Authenticate with external services"
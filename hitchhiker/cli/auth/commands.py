@@ -1,9 +1,11 @@
 import click
 import hitchhiker.cli.auth.github as github
+from hitchhiker.cli.auth import SHORT_HELP
 
 
-@click.group()
+@click.group(short_help=SHORT_HELP)
 def auth() -> None:
+    """Authenticate with external services and save the tokens in the configuration"""
     pass
 
 
@@ -1,12 +1,28 @@
 import click
-import importlib.metadata
 from hitchhiker.config.config import ConfigManager
-from .modules import commands as modules
-from .auth import commands as auth
-
-
-@click.group()
-@click.version_option(version=importlib.metadata.version("hitchhiker"))
+from hitchhiker.cli.lazy import LazyGroup
+
+# only the packages are imported, their __init__ just defines the help texts
+import hitchhiker.cli.auth as auth_cli
+import hitchhiker.cli.modules as modules_cli
+import hitchhiker.cli.odoo as odoo_cli
+import hitchhiker.cli.release as release_cli
+import hitchhiker.cli.update as update_cli
+
+
+# subcommands are only imported when they are invoked, see LazyGroup
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "auth": ("hitchhiker.cli.auth.commands:auth", auth_cli.SHORT_HELP),
+        "modules": ("hitchhiker.cli.modules.commands:modules", modules_cli.SHORT_HELP),
+        "odoo": ("hitchhiker.cli.odoo.commands:odoo", odoo_cli.SHORT_HELP),
+        "release": ("hitchhiker.cli.release.commands:release", release_cli.SHORT_HELP),
+        "update": ("hitchhiker.cli.update.commands:update", update_cli.SHORT_HELP),
+    },
+)
+# the version is only looked up when --version is passed
+@click.version_option(package_name="hitchhiker")
 @click.option(
     "--conf", default="~/.config/hitchhiker/config.json", help="Configuration file path"
 )
@@ -17,29 +33,3 @@ def cli(ctx: click.Context, debug: bool, conf: str) -> None:
 
     ctx.obj["DEBUG"] = debug
     ctx.obj["CONF"] = ConfigManager(conf, {})
-    ctx.obj["VERSION"] = importlib.metadata.version("hitchhiker")
-
-
-cli.add_command(modules.modules)
-cli.add_command(auth.auth)
-
-try:
-    from .odoo import commands as odoo_cli
-
-    cli.add_command(odoo_cli.odoo)
-except ImportError as e:
-    click.secho(f"Please install {e.name} for full functionality.", err=True, fg="red")
-
-try:
-    from .release import commands as release
-
-    cli.add_command(release.release)
-except ImportError as e:
-    click.secho(f"Please install {e.name} for full functionality.", err=True, fg="red")
-
-try:
-    from .update import commands as update
-
-    cli.add_command(update.update)
-except ImportError as e:
-    click.secho(f"Please install {e.name} for full functionality.", err=True, fg="red")
@@ -0,0 +1,100 @@
+import importlib
+from typing import Any, Dict, Optional
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A click group which imports its subcommands only when they are used"""
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_subcommands: Optional[Dict[str, tuple[str, str]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initializes a group with lazily imported subcommands.
+
+        Parameters:
+            lazy_subcommands (dict, optional): Maps command names to tuples of the import path
+                of the command (`"module:attribute"`) and its short help, which must be the `short_help` of the command.
+            *args, **kwargs: Passed to `click.Group`.
+
+        Description:
+        The module of a lazy subcommand is only imported once the subcommand is invoked,
+        so the startup time of the CLI does not depend on the dependencies of unused commands.
+        The short help is shown in the command list of `--help` without importing the command.
+        Keep it in a constant next to the command (e.g. in the `__init__` of its package) which is used for both,
+        so the help of an imported and a not imported command is the same.
+        If a dependency of the command is not installed a hint is printed and the command is unavailable.
+
+        Example:
+        ```
+        @click.group(
+            cls=LazyGroup,
+            lazy_subcommands={"release": ("hitchhiker.cli.release.commands:release", "Release stuff")},
+        )
+        def cli() -> None:
+            pass
+        ```
+
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands if lazy_subcommands is not None else {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        # loaded subcommands are listed by both
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            return self._load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> Optional[click.Command]:
+        """
+        Imports a lazy subcommand and adds it to the group.
+
+        Parameters:
+            cmd_name (str): The name of the lazy subcommand.
+
+        Returns:
+            Optional[click.Command]: The command, or None if one of its dependencies is not installed.
+        """
+        modname, attr = self.lazy_subcommands[cmd_name][0].split(":")
+        try:
+            mod = importlib.import_module(modname)
+        except ImportError as e:
+            click.secho(
+                f"Please install {e.name} for full functionality.", err=True, fg="red"
+            )
+            return None
+        cmd = getattr(mod, attr)
+        assert isinstance(cmd, click.Command)
+        self.add_command(cmd, cmd_name)
+        return cmd
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        """Lists the subcommands in the help page, using the stored short help of commands which were not imported"""
+        commands: list[tuple[str, Optional[click.Command]]] = []
+        for subcommand in self.list_commands(ctx):
+            cmd = self.commands.get(subcommand)
+            if cmd is not None and cmd.hidden:
+                continue
+            commands.append((subcommand, cmd))
+
+        if len(commands) > 0:
+            # allow for 3 times the default spacing
+            limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+            rows = []
+            for subcommand, cmd in commands:
+                if cmd is None:
+                    cmd = click.Command(
+                        subcommand, short_help=self.lazy_subcommands[subcommand][1]
+                    )
+                rows.append((subcommand, cmd.get_short_help_str(limit)))
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
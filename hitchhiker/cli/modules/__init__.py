@@ -0,0 +1,3 @@
+# shown by `hitchhiker --help` without importing the commands (see LazyGroup)
+SHORT_HELP = "Commands related to Odoo modules"
+NEW_SHORT_HELP = "Create new Odoo module from copier template"
@@ -0,0 +1,121 @@
+import os
+import posixpath
+import subprocess
+
+import click
+
+from hitchhiker.cli.modules.discover import discover
+from hitchhiker.odoo.graph import ModuleGraph
+from hitchhiker.release.pathtrie import PathTrie
+
+
+def _git(args: list[str]) -> bytes:
+    """
+    Runs git in the current directory.
+
+    Parameters:
+        args (list): The arguments of git.
+
+    Returns:
+        bytes: The output of git.
+
+    Raises:
+        click.ClickException: If git fails.
+    """
+    result = subprocess.run(
+        ["git", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False
+    )
+    if result.returncode != 0:
+        raise click.ClickException(
+            message=f"git {args[0]} failed: {os.fsdecode(result.stderr).strip()}"
+        )
+    return result.stdout
+
+
+@click.command(
+    name="affected", short_help="list Odoo modules affected by changes since a ref"
+)
+@click.option(
+    "--since",
+    is_flag=False,
+    required=True,
+    help="git ref to compare the working tree to, e.g. origin/main",
+)
+@click.option(
+    "--glob",
+    is_flag=False,
+    default="./**/__manifest__.py",
+    help="module search path glob",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="glob of directories to skip (can be given multiple times)",
+)
+@click.option(
+    "--output-format",
+    is_flag=False,
+    default="text",
+    help='output format, "text" (default, one module per line) or "comma"',
+)
+@click.pass_context
+def affected_cmd(
+    ctx: click.Context,
+    since: str,
+    glob: str,
+    exclude: tuple[str, ...],
+    output_format: str,
+) -> None:
+    """
+    Lists the Odoo modules affected by the changes since a git ref.
+
+    Parameters:
+        --since (str): The git ref to compare the working tree to.
+        --glob (str): The glob pattern to search for Odoo modules (default: `./**/__manifest__.py`).
+        --exclude (str): Glob of directories to skip, can be given multiple times
+        --output-format (str): "text" (default) or "comma"
+
+    Description:
+    The files changed between the ref and the working tree (`git diff --name-only <ref>`) are mapped to
+    the modules containing them (untracked files are not considered). All modules which directly or indirectly depend on a changed module
+    (according to the `depends` of their manifests) are affected as well.
+    The affected modules are printed in dependency order, every module after the modules it depends on,
+    so the output can be passed to `odoo -i` or used to select the modules to test.
+    Modules on a dependency cycle cannot be ordered, they are printed together and reported on stderr.
+
+    """
+    if output_format not in ["text", "comma"]:
+        raise click.ClickException(
+            message=f'invalid output format "{output_format}", use "text" or "comma"'
+        )
+    # git diff lists paths relative to the top level, the prefix is the current directory below it
+    prefix = os.fsdecode(_git(["rev-parse", "--show-prefix"])).strip()
+    changed = [
+        os.fsdecode(path)
+        for path in _git(
+            ["diff", "--name-only", "--no-renames", "-z", since, "--"]
+        ).split(b"\0")
+        if path != b""
+    ]
+
+    registry = discover(ctx, glob, exclude)
+    trie: PathTrie[str] = PathTrie()
+    for module in registry:
+        moddir = os.path.relpath(module.get_dir()).replace(os.sep, "/")
+        trie.add(posixpath.normpath(f"{prefix}{moddir}"), module.get_int_name())
+    touched = set()
+    for path in changed:
+        touched.update(trie.match(path))
+
+    graph = ModuleGraph(registry, ctx.ensure_object(dict).get("MODULE_INDEX"))
+    for cycle in graph.find_cycles():
+        click.secho(
+            f"dependency cycle between {', '.join(cycle)}", err=True, fg="yellow"
+        )
+    order = graph.topological_order(graph.dependents_closure(touched))
+    if output_format == "comma":
+        if len(order) > 0:
+            print(",".join(order))
+    else:
+        for name in order:
+            print(name)
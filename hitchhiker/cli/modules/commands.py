@@ -1,25 +1,53 @@
+import os
 import click
+from hitchhiker.cli.lazy import LazyGroup
+from hitchhiker.odoo.index import ModuleIndex
 import hitchhiker.cli.modules.list as list_mod
 import hitchhiker.cli.modules.generate_addons_path as generate_addons_path_mod
+import hitchhiker.cli.modules.affected as affected_mod
+from hitchhiker.cli.modules import NEW_SHORT_HELP, SHORT_HELP
 
 # FIXME: all these commands need tests
 
 
-@click.group()
+# "new" depends on copier, which is slow to import and optional
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={"new": ("hitchhiker.cli.modules.new:new_cmd", NEW_SHORT_HELP)},
+    short_help=SHORT_HELP,
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="do not use the module index in ~/.cache/hitchhiker/",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="worker threads for parsing manifests (0: one per CPU)",
+)
+@click.option(
+    "--gitignore",
+    is_flag=True,
+    default=False,
+    help="skip directories ignored by .gitignore files",
+)
 @click.pass_context
-def modules(ctx: click.Context) -> None:
+def modules(ctx: click.Context, no_cache: bool, jobs: int, gitignore: bool) -> None:
     """
     Commands related to Odoo modules
     """
     ctx.ensure_object(dict)
+    # parsed manifests are reused as long as the manifest files are unchanged
+    ctx.obj["MODULE_INDEX"] = None if no_cache else ModuleIndex()
+    ctx.obj["MODULE_JOBS"] = jobs if jobs > 0 else (os.cpu_count() or 1)
+    # off by default, addons are often checked out into ignored directories
+    ctx.obj["MODULE_GITIGNORE"] = gitignore
 
 
 modules.add_command(list_mod.list_cmd)
 modules.add_command(generate_addons_path_mod.generate_addons_path_cmd)
-
-try:
-    import hitchhiker.cli.modules.new as new_mod
-
-    modules.add_command(new_mod.new_cmd)
-except ImportError as e:
-    click.secho(f"Please install {e.name} for full functionality.", err=True, fg="red")
+modules.add_command(affected_mod.affected_cmd)
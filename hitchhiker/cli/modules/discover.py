@@ -0,0 +1,46 @@
+import click
+
+import hitchhiker.odoo.module as odoo_mod
+import hitchhiker.odoo.walk as walk
+
+
+def discover(
+    ctx: click.Context, glob: str, exclude: tuple[str, ...]
+) -> odoo_mod.ModuleRegistry:
+    """
+    Discovers the Odoo modules matching a glob with the options of the `modules` command group.
+
+    Parameters:
+        ctx (click.Context): The context of the command, holding the module index, the number of jobs
+            and whether to skip directories ignored by `.gitignore` files.
+        glob (str): The glob pattern to search for Odoo modules.
+        exclude (tuple): Globs of directories to skip.
+
+    Returns:
+        ModuleRegistry: The valid modules.
+
+    Description:
+    Manifests which cannot be parsed are skipped with an error message naming the file.
+    """
+    obj = ctx.ensure_object(dict)
+    errors: list[odoo_mod.ManifestError] = []
+    modules = odoo_mod.discover_modules(
+        walk.find_manifests_glob(glob, exclude, obj.get("MODULE_GITIGNORE", False)),
+        obj.get("MODULE_INDEX"),
+        jobs=obj.get("MODULE_JOBS", 1),
+        errors=errors,
+    )
+    print_errors(errors)
+    return modules
+
+
+def print_errors(errors: list[odoo_mod.ManifestError]) -> None:
+    """
+    Prints the manifests which could not be parsed and clears the list.
+
+    Parameters:
+        errors (list): The errors collected by `discover_modules`.
+    """
+    for error in errors:
+        click.secho(f"invalid manifest {error}", err=True, fg="red")
+    errors.clear()
@@ -1,7 +1,131 @@
-import glob as pyglob
-from pathlib import Path
+import os
+import re
+from typing import Optional
+
 import click
+from hitchhiker.cli.modules.discover import discover, print_errors
 import hitchhiker.odoo.module as odoo_mod
+import hitchhiker.odoo.walk as walk
+from hitchhiker.odoo.graph import ModuleGraph
+from hitchhiker.odoo.index import ModuleIndex
+
+
+def _format(moduledirs: list[str]) -> str:
+    return ",".join(moduledirs) if len(moduledirs) != 0 else "./"
+
+
+def _parse_targets(targets: str) -> list[str]:
+    """
+    Parses the comma separated module names given to `--for`.
+
+    Parameters:
+        targets (str): The technical names of the modules, separated by commas.
+
+    Returns:
+        list: The names.
+
+    Raises:
+        click.ClickException: If no names are given.
+    """
+    names = [name.strip() for name in targets.split(",") if name.strip() != ""]
+    if len(names) == 0:
+        raise click.ClickException(message="--for requires at least one module")
+    return names
+
+
+def _target_addons_paths(
+    registry: odoo_mod.ModuleRegistry,
+    targets: list[str],
+    index: Optional[ModuleIndex],
+) -> list[str]:
+    """
+    Gets the addons directories needed by the given modules and their (transitive) dependencies.
+
+    Parameters:
+        registry (ModuleRegistry): The discovered modules.
+        targets (list): The technical names of the modules.
+        index (ModuleIndex, optional): The module index the dependency graph is stored in.
+
+    Returns:
+        list: The absolute paths of the directories, in the order of the full addons path.
+
+    Raises:
+        click.ClickException: If a module was not discovered.
+    """
+    graph = ModuleGraph(registry, index)
+    unknown = [name for name in targets if name not in graph]
+    if len(unknown) > 0:
+        raise click.ClickException(message=f"unknown module(s): {', '.join(unknown)}")
+    needed = graph.dependencies_closure(targets)
+    missing = graph.get_missing()
+    notfound = sorted(set(dep for name in needed for dep in missing.get(name, [])))
+    if len(notfound) > 0:
+        click.secho(
+            f"dependencies not found: {', '.join(notfound)}", err=True, fg="yellow"
+        )
+    return registry.get_addons_paths(needed)
+
+
+def _set_conf_option(content: str, section: str, key: str, value: str) -> str:
+    """
+    Sets an option in the contents of an INI file like `odoo.conf`, keeping all other lines.
+
+    Parameters:
+        content (str): The contents of the file.
+        section (str): The section of the option.
+        key (str): The key of the option.
+        value (str): The new value.
+
+    Returns:
+        str: The new contents.
+    """
+    lines = content.splitlines(keepends=True)
+    if len(lines) > 0 and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    option = f"{key} = {value}\n"
+    start = next(
+        (i for i, line in enumerate(lines) if line.strip() == f"[{section}]"), None
+    )
+    if start is None:
+        return "".join([*lines, f"[{section}]\n", option])
+    end = start + 1
+    while end < len(lines) and not lines[end].lstrip().startswith("["):
+        if re.match(rf"^\s*{re.escape(key)}\s*[=:]", lines[end]):
+            lines[end] = option
+            return "".join(lines)
+        end += 1
+    lines.insert(start + 1, option)
+    return "".join(lines)
+
+
+def _write_output(output: str, addons_path: str) -> bool:
+    """
+    Writes the addons path to a file, or sets it as `addons_path` option if the file is an Odoo configuration file.
+
+    Parameters:
+        output (str): The path of the file, files ending in `.conf` are updated as Odoo configuration files.
+        addons_path (str): The addons path.
+
+    Returns:
+        bool: Whether the file was written, it is not written if it already contains the addons path.
+    """
+    try:
+        with open(output, "r") as f:
+            content = f.read()
+    except FileNotFoundError:
+        content = ""
+    if output.endswith(".conf"):
+        ncontent = _set_conf_option(content, "options", "addons_path", addons_path)
+    else:
+        ncontent = f"{addons_path}\n"
+    if ncontent == content:
+        return False
+    # replaced atomically, Odoo or other watchers never read a partially written file
+    tmppath = f"{output}.{os.getpid()}.tmp"
+    with open(tmppath, "w") as f:
+        f.write(ncontent)
+    os.replace(tmppath, output)
+    return True
 
 
 @click.command(name="generate_addons_path", short_help="Generate an Odoo addons path")
@@ -11,35 +135,119 @@ import hitchhiker.odoo.module as odoo_mod
     default="./**/__manifest__.py",
     help="module search path glob",
 )
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="glob of directories to skip (can be given multiple times)",
+)
+@click.option(
+    "--for",
+    "targets",
+    is_flag=False,
+    default=None,
+    help="comma separated modules, only include the directories needed by them and their dependencies",
+)
+@click.option(
+    "--output",
+    is_flag=False,
+    default=None,
+    help="file to write the addons path to, the addons_path option is set in .conf files",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="keep running and update the addons path whenever modules are added or removed",
+)
+@click.option(
+    "--poll-interval",
+    type=click.FloatRange(min=0.1),
+    default=2.0,
+    help="seconds between scans with --watch if inotify is not available",
+)
 @click.pass_context
-def generate_addons_path_cmd(ctx: click.Context, glob: str) -> None:
+def generate_addons_path_cmd(
+    ctx: click.Context,
+    glob: str,
+    exclude: tuple[str, ...],
+    targets: Optional[str],
+    output: Optional[str],
+    watch: bool,
+    poll_interval: float,
+) -> None:
     """
     Generates Odoo addons path based on the provided glob.
 
     Parameters:
         --glob (str): The glob pattern to search for Odoo modules (default: `./**/__manifest__.py`).
+        --exclude (str): Glob of directories to skip, can be given multiple times
+        --for (str): Comma separated modules, only the directories needed by them and their dependencies are included
+        --output (str): File to write the addons path to, `addons_path` is set in the `[options]` of `.conf` files
+        --watch (bool): Keep running and update the addons path whenever it changes
+        --poll-interval (float): Seconds between two scans with `--watch` if inotify is not available
 
     Description:
     This command generates a Odoo addons path based on the provided glob pattern.
     It outputs all directories that contain modules as a comma-seperated list
+    Directories ignored by `.gitignore` files are searched too, unless `modules --gitignore` is given.
+    With `--for` only the directories containing the given modules and everything they (transitively)
+    depend on are included, in the same order, so Odoo has fewer addons to scan at startup.
+    Dependencies which are not found (e.g. Odoo core modules outside of the glob) are reported on stderr.
+    The output file is only written if the addons path changed.
+    With `--watch` the modules are searched once and then watched with inotify (Linux),
+    only changed directories are searched again. Without inotify the tree is scanned every `--poll-interval` seconds.
 
     """
+    names = _parse_targets(targets) if targets is not None else None
+    obj = ctx.ensure_object(dict)
+    if not watch:
+        registry = discover(ctx, glob, exclude)
+        if names is None:
+            moduledirs = registry.get_addons_paths()
+        else:
+            moduledirs = _target_addons_paths(registry, names, obj.get("MODULE_INDEX"))
+        addons_path = _format(moduledirs)
+        if output is not None:
+            _write_output(output, addons_path)
+        else:
+            print(addons_path)
+        return
 
-    modules = odoo_mod.discover_modules(
-        list(
-            filter(
-                lambda n: Path(n).name == "__manifest__.py",
-                pyglob.glob(glob, recursive=True),
-            )
+    # imported here as it is only needed for --watch
+    from hitchhiker.odoo.watch import AddonsPathWatcher
+
+    root = walk.glob_root(glob)
+    if root is None:
+        raise click.ClickException(
+            message="--watch requires a glob of the form <directory>/**/__manifest__.py"
         )
+    errors: list[odoo_mod.ManifestError] = []
+    watcher = AddonsPathWatcher(
+        root,
+        exclude,
+        gitignore=obj.get("MODULE_GITIGNORE", False),
+        index=obj.get("MODULE_INDEX"),
+        jobs=obj.get("MODULE_JOBS", 1),
+        errors=errors,
+        poll_interval=poll_interval,
+        targets=names,
     )
-    moduledirs: list[str] = []
-    for module in modules:
-        moddir = str(Path(module.get_dir()).parent.absolute())
-        if moddir not in moduledirs:
-            moduledirs.append(moddir)
-
-    if len(moduledirs) != 0:
-        print(",".join(moduledirs))
-    else:
-        print("./")
+    try:
+        changed: Optional[list[str]] = watcher.scan()
+        if watcher.is_polling():
+            click.echo(
+                f"inotify is not available, scanning every {poll_interval}s", err=True
+            )
+        while True:
+            print_errors(errors)
+            if changed is not None:
+                addons_path = _format(changed)
+                if output is None:
+                    print(addons_path, flush=True)
+                elif _write_output(output, addons_path):
+                    click.echo(f"updated {output}: {addons_path}", err=True)
+            changed = watcher.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -1,11 +1,8 @@
-import glob as pyglob
-from functools import cmp_to_key
-from pathlib import Path
 from typing import Union
 
 import click
 
-import hitchhiker.odoo.module as odoo_mod
+from hitchhiker.cli.modules.discover import discover
 
 
 @click.command(name="list", short_help="list Odoo modules and their versions")
@@ -15,6 +12,11 @@ import hitchhiker.odoo.module as odoo_mod
     default="./**/__manifest__.py",
     help="module search path glob",
 )
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="glob of directories to skip (can be given multiple times)",
+)
 @click.option(
     "--save",
     is_flag=False,
@@ -29,39 +31,31 @@ import hitchhiker.odoo.module as odoo_mod
 )
 @click.pass_context
 def list_cmd(
-    ctx: click.Context, glob: str, save: Union[str, None], output_format: str
+    ctx: click.Context,
+    glob: str,
+    exclude: tuple[str, ...],
+    save: Union[str, None],
+    output_format: str,
 ) -> None:
     """
     Lists all Odoo modules based on the provided glob.
 
     Parameters:
         --glob (str): The glob pattern to search for Odoo modules (default: `./**/__manifest__.py`).
+        --exclude (str): Glob of directories to skip, can be given multiple times
         --output-format (str): "text" (default) or "markdown"
         --save (str): File to update modules list in
 
     Description:
     This command lists all Odoo modules based on the provided glob pattern.
     It prints the module names and versions in a formatted table.
+    Hidden directories, `node_modules`, `vendor` and virtualenvs are not searched,
+    neither are directories ignored by `.gitignore` with `modules --gitignore`.
 
     """
 
-    def cmp_module(a: odoo_mod.Module, b: odoo_mod.Module) -> int:
-        if len(a.get_int_name()) < len(b.get_int_name()):
-            return -1
-        elif len(a.get_int_name()) > len(b.get_int_name()):
-            return 1
-        else:
-            return 0
-
-    modules = odoo_mod.discover_modules(
-        list(
-            filter(
-                lambda n: Path(n).name == "__manifest__.py",
-                pyglob.glob(glob, recursive=True),
-            )
-        )
-    )
-    modules.sort(key=lambda x: x.get_int_name())
+    registry = discover(ctx, glob, exclude)
+    modules = registry.sorted()
 
     if save is not None:
         with open(save, "r+") as f:
@@ -80,12 +74,8 @@ def list_cmd(
                     )
                 ncontent += "\n\n"
                 for module in modules:
-                    for mod in modules:
-                        if (
-                            mod.get_int_name() == module.get_int_name()
-                            and mod.get_dir() != module.get_dir()
-                        ):
-                            ncontent += f'<span style="color:red">duplicate module: {mod.get_int_name()}</span><br>\n'
+                    for mod in registry.get_duplicates(module):
+                        ncontent += f'<span style="color:red">duplicate module: {mod.get_int_name()}</span><br>\n'
                 ncontent += f"\n{content[end_pos:]}"
             f.seek(0)
             f.write(ncontent)
@@ -96,20 +86,14 @@ def list_cmd(
         return
 
     if output_format == "text":
-        spaces = len(
-            sorted(modules, key=cmp_to_key(cmp_module), reverse=True)[0].get_int_name()
-        )
+        spaces = max(len(name) for name in registry.get_names())
         print(f"MODULE {(spaces - 6) * ' '}VERSION")
         for module in modules:
             print(
                 f"{module.get_int_name()} {(spaces - len(module.get_int_name())) * ' '}{str(module.get_version())}"
             )
-            for mod in modules:
-                if (
-                    mod.get_int_name() == module.get_int_name()
-                    and mod.get_dir() != module.get_dir()
-                ):
-                    print(f"    !!! duplicate: {mod.get_int_name()}")
+            for mod in registry.get_duplicates(module):
+                print(f"    !!! duplicate: {mod.get_int_name()}")
     elif output_format == "markdown":
         print("| module | version |\n|---|---|")
         for module in modules:
@@ -1,8 +1,9 @@
 import click
 import copier  # type: ignore[import]
+from hitchhiker.cli.modules import NEW_SHORT_HELP
 
 
-@click.command(name="new", short_help="Create new Odoo module from copier template")
+@click.command(name="new", short_help=NEW_SHORT_HELP)
 @click.argument("name")
 @click.option(
     "--template",
@@ -1,10 +1,11 @@
 import click
+from hitchhiker.cli.odoo import SHORT_HELP
 
 # FIXME: this causes issues when generating docs as click_odoo depends on odoo which we do not have in the devcontainer
 # import click_odoo  # type: ignore[import]
 
 
-@click.group()
+@click.group(short_help=SHORT_HELP)
 @click.option(
     "-c",
     "--config",
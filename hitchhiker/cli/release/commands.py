@@ -3,17 +3,33 @@ import git
 import click
 import hitchhiker.cli.release.config as conf
 import hitchhiker.cli.release.version as version
+from hitchhiker.cli.release import SHORT_HELP
 
 
-@click.group()
+@click.group(short_help=SHORT_HELP)
 @click.option("--workdir", default="./", help="working directory")
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="do not use the commit cache in .git/hitchhiker/",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="worker processes for reading long histories (0: one per CPU)",
+)
 @click.pass_context
-def release(ctx: click.Context, workdir: str) -> None:
+def release(ctx: click.Context, workdir: str, no_cache: bool, jobs: int) -> None:
     """
     Prepares the release context for a git repository.
 
     Parameters:
         workdir (str): The path to the working directory.
+        no_cache (bool): Do not read or write the persistent commit cache.
+        jobs (int): The number of worker processes used to read long histories (0: one per CPU).
 
     Description:
     This command group prepares the release context for a git repository based on the provided working directory.
@@ -38,6 +54,9 @@ def release(ctx: click.Context, workdir: str) -> None:
         ctx.obj["RELEASE_CONF"] = conf.create_context_from_raw_config(
             cfgpath, repo, True
         )
+    if no_cache:
+        ctx.obj["RELEASE_CONF"]["commit_cache"] = None
+    ctx.obj["RELEASE_CONF"]["jobs"] = jobs if jobs > 0 else (os.cpu_count() or 1)
 
 
 release.add_command(version.version)
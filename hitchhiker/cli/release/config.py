@@ -1,8 +1,6 @@
 import configparser
-import glob as pyglob
 import os
 import re
-from pathlib import Path
 from typing import Any, Dict, Union
 
 import git
@@ -10,7 +8,9 @@ import tomlkit
 from dotty_dict import Dotty  # type: ignore[import]
 
 import hitchhiker.odoo.module as odoo_mod
+import hitchhiker.odoo.walk as walk
 import hitchhiker.release.version.semver as semver
+from hitchhiker.release.version.cache import CommitCache
 
 # regex from https://semver.org/spec/v2.0.0.html (modified to allow versions with a v at the start) and modified to only have a single capture group
 _semver_group = (
@@ -161,6 +161,14 @@ def create_context_from_raw_config(
         "version_toml": [],
         "version_odoo_manifest": [],
         "version_cfg": [],
+        "commit_index": {},
+        "project_commits": {},
+        "parsed_commits": {},
+        "tag_index": None,
+        "jobs": 1,
+        "commit_cache": CommitCache(
+            os.path.join(repo.git_dir, "hitchhiker", "commits.json")
+        ),
     }
     if not is_odoo:
         with open(tomlcfg, "r", encoding="utf-8") as f:
@@ -225,16 +233,21 @@ def create_context_from_raw_config(
                 if "prepend_branch_to_tag" in cfg["tool.hitchhiker"]
                 else False
             )
+            module_discovery = cfg["tool.hitchhiker"].get("module_discovery", "git")
+            assert module_discovery in [
+                "git",
+                "filesystem",
+            ], f'invalid module_discovery "{module_discovery}"'
+            # tracked files only by default, so untracked and ignored files are never scanned
+            find_manifests = (
+                walk.find_manifests_git
+                if module_discovery == "git"
+                else walk.find_manifests
+            )
             modules = odoo_mod.discover_modules(
-                list(
-                    filter(
-                        lambda n: Path(n).name == "__manifest__.py",
-                        pyglob.glob(
-                            os.path.abspath(repo.working_tree_dir)
-                            + "/**/__manifest__.py",
-                            recursive=True,
-                        ),
-                    )
+                find_manifests(
+                    os.path.abspath(repo.working_tree_dir),
+                    exclude=cfg["tool.hitchhiker"].get("module_exclude", "").split(),
                 )
             )
             for module in modules:
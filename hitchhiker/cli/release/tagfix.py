@@ -1,12 +1,70 @@
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+# a branch prefix is everything before the first dash that is followed by a version
+_BRANCH_TAG = re.compile(r"(.+?)-([vV]?\d+\.\d+\.\d+.*)")
+
+
+def get_active_branch(config: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns the name of the active branch.
+
+    Parameters:
+        config (dict): Configuration information for the repository and versioning.
+
+    Returns:
+        str: The name of the active branch, None if HEAD is detached.
+    """
+    try:
+        return str(config["repo"].active_branch)
+    except TypeError:
+        # detached HEAD
+        return None
+
+
+def split_tag(
+    config: Dict[str, Any], tag: str, active_branch: Optional[str]
+) -> Tuple[Optional[str], str]:
+    """
+    Splits a tag into its branch prefix and the version.
+
+    Parameters:
+        config (dict): Configuration information for the repository and versioning.
+        tag (str): The tag to split.
+        active_branch (str, optional): The name of the active branch.
+
+    Returns:
+        tuple: The branch prefix (None if there is none) and the rest of the tag.
+
+    Description:
+    Branch prefixes are only split off if `prepend_branch_to_tag` is set.
+    The prefix of the active branch is removed as it is, so branch names may contain dashes.
+    For tags of other branches the prefix ends at the first dash followed by a version.
+
+    Example:
+    ```
+    split_tag(config, "release-16-v1.0.0", "release-16")  # ("release-16", "v1.0.0")
+    ```
+
+    """
+    if not config["prepend_branch_to_tag"]:
+        return None, tag
+    if active_branch is not None and tag.startswith(f"{active_branch}-"):
+        return active_branch, tag.removeprefix(f"{active_branch}-")
+    match = _BRANCH_TAG.fullmatch(tag)
+    return (match.group(1), match.group(2)) if match is not None else (None, tag)
 
 
 def get_tag_without_branch(config: Dict[str, Any], tag: str) -> str:
     if not config["prepend_branch_to_tag"]:
         return tag
-    match = re.match(r"([^-]+)-(.+)", tag)
-    return match.group(2) if match is not None else tag
+    return split_tag(config, tag, get_active_branch(config))[1]
+
+
+def get_branch_from_tag(config: Dict[str, Any], tag: str) -> Optional[str]:
+    if not config["prepend_branch_to_tag"]:
+        return None
+    return split_tag(config, tag, get_active_branch(config))[0]
 
 
 def add_branch_to_tag(config: Dict[str, Any], version: str) -> str:
@@ -3,10 +3,10 @@ import os
 import re
 from typing import Optional, Dict
 import git
-import github
 import click
 import hitchhiker.release.version.semver as semver
 import hitchhiker.release.version.commit as commit
+import hitchhiker.release.version.history as history
 import hitchhiker.cli.release.config as config
 import hitchhiker.cli.release.tagfix as tagfix
 import hitchhiker.release.enums as enums
@@ -66,6 +66,9 @@ def do_gh_release(
     ctx: click.Context, newtag: str, message: str, prerelease: bool, ghtoken: str
 ) -> None:
     """Creates a github release"""
+    # PyGithub is slow to import and only needed here
+    import github
+
     repo_owner, repo_name = get_repo_owner_name(ctx)
     if repo_owner is None or repo_name is None:
         raise click.ClickException(
@@ -138,7 +141,7 @@ def version(
     bumped = False
     changedfiles = []
     change_commits: Dict[
-        str, tuple[semver.Version, list[git.objects.commit.Commit]]
+        str, tuple[semver.Version, list[history.HistoryCommit]]
     ] = {}
     for project in ctx.obj["RELEASE_CONF"]["projects"]:
         click.echo(f"{project['name']}: {project['version']}")
@@ -199,6 +202,7 @@ def version(
             projects_new=ctx.obj["RELEASE_CONF"]["projects"],
             repo_owner=repo_owner,
             repo_name=repo_name,
+            parsed_commits=ctx.obj["RELEASE_CONF"]["parsed_commits"],
         )
         write_changelog(ctx, changelog_newtext, changedfiles)
 
@@ -0,0 +1,2 @@
+# shown by `hitchhiker --help` without importing the commands (see LazyGroup)
+SHORT_HELP = "Checks for updates to the current hitchhiker version and provides update instructions."
@@ -1,9 +1,11 @@
+import importlib.metadata
 import sys
 import os
 import subprocess
 import click
 import github
 import hitchhiker.release.version.semver as semver
+from hitchhiker.cli.update import SHORT_HELP
 
 
 def _get_latest(ctx: click.Context) -> semver.Version:
@@ -54,7 +56,7 @@ def _get_latest(ctx: click.Context) -> semver.Version:
     raise Exception("no releases found")
 
 
-@click.command()
+@click.command(short_help=SHORT_HELP)
 @click.pass_context
 def update(ctx: click.Context) -> None:
     """
@@ -66,7 +68,7 @@ def update(ctx: click.Context) -> None:
     If a newer version is available, it provides instructions on how to update.
 
     """
-    version = semver.Version().parse(ctx.obj["VERSION"])
+    version = semver.Version().parse(importlib.metadata.version("hitchhiker"))
     click.echo(f"Current version: {version}")
     try:
         latest = _get_latest(ctx)
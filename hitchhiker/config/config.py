@@ -1,55 +1,107 @@
 import os
-from typing import Dict, Any
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
 from pathlib import Path
 import json
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows, the configuration is not locked there
+    fcntl = None  # type: ignore[assignment]
+
+# a file which cannot be parsed might still be written by an older (non-atomic) version
+_READ_RETRIES = 5
+_READ_RETRY_DELAY = 0.02
+
 
 class ConfigManager:
-    def _create_file_if_nonexistant(self, filepath: str) -> None:
+    @contextmanager
+    def _lock(self, exclusive: bool) -> Iterator[None]:
         """
-        Create a file if it doesn't already exist at the specified filepath.
-        Also create all directories in the path.
+        Lock the configuration file for reading (shared) or writing (exclusive).
 
         Parameters:
-            filepath (str): The path to the file to be created.
+            exclusive (bool): Whether to take an exclusive lock.
 
         Returns:
-            None
+            Iterator[None]: A context manager holding the lock.
+
+        Description:
+        The lock is taken on a separate `.lock` file next to the configuration file,
+        as the configuration file itself is replaced on every write.
+        If the lock file cannot be created (e.g. read-only directory) the configuration is not locked.
         """
-        if not os.path.isfile(filepath):
-            dirpath = Path(filepath).resolve().parent
-            Path(dirpath).mkdir(parents=True, exist_ok=True)
-            open(filepath, "a").close()
+        fd = None
+        if fcntl is not None:
+            try:
+                fd = os.open(f"{self._fpath}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError:
+                fd = None
+        try:
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            if fd is not None:
+                os.close(fd)
 
-    def _read_config(self) -> Dict[str, Any]:
+    def _stat_config(self) -> Optional[tuple[int, int, int]]:
         """
-        Read the configuration from a file and return it as a dictionary.
-        If the file doesn't exist or is not valid JSON, create a new file with default configuration.
+        Return a signature of the configuration file which changes whenever the file is written.
 
         Returns:
-            dict: The configuration as a dictionary.
+            Optional[tuple]: The modification time, size and inode of the file, or None if it does not exist.
         """
-        self._create_file_if_nonexistant(self._fpath)
         try:
-            with open(self._fpath, "r") as f:
-                read = json.loads(f.read())
-                assert isinstance(read, Dict)
-                return read
-        except json.JSONDecodeError:
-            with open(self._fpath, "w") as f:
-                f.write(json.dumps(self._default_conf))
-            return self._read_config()
+            st = os.stat(self._fpath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
 
-    def _write_config(self) -> None:
+    def _read_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the configuration from a file and return it as a dictionary.
+        If the file doesn't exist or is empty, an empty configuration is returned.
+
+        Returns:
+            Optional[dict]: The configuration as a dictionary, or None if the file is not valid JSON.
+        """
+        for attempt in range(_READ_RETRIES):
+            if attempt > 0:
+                time.sleep(_READ_RETRY_DELAY)
+            try:
+                with open(self._fpath, "r") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                return {}
+            if content.strip() == "":
+                return {}
+            try:
+                read = json.loads(content)
+            except json.JSONDecodeError:
+                continue
+            return read if isinstance(read, Dict) else None
+        return None
+
+    def _write_config(self, confdict: Dict[str, Any]) -> None:
         """
         Write the configuration dictionary to a file in JSON format.
 
+        Parameters:
+            confdict (dict): The configuration to write.
+
         Returns:
             None
+
+        Description:
+        The configuration is written to a temporary file which then replaces the configuration file,
+        so an interrupted write can never leave a truncated configuration behind.
         """
-        self._create_file_if_nonexistant(self._fpath)
-        with open(self._fpath, "w") as f:
-            f.write(json.dumps(self._confdict))
+        tmppath = f"{self._fpath}.{os.getpid()}.tmp"
+        with open(tmppath, "w") as f:
+            f.write(json.dumps(confdict))
+        os.replace(tmppath, self._fpath)
 
     def __init__(self, path: str, defaultconf: Dict[str, Any]):
         """
@@ -61,15 +113,110 @@ class ConfigManager:
 
         Returns:
             None
+
+        Description:
+        The configuration file is only read on first access, so creating a ConfigManager costs no I/O.
+        Keys of the default configuration missing from the file are added to it.
+        Many processes can share one configuration file: reads take a shared lock, writes take an
+        exclusive lock and merge the changed keys into the current contents of the file,
+        and the file is read again whenever another process changed it.
         """
         self._fpath = os.path.expanduser(path)
         self._default_conf = defaultconf
-        self._confdict = self._read_config()
+        self._confdict: Optional[Dict[str, Any]] = None
+        self._signature: Optional[tuple[int, int, int]] = None
+        # keys set since the last write, merged into the file on flush
+        self._changes: Dict[str, Any] = {}
+        self._dirty = False
+        self._transaction_depth = 0
+
+    def _get_confdict(self) -> Dict[str, Any]:
+        """
+        Return the configuration dictionary, reading the configuration file on first access
+        and whenever it was changed by another process.
+
+        Returns:
+            dict: The configuration as a dictionary, including changes which are not written yet.
+        """
+        if self._confdict is not None and self._stat_config() == self._signature:
+            return self._confdict
+        with self._lock(exclusive=False):
+            self._signature = self._stat_config()
+            read = self._read_config()
+        # an unreadable file is used as an empty configuration but never written back
+        self._confdict = {**(read if read is not None else {}), **self._changes}
 
         # append new default config keys to config
         for key in self._default_conf.keys():
             if key not in self._confdict.keys():
-                self.set_key(key, self._default_conf[key])
+                self._confdict[key] = self._default_conf[key]
+                self._dirty = True
+        if self._transaction_depth == 0:
+            self.flush()
+        return self._confdict
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Batch all changes made inside the context into a single write of the configuration file.
+
+        Returns:
+            Iterator[None]: A context manager.
+
+        Description:
+        The configuration file is written once when the outermost transaction ends.
+        If the transaction is left with an exception its changes are discarded.
+
+        Example:
+        ```
+        with conf.transaction():
+            conf.set_key("a", 1)
+            conf.set_key("b", 2)
+        ```
+
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._transaction_depth == 1:
+                self._confdict = None
+                self._changes = {}
+                self._dirty = False
+            raise
+        finally:
+            self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write pending changes to the configuration file.
+
+        Returns:
+            None
+
+        Description:
+        The file is read again while holding the exclusive lock and only the keys changed by this
+        instance (and missing default keys) are applied to it, so concurrent writers never lose each other's keys.
+        A file which cannot be parsed is kept as `<path>.corrupt` instead of being overwritten.
+        """
+        if not self._dirty:
+            return
+        Path(self._fpath).resolve().parent.mkdir(parents=True, exist_ok=True)
+        with self._lock(exclusive=True):
+            current = self._read_config()
+            if current is None:
+                os.replace(self._fpath, f"{self._fpath}.corrupt")
+                current = {}
+            for key in self._default_conf.keys():
+                current.setdefault(key, self._default_conf[key])
+            current.update(self._changes)
+            self._write_config(current)
+            self._signature = self._stat_config()
+        self._confdict = current
+        self._changes = {}
+        self._dirty = False
 
     def get_key(self, key: str) -> Any:
         """
@@ -84,8 +231,9 @@ class ConfigManager:
         Raises:
             KeyError: If the key does not exist in the configuration.
         """
-        if key in self._confdict.keys():
-            return self._confdict[key]
+        confdict = self._get_confdict()
+        if key in confdict.keys():
+            return confdict[key]
         raise KeyError(key)
 
     def set_key(self, key: str, value: Any) -> None:
@@ -98,9 +246,15 @@ class ConfigManager:
 
         Returns:
             None
+
+        Description:
+        Inside a transaction the file is written when the transaction ends.
         """
-        self._confdict[key] = value
-        self._write_config()
+        self._get_confdict()[key] = value
+        self._changes[key] = value
+        self._dirty = True
+        if self._transaction_depth == 0:
+            self.flush()
 
     def has_key(self, key: str) -> bool:
         """
@@ -112,4 +266,4 @@ class ConfigManager:
         Returns:
             bool: True if the key exists in the configuration, False otherwise.
         """
-        return key in self._confdict.keys()
+        return key in self._get_confdict().keys()
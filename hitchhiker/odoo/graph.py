@@ -0,0 +1,340 @@
+import hashlib
+import heapq
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from hitchhiker.odoo.index import ModuleIndex
+from hitchhiker.odoo.module import ModuleRegistry
+
+
+class ModuleGraph:
+    """The dependency graph of discovered Odoo modules, built from the `depends` of their manifests"""
+
+    def __init__(
+        self, registry: ModuleRegistry, index: Optional[ModuleIndex] = None
+    ) -> None:
+        """
+        Initializes the dependency graph of the modules of a registry.
+
+        Parameters:
+            registry (ModuleRegistry): The discovered modules.
+            index (ModuleIndex, optional): The module index the topological order, levels and cycles are stored in.
+
+        Description:
+        Every technical name is a node. If a name was discovered more than once the first module
+        (the one Odoo loads from the addons path) defines its dependencies.
+        Dependencies which were not discovered (e.g. Odoo core modules outside of the searched tree)
+        are not part of the graph, they are listed by `get_missing`.
+        The topological order, the levels and the cycles are computed once for all modules on first use.
+        With an index they are stored for the fingerprint of the graph (all names and dependencies),
+        so they are only computed again when a dependency changes.
+        Closures are computed on demand by walking the graph, so they cost O(size of the closure).
+
+        Example:
+        ```
+        graph = ModuleGraph(discover_modules(manifests))
+        order = graph.topological_order(graph.dependents_closure(["sale_custom"]))
+        ```
+
+        """
+        self._depends: Dict[str, list[str]] = {}
+        self._dependents: Dict[str, list[str]] = {}
+        self._missing: Dict[str, list[str]] = {}
+        for name in registry.get_names():
+            self._depends[name] = []
+            self._dependents[name] = []
+        for name in registry.get_names():
+            for dep in registry.get(name)[0].get_depends():
+                if dep not in self._depends:
+                    self._missing.setdefault(name, []).append(dep)
+                elif dep not in self._depends[name]:
+                    self._depends[name].append(dep)
+                    self._dependents[dep].append(name)
+        self._index = index
+        self._memo: Optional[Dict[str, Any]] = None
+        self._positions: Optional[Dict[str, int]] = None
+        self._closures: Dict[str, frozenset[str]] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._depends
+
+    def get_names(self) -> list[str]:
+        """
+        Gets the technical names of all modules in the graph.
+
+        Returns:
+            list: The names in the order they were discovered.
+        """
+        return list(self._depends.keys())
+
+    def get_depends(self, name: str) -> list[str]:
+        """
+        Gets the direct dependencies of a module.
+
+        Parameters:
+            name (str): The technical name of the module.
+
+        Returns:
+            list: The names of the discovered modules listed in its `depends`.
+        """
+        return self._depends[name]
+
+    def get_dependents(self, name: str) -> list[str]:
+        """
+        Gets the modules directly depending on a module.
+
+        Parameters:
+            name (str): The technical name of the module.
+
+        Returns:
+            list: The names of the modules listing it in their `depends`, in the order they were discovered.
+        """
+        return self._dependents[name]
+
+    def get_missing(self) -> Dict[str, list[str]]:
+        """
+        Gets the dependencies which were not discovered.
+
+        Returns:
+            dict: Maps the names of modules to their dependencies which are not in the graph.
+        """
+        return self._missing
+
+    def _closure(
+        self, names: Iterable[str], adjacency: Dict[str, list[str]]
+    ) -> set[str]:
+        """
+        Walks the graph from the given modules.
+
+        Parameters:
+            names (Iterable[str]): The technical names of the modules, names not in the graph are ignored.
+            adjacency (dict): The edges to follow.
+
+        Returns:
+            set: The given modules and all modules reachable from them.
+        """
+        closure = set(name for name in names if name in adjacency)
+        stack = list(closure)
+        while len(stack) > 0:
+            for neighbor in adjacency[stack.pop()]:
+                if neighbor not in closure:
+                    closure.add(neighbor)
+                    stack.append(neighbor)
+        return closure
+
+    def dependents_closure(self, names: Iterable[str]) -> set[str]:
+        """
+        Gets the modules which (transitively) depend on the given modules.
+
+        Parameters:
+            names (Iterable[str]): The technical names of the modules, names not in the graph are ignored.
+
+        Returns:
+            set: The given modules and all modules depending on them directly or indirectly.
+        """
+        return self._closure(names, self._dependents)
+
+    def dependencies_closure(self, names: Iterable[str]) -> set[str]:
+        """
+        Gets the modules the given modules (transitively) depend on.
+
+        Parameters:
+            names (Iterable[str]): The technical names of the modules, names not in the graph are ignored.
+
+        Returns:
+            set: The given modules and all modules they depend on directly or indirectly.
+
+        Description:
+        The closure of a single module is kept, so asking again for everything a module needs is free.
+
+        Example:
+        ```
+        needed = graph.dependencies_closure(["sale_custom"])
+        ```
+
+        """
+        names = list(names)
+        if len(names) == 1 and names[0] in self._depends:
+            closure = self._closures.get(names[0])
+            if closure is None:
+                closure = frozenset(self._closure(names, self._depends))
+                self._closures[names[0]] = closure
+            return set(closure)
+        return self._closure(names, self._depends)
+
+    def fingerprint(self) -> str:
+        """
+        Gets a fingerprint of the graph, which changes whenever a module or a dependency is added or removed.
+
+        Returns:
+            str: The SHA-256 of all names and dependencies.
+        """
+        graph = sorted(
+            [name, sorted(depends)] for name, depends in self._depends.items()
+        )
+        return hashlib.sha256(json.dumps(graph).encode("utf-8")).hexdigest()
+
+    def _get_memo(self) -> Dict[str, Any]:
+        """
+        Gets the topological order, levels and cycles of the whole graph, computing them on first use.
+
+        Returns:
+            dict: The results with the keys `order`, `levels` and `cycles`.
+        """
+        if self._memo is not None:
+            return self._memo
+        key = self.fingerprint() if self._index is not None else ""
+        if self._index is not None:
+            self._memo = self._index.get_graph(key)
+        if self._memo is None:
+            self._memo = self._compute()
+            if self._index is not None:
+                self._index.set_graph(key, self._memo)
+                self._index.save()
+        return self._memo
+
+    def _components(self) -> list[list[str]]:
+        """
+        Finds the strongly connected components of the graph (Tarjan's algorithm, without recursion).
+
+        Returns:
+            list: The components, every component is a list of names. Modules which are not on a cycle are a component of their own.
+        """
+        indices: Dict[str, int] = {}
+        lowlinks: Dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components = []
+        for start in self._depends.keys():
+            if start in indices:
+                continue
+            indices[start] = lowlinks[start] = len(indices)
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(self._depends[start]))]
+            while len(work) > 0:
+                name, deps = work[-1]
+                descended = False
+                for dep in deps:
+                    if dep not in indices:
+                        indices[dep] = lowlinks[dep] = len(indices)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self._depends[dep])))
+                        descended = True
+                        break
+                    if dep in on_stack:
+                        lowlinks[name] = min(lowlinks[name], indices[dep])
+                if descended:
+                    continue
+                work.pop()
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[name])
+                if lowlinks[name] == indices[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    components.append(sorted(component))
+        return components
+
+    def _compute(self) -> Dict[str, Any]:
+        """
+        Computes the topological order, levels and cycles of the whole graph.
+
+        Returns:
+            dict: The results with the keys `order`, `levels` and `cycles`.
+        """
+        components = self._components()
+        component_of = {}
+        for i, component in enumerate(components):
+            for name in component:
+                component_of[name] = i
+        # the modules of a cycle are ordered and leveled together
+        depends: list[set[int]] = [set() for _ in components]
+        dependents: list[set[int]] = [set() for _ in components]
+        for name, deps in self._depends.items():
+            for dep in deps:
+                if component_of[dep] != component_of[name]:
+                    depends[component_of[name]].add(component_of[dep])
+                    dependents[component_of[dep]].add(component_of[name])
+        pending = [len(deps) for deps in depends]
+        ready = [
+            (components[i][0], i) for i in range(len(components)) if pending[i] == 0
+        ]
+        heapq.heapify(ready)
+        order: list[str] = []
+        levels: Dict[str, int] = {}
+        component_levels = [0] * len(components)
+        while len(ready) > 0:
+            _, i = heapq.heappop(ready)
+            component_levels[i] = max(
+                (component_levels[dep] + 1 for dep in depends[i]), default=0
+            )
+            for name in components[i]:
+                order.append(name)
+                levels[name] = component_levels[i]
+            for dependent in dependents[i]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, (components[dependent][0], dependent))
+        cycles = sorted(
+            component
+            for component in components
+            if len(component) > 1 or component[0] in self._depends[component[0]]
+        )
+        return {"order": order, "levels": levels, "cycles": cycles}
+
+    def topological_order(self, names: Optional[Iterable[str]] = None) -> list[str]:
+        """
+        Orders modules so every module comes after its dependencies.
+
+        Parameters:
+            names (Iterable[str], optional): The modules to order, all modules if None.
+
+        Returns:
+            list: The modules in dependency order, modules without an order between them are sorted by name.
+
+        Description:
+        The given modules are taken from the order of the whole graph, so modules are also ordered
+        by dependencies through modules which are not given.
+        The modules of a dependency cycle cannot be ordered, they are kept together sorted by name.
+        """
+        order: list[str] = self._get_memo()["order"]
+        if names is None:
+            return list(order)
+        selected = set(name for name in names if name in self._depends)
+        if len(selected) * 8 < len(order):
+            if self._positions is None:
+                self._positions = {name: i for i, name in enumerate(order)}
+            positions = self._positions
+            return sorted(selected, key=lambda name: positions[name])
+        return [name for name in order if name in selected]
+
+    def get_levels(self) -> Dict[str, int]:
+        """
+        Gets the depth of every module in the graph.
+
+        Returns:
+            dict: Maps the names to their level, 0 for modules without dependencies in the graph,
+                otherwise one more than the highest level of their dependencies.
+
+        Description:
+        Modules of the same level do not depend on each other, so they can be installed or tested in parallel.
+        """
+        levels: Dict[str, int] = self._get_memo()["levels"]
+        return levels
+
+    def find_cycles(self) -> list[list[str]]:
+        """
+        Finds the dependency cycles of the graph.
+
+        Returns:
+            list: The cycles, every cycle is the sorted list of the modules on it. Empty if there are no cycles.
+        """
+        cycles: list[list[str]] = self._get_memo()["cycles"]
+        return cycles
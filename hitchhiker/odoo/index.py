@@ -0,0 +1,143 @@
+import os
+from typing import Any, Dict, Optional
+
+from hitchhiker.cache_store import JsonCacheStore
+
+
+def default_index_path() -> str:
+    """
+    Returns the default path of the module index.
+
+    Returns:
+        str: `$XDG_CACHE_HOME/hitchhiker/modules.json`, defaulting to `~/.cache/hitchhiker/modules.json`.
+    """
+    cachedir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cachedir, "hitchhiker", "modules.json")
+
+
+class ModuleIndex:
+    """Persistent index of parsed Odoo module manifests, keyed by manifest path"""
+
+    # bump this whenever the format or the meaning of the indexed entries changes
+    VERSION = 2
+    # dependency graphs are only kept for the last few module sets (e.g. checkouts or globs)
+    MAX_GRAPHS = 16
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 20000) -> None:
+        """
+        Initializes a module index stored at the specified path.
+
+        Parameters:
+            path (str, optional): The path to the index file, defaults to `default_index_path()`.
+            max_entries (int): The maximum number of manifests kept in the index.
+
+        Description:
+        The index file is only read on first access. An entry is only used if the modification time,
+        size and inode of the manifest are unchanged, so looking up an unchanged manifest costs a single `stat` call.
+        If the index file is missing, unreadable or was written by another index version it is ignored.
+        When there are more than `max_entries` entries the least recently used ones are evicted on save.
+        The index also keeps the results computed for the dependency graphs of the last `MAX_GRAPHS` module sets.
+
+        Example:
+        ```
+        index = ModuleIndex()
+        modules = discover_modules(manifests, index)
+        ```
+
+        """
+        self._store = JsonCacheStore(
+            path if path is not None else default_index_path(),
+            self.VERSION,
+            {"entries": max_entries, "graphs": self.MAX_GRAPHS},
+            "module index",
+        )
+
+    @staticmethod
+    def stat(manifest_path: str) -> Optional[list[int]]:
+        """
+        Returns the signature used to validate the index entry of a manifest.
+
+        Parameters:
+            manifest_path (str): The path to the manifest file.
+
+        Returns:
+            Optional[list]: The modification time, size and inode of the file, or None if it does not exist.
+        """
+        try:
+            st = os.stat(manifest_path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+    def get(
+        self, manifest_path: str, signature: Optional[list[int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the indexed fields of a manifest.
+
+        Parameters:
+            manifest_path (str): The path to the manifest file.
+            signature (list, optional): The result of `stat(manifest_path)` if it is already known.
+
+        Returns:
+            dict: The indexed fields, or None if the manifest is not indexed or changed since it was indexed.
+        """
+        key = os.path.abspath(manifest_path)
+        entry = self._store.get("entries", key)
+        if entry is None:
+            return None
+        if signature is None:
+            signature = self.stat(manifest_path)
+        if signature != entry[:3]:
+            self._store.remove("entries", key)
+            return None
+        fields = entry[3]
+        assert isinstance(fields, dict)
+        return fields
+
+    def set(
+        self, manifest_path: str, signature: list[int], fields: Dict[str, Any]
+    ) -> None:
+        """
+        Adds a manifest to the index.
+
+        Parameters:
+            manifest_path (str): The path to the manifest file.
+            signature (list): The result of `stat(manifest_path)` taken before the manifest was read.
+            fields (dict): The fields to index, must be serializable as JSON.
+        """
+        self._store.set("entries", os.path.abspath(manifest_path), [*signature, fields])
+
+    def get_graph(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the results stored for a dependency graph.
+
+        Parameters:
+            key (str): The fingerprint of the graph (see `ModuleGraph`).
+
+        Returns:
+            dict: The stored results, or None if there are none for this graph.
+        """
+        graph = self._store.get("graphs", key)
+        assert graph is None or isinstance(graph, dict)
+        return graph
+
+    def set_graph(self, key: str, graph: Dict[str, Any]) -> None:
+        """
+        Stores the results computed for a dependency graph.
+
+        Parameters:
+            key (str): The fingerprint of the graph.
+            graph (dict): The results, must be serializable as JSON.
+        """
+        self._store.set("graphs", key, graph)
+
+    def save(self) -> None:
+        """
+        Writes the index to disk if it was changed, evicting the least recently used entries.
+
+        Description:
+        The index is replaced atomically and a write error only issues a warning (see `JsonCacheStore.save`),
+        the index never makes a command fail.
+        """
+        self._store.save()
@@ -1,29 +1,55 @@
 import os
 import re
-from typing import Dict, Any, Optional
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, Optional, Union
 from pathlib import Path
 import ast
 import hitchhiker.release.version.semver as semver
+from hitchhiker.odoo.index import ModuleIndex
 
+# manifest keys stored in the module index, all other keys are only read from the manifest file
+_INDEXED_KEYS = ("name", "version", "depends", "installable")
+# fewer manifests are parsed serially, as starting the workers would take longer
+_MIN_MANIFESTS_PER_THREAD = 16
+_MIN_MANIFESTS_PER_PROCESS = 500
 
-class Module:
-    _manifest_dict: Dict[str, Any] = {}
-    _int_name = ""
-    _valid = False
 
-    def __init__(self, manifest_path: str):
+class Module:
+    """An Odoo module, keeping only the manifest keys which are queried"""
+
+    __slots__ = (
+        "_path",
+        "_int_name",
+        "_valid",
+        "_name",
+        "_version_str",
+        "_depends",
+        "_installable",
+        "_version",
+        "_version_parsed",
+        "_manifest",
+    )
+
+    __VERSION_REGEX = re.compile(r"^(?:\d+\.\d+\.)?(\d+\.\d+\.\d+)$")
+
+    def __init__(self, manifest_path: str, indexed: Optional[Dict[str, Any]] = None):
         """
         Initializes an Odoo module instance based on the provided manifest file.
 
         Parameters:
             manifest_path (str): The path to the manifest file.
+            indexed (dict, optional): The fields of the module stored in a `ModuleIndex` (see `to_index`),
+                the manifest file is not read if they are given.
 
         Returns:
             None
 
         Description:
         This method initializes an Odoo module instance by reading the manifest file located at the provided path.
-        It sets the module directory, internal name, and manifest dictionary based on the contents of the manifest file.
+        Only the internal name and the name, version, depends and installable keys of the manifest are kept,
+        the full manifest is read again on demand by `get_manifest`.
 
         Example:
         ```
@@ -31,13 +57,84 @@ class Module:
         ```
 
         """
-        self._moduledir = os.path.dirname(manifest_path)
+        self._path = manifest_path
+        self._version: Optional[semver.Version] = None
+        self._version_parsed = False
+        self._manifest: Optional[Dict[str, Any]] = None
+        if indexed is not None:
+            self._int_name: str = indexed["int_name"]
+            self._valid = True
+            self.__set_fields(indexed["manifest"])
+            return
         self._int_name = Path(manifest_path).resolve().parent.name
         with open(manifest_path) as f:
             d = ast.literal_eval(f.read())
-            if isinstance(d, dict):
-                self._valid = True  # TODO: check types of objects in dict
-                self._manifest_dict = d
+        self._valid = isinstance(d, dict)  # TODO: check types of objects in dict
+        self.__set_fields(d if isinstance(d, dict) else {})
+
+    def __set_fields(self, manifest: Dict[str, Any]) -> None:
+        """
+        Keeps the queried keys of a manifest, None for missing keys.
+
+        Parameters:
+            manifest (dict): The manifest or the indexed subset of it.
+        """
+        self._name = manifest.get("name")
+        self._version_str = manifest.get("version")
+        depends = manifest.get("depends")
+        self._depends = list(depends) if isinstance(depends, tuple) else depends
+        self._installable = manifest.get("installable")
+
+    def to_index(self) -> Optional[Dict[str, Any]]:
+        """
+        Gets the fields of the Odoo module which are stored in a `ModuleIndex`.
+
+        Returns:
+            Optional[dict]: The internal name and the indexed manifest keys,
+                or None if the module is invalid or the values cannot be stored as JSON.
+        """
+        if not self.is_valid():
+            return None
+        values = (self._name, self._version_str, self._depends, self._installable)
+        fields = {
+            "int_name": self._int_name,
+            "manifest": {
+                key: value
+                for key, value in zip(_INDEXED_KEYS, values)
+                if value is not None
+            },
+        }
+        try:
+            json.dumps(fields)
+        except (TypeError, ValueError):
+            return None
+        return fields
+
+    def get_manifest(self) -> Dict[str, Any]:
+        """
+        Gets the full manifest of the Odoo module.
+
+        Returns:
+            dict: The manifest, empty if the module is not valid.
+
+        Description:
+        The manifest file is read on the first call and kept for later calls.
+
+        Example:
+        ```
+        data_files = module.get_manifest().get("data", [])
+        ```
+
+        """
+        if self._manifest is None:
+            manifest = {}
+            if self.is_valid():
+                with open(self._path) as f:
+                    d = ast.literal_eval(f.read())
+                if isinstance(d, dict):
+                    manifest = d
+            self._manifest = manifest
+        return self._manifest
 
     def is_valid(self) -> bool:
         """
@@ -74,7 +171,7 @@ class Module:
         ```
 
         """
-        return self._moduledir
+        return os.path.dirname(self._path)
 
     def get_int_name(self) -> str:
         """
@@ -114,12 +211,10 @@ class Module:
         ```
 
         """
-        if not self.is_valid() or "name" not in self._manifest_dict:
+        if not self.is_valid() or self._name is None:
             return None
-        assert isinstance(
-            self._manifest_dict["name"], str
-        ), "invalid Odoo module manifest"
-        return self._manifest_dict["name"]
+        assert isinstance(self._name, str), "invalid Odoo module manifest"
+        return self._name
 
     def get_version(self) -> Optional[semver.Version]:
         """
@@ -131,6 +226,7 @@ class Module:
         Description:
         This method retrieves the semantic version of the Odoo module from its manifest.
         If the module is not valid or the manifest does not contain a version, it returns None.
+        The version is only parsed on the first call, later calls return the same instance.
 
         Example:
         ```
@@ -138,29 +234,284 @@ class Module:
         ```
 
         """
-        if not self.is_valid() or "version" not in self._manifest_dict:
+        if not self._version_parsed:
+            self._version = self.__parse_version()
+            self._version_parsed = True
+        return self._version
+
+    def __parse_version(self) -> Optional[semver.Version]:
+        """
+        Parses the version of the manifest.
+
+        Returns:
+            Optional[semver.Version]: The semantic version of the module, or None if not available.
+        """
+        if not self.is_valid() or self._version_str is None:
             return None
-        match = re.match(
-            r"^(?:\d+\.\d+\.)?(\d+\.\d+\.\d+)$", self._manifest_dict["version"]
-        )
+        match = self.__VERSION_REGEX.match(self._version_str)
         if match is None:
             return None
         return semver.Version().parse(match.group(1))
 
+    def get_depends(self) -> list[str]:
+        """
+        Gets the technical names of the modules the Odoo module depends on.
+
+        Returns:
+            list[str]: The dependencies of the module, empty if the manifest does not list any.
+
+        Example:
+        ```
+        depends = module.get_depends()
+        ```
+
+        """
+        if not self.is_valid() or self._depends is None:
+            return []
+        assert isinstance(self._depends, list), "invalid Odoo module manifest"
+        return self._depends
+
+    def is_installable(self) -> bool:
+        """
+        Checks whether the Odoo module is installable.
+
+        Returns:
+            bool: The installable key of the manifest, True if it is missing (like in Odoo).
+
+        Example:
+        ```
+        installable = module.is_installable()
+        ```
+
+        """
+        if not self.is_valid():
+            return False
+        return self._installable is None or bool(self._installable)
+
+
+class ModuleRegistry:
+    """Discovered Odoo modules, grouped by technical name and by addons directory"""
+
+    def __init__(self, modules: list[Module]) -> None:
+        """
+        Initializes a registry of the given modules.
+
+        Parameters:
+            modules (list): The modules in the order they were discovered.
+
+        Description:
+        The modules are grouped once when the registry is created, so duplicates and addons paths
+        are looked up without comparing every module with every other module.
+        Iterating the registry yields the modules in the order they were discovered.
+
+        Example:
+        ```
+        registry = ModuleRegistry(modules)
+        for module in registry.sorted():
+            print(module.get_int_name(), len(registry.get_duplicates(module)))
+        ```
+
+        """
+        self._modules = modules
+        self._by_name: Dict[str, list[Module]] = {}
+        self._by_addons_dir: Dict[str, list[Module]] = {}
+        for module in modules:
+            self._by_name.setdefault(module.get_int_name(), []).append(module)
+            addons_dir = str(Path(module.get_dir()).parent.absolute())
+            self._by_addons_dir.setdefault(addons_dir, []).append(module)
+        self._sorted: Optional[list[Module]] = None
+
+    def __iter__(self) -> Iterator[Module]:
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def get(self, name: str) -> list[Module]:
+        """
+        Gets the modules with a technical name.
+
+        Parameters:
+            name (str): The technical name of the module.
+
+        Returns:
+            list: The modules with this name in the order they were discovered, empty if there is none.
+        """
+        return self._by_name.get(name, [])
+
+    def get_names(self) -> list[str]:
+        """
+        Gets the technical names of all modules.
+
+        Returns:
+            list: The names in the order they were first discovered, each name only once.
+        """
+        return list(self._by_name.keys())
+
+    def get_duplicates(self, module: Module) -> list[Module]:
+        """
+        Gets the other modules with the same technical name as a module.
+
+        Parameters:
+            module (Module): The module to look up.
+
+        Returns:
+            list: The modules with the same name in another directory, in the order they were discovered.
+        """
+        return [
+            mod
+            for mod in self.get(module.get_int_name())
+            if mod.get_dir() != module.get_dir()
+        ]
+
+    def get_addons_paths(self, names: Optional[Iterable[str]] = None) -> list[str]:
+        """
+        Gets the addons directories containing the modules.
+
+        Parameters:
+            names (Iterable[str], optional): Only get the directories of the modules with these names, all modules if None.
+
+        Returns:
+            list: The absolute paths of the directories containing modules, in the order they were first discovered.
+
+        Description:
+        If a name was discovered more than once only the directory of the first module is needed,
+        Odoo loads that module and ignores the others. Names which were not discovered are ignored.
+        """
+        if names is None:
+            return list(self._by_addons_dir.keys())
+        needed = set(
+            str(Path(self._by_name[name][0].get_dir()).parent.absolute())
+            for name in names
+            if name in self._by_name
+        )
+        return [path for path in self._by_addons_dir.keys() if path in needed]
+
+    def get_addons_dir_modules(self, addons_dir: str) -> list[Module]:
+        """
+        Gets the modules of an addons directory.
+
+        Parameters:
+            addons_dir (str): The absolute path of the addons directory (see `get_addons_paths`).
+
+        Returns:
+            list: The modules in the directory, in the order they were discovered.
+        """
+        return self._by_addons_dir.get(addons_dir, [])
+
+    def sorted(self) -> list[Module]:
+        """
+        Gets the modules sorted by technical name.
+
+        Returns:
+            list: The modules sorted by name, modules with the same name in the order they were discovered.
+        """
+        if self._sorted is None:
+            self._sorted = [
+                module
+                for name in sorted(self._by_name.keys())
+                for module in self._by_name[name]
+            ]
+        return self._sorted
+
+
+class ManifestError(Exception):
+    """Raised when a manifest file cannot be read or parsed"""
+
+    def __init__(self, manifest_path: str, message: str) -> None:
+        super().__init__(manifest_path, message)
+        self.manifest_path = manifest_path
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.manifest_path}: {self.message}"
 
-def discover_modules(files: list[str]) -> list[Module]:
+
+def _read_module(manifest_path: str) -> Union[Module, ManifestError]:
+    """
+    Reads an Odoo module, returning errors instead of raising them so they can be passed back from a worker.
+
+    Parameters:
+        manifest_path (str): The path to the manifest file.
+
+    Returns:
+        Union[Module, ManifestError]: The module, which might be invalid, or the error reading it.
+    """
+    try:
+        return Module(manifest_path)
+    except (
+        OSError,
+        ValueError,
+        TypeError,
+        SyntaxError,
+        MemoryError,
+        RecursionError,
+    ) as e:
+        return ManifestError(manifest_path, str(e) or type(e).__name__)
+
+
+def _read_modules(
+    paths: list[str], jobs: int, processes: bool
+) -> list[Union[Module, ManifestError]]:
+    """
+    Reads Odoo modules, optionally in parallel.
+
+    Parameters:
+        paths (list): The paths to the manifest files.
+        jobs (int): The number of workers to use.
+        processes (bool): Whether to use worker processes instead of threads.
+
+    Returns:
+        list: The results of `_read_module` in the order of the paths.
+    """
+    jobs = min(
+        jobs,
+        len(paths)
+        // (_MIN_MANIFESTS_PER_PROCESS if processes else _MIN_MANIFESTS_PER_THREAD),
+    )
+    if jobs <= 1:
+        return [_read_module(path) for path in paths]
+    executor_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_cls(max_workers=jobs) as executor:
+        # chunks are only used by process pools, where every task is a round trip to a worker
+        return list(
+            executor.map(
+                _read_module, paths, chunksize=math.ceil(len(paths) / (jobs * 4))
+            )
+        )
+
+
+def discover_modules(
+    files: list[str],
+    index: Optional[ModuleIndex] = None,
+    jobs: int = 1,
+    processes: bool = False,
+    errors: Optional[list[ManifestError]] = None,
+) -> ModuleRegistry:
     """
     Discovers Odoo modules from the specified list of file paths.
 
     Args:
         files (list[str]): A list of file paths to search for module manifest files.
+        index (ModuleIndex, optional): A persistent index of parsed manifests, only changed manifests are parsed
+            and the index is saved afterwards.
+        jobs (int): The number of workers parsing manifests.
+        processes (bool): Parse manifests in worker processes instead of threads.
+        errors (list, optional): If given, manifests which cannot be read or parsed are skipped
+            and a `ManifestError` for each of them is appended to this list.
 
     Returns:
-        list[Module]: List of discovered Odoo modules.
+        ModuleRegistry: The discovered Odoo modules.
+
+    Raises:
+        ManifestError: If a manifest cannot be read or parsed and no errors list is given.
 
     Description:
     This function searches for module manifest files in the specified list of file paths and creates a list of Odoo modules.
-    It returns a list of valid Odoo module instances.
+    It returns a registry of the valid Odoo module instances, which iterates them in the order of the file paths.
+    Manifests missing from the index are parsed by a thread pool, which hides the latency of slow (network) filesystems,
+    or by a process pool, which spreads the parsing of many manifests on a cold index over all CPUs.
+    Errors are reported in the order of the file paths as well, regardless of the number of workers.
 
     Example:
     ```
@@ -168,13 +519,43 @@ def discover_modules(files: list[str]) -> list[Module]:
     ```
 
     """
+    files = [fname for fname in files if "vendor/" not in fname]
+    results: list[Union[Module, ManifestError, None]] = [None] * len(files)
+    signatures: list[Optional[list[int]]] = [None] * len(files)
+    missing = []
+    for i, fname in enumerate(files):
+        if index is not None:
+            signatures[i] = index.stat(fname)
+            indexed = (
+                index.get(fname, signatures[i]) if signatures[i] is not None else None
+            )
+            if indexed is not None:
+                results[i] = Module(fname, indexed)
+                continue
+        missing.append(i)
+
+    for i, result in zip(
+        missing, _read_modules([files[i] for i in missing], jobs, processes)
+    ):
+        results[i] = result
+        signature = signatures[i]
+        if isinstance(result, Module) and index is not None and signature is not None:
+            fields = result.to_index()
+            if fields is not None:
+                index.set(files[i], signature, fields)
+    if index is not None:
+        index.save()
+
     modules = []
-    for fname in files:
-        if "vendor/" in fname:
+    for loaded in results:
+        if isinstance(loaded, ManifestError):
+            if errors is None:
+                raise loaded
+            errors.append(loaded)
             continue
-        module = Module(fname)
-        if not module.is_valid():
+        assert loaded is not None
+        if not loaded.is_valid():
             continue
-        modules.append(module)
+        modules.append(loaded)
 
-    return modules
+    return ModuleRegistry(modules)
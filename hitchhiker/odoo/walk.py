@@ -0,0 +1,390 @@
+import fnmatch
+import glob as pyglob
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional
+
+MANIFEST = "__manifest__.py"
+
+# directories which never contain modules that should be discovered
+_PRUNED_DIRS = frozenset(
+    ["node_modules", "__pycache__", "site-packages", "vendor", "venv"]
+)
+
+
+class _IgnoreRule(NamedTuple):
+    """A pattern of a `.gitignore` file"""
+
+    base: str
+    regex: "re.Pattern[str]"
+    anchored: bool
+    negate: bool
+
+
+def _read_gitignore(path: str, base: str) -> list[_IgnoreRule]:
+    """
+    Reads the patterns of a `.gitignore` file.
+
+    Parameters:
+        path (str): The path to the `.gitignore` file.
+        base (str): The directory containing the file, relative to the walked root ("" for the root).
+
+    Returns:
+        list: The rules in the order of the file.
+
+    Description:
+    Only the subset of the gitignore syntax relevant for directories is supported:
+    comments, negation, patterns anchored by a slash and the `**/` prefix.
+    """
+    rules: list[_IgnoreRule] = []
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        line = line.rstrip(" ")
+        if line == "" or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        if line.startswith("\\"):
+            line = line[1:]
+        line = line.rstrip("/")
+        while line.startswith("**/"):
+            line = line[3:]
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if line == "":
+            continue
+        rules.append(
+            _IgnoreRule(base, re.compile(fnmatch.translate(line)), anchored, negate)
+        )
+    return rules
+
+
+def _is_ignored(rules: list[_IgnoreRule], rel: str, name: str) -> bool:
+    """
+    Checks whether a directory is ignored by the given `.gitignore` rules (the last matching rule wins).
+
+    Parameters:
+        rules (list): The rules of all `.gitignore` files above the directory, outermost first.
+        rel (str): The path of the directory relative to the walked root.
+        name (str): The name of the directory.
+
+    Returns:
+        bool: True if the directory is ignored.
+    """
+    ignored = False
+    for rule in rules:
+        if rule.anchored:
+            sub = rel.removeprefix(f"{rule.base}/") if rule.base != "" else rel
+            match = rule.regex.match(sub) is not None
+        else:
+            match = rule.regex.match(name) is not None
+        if match:
+            ignored = not rule.negate
+    return ignored
+
+
+def _compile_excludes(exclude: Iterable[str]) -> list["re.Pattern[str]"]:
+    return [re.compile(fnmatch.translate(p.rstrip("/"))) for p in exclude]
+
+
+def _is_pruned(
+    name: str,
+    rel: str,
+    excludes: list["re.Pattern[str]"],
+    rules: list[_IgnoreRule],
+) -> bool:
+    """
+    Checks whether a directory is skipped by the walker because of its name, the excludes or `.gitignore` rules.
+
+    Parameters:
+        name (str): The name of the directory.
+        rel (str): The path of the directory relative to the walked root.
+        excludes (list): The compiled exclude patterns.
+        rules (list): The `.gitignore` rules of all directories above the directory.
+
+    Returns:
+        bool: True if the directory is skipped.
+    """
+    if name.startswith(".") or name in _PRUNED_DIRS:
+        return True
+    if any(p.match(rel) is not None or p.match(name) is not None for p in excludes):
+        return True
+    return _is_ignored(rules, rel, name)
+
+
+def _walk(
+    stack: list[tuple[str, str, list[_IgnoreRule]]],
+    excludes: list["re.Pattern[str]"],
+    gitignore: bool,
+    on_dir: Optional[Callable[[str], None]],
+) -> list[str]:
+    """
+    Walks the directories on the stack (see `find_manifests`).
+
+    Parameters:
+        stack (list): Tuples of the directory, its path relative to the walked root and the `.gitignore` rules above it.
+        excludes (list): The compiled exclude patterns.
+        gitignore (bool): Whether to skip directories ignored by `.gitignore` files.
+        on_dir (Callable, optional): Called with every directory right before it is listed.
+
+    Returns:
+        list: The paths of the manifest files in sorted depth-first order.
+    """
+    manifests = []
+    visited: set[str] = set()
+    while len(stack) > 0:
+        path, rel, rules = stack.pop()
+        if on_dir is not None:
+            on_dir(path)
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        names = {entry.name: entry for entry in entries}
+        if MANIFEST in names and names[MANIFEST].is_file():
+            manifests.append(os.path.join(path, MANIFEST))
+            continue
+        if "pyvenv.cfg" in names:
+            continue
+        if gitignore and ".gitignore" in names:
+            rules = rules + _read_gitignore(names[".gitignore"].path, rel)
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if name.startswith(".") or name in _PRUNED_DIRS or not entry.is_dir():
+                continue
+            subrel = f"{rel}/{name}" if rel != "" else name
+            if _is_pruned(name, subrel, excludes, rules):
+                continue
+            if entry.is_symlink():
+                real = os.path.realpath(entry.path)
+                if real in visited:
+                    continue
+                visited.add(real)
+            subdirs.append((entry.path, subrel, rules))
+        stack.extend(reversed(subdirs))
+    return manifests
+
+
+def find_manifests(
+    root: str = ".",
+    exclude: Iterable[str] = (),
+    gitignore: bool = True,
+    on_dir: Optional[Callable[[str], None]] = None,
+) -> list[str]:
+    """
+    Finds the manifest files of all Odoo modules below a directory.
+
+    Parameters:
+        root (str): The directory to search.
+        exclude (Iterable[str]): Glob patterns of directories to skip, matched against
+            the directory name and its path relative to root.
+        gitignore (bool): Whether to skip directories ignored by `.gitignore` files.
+        on_dir (Callable, optional): Called with every directory right before the walk lists it,
+            e.g. to watch it without missing entries created while the tree is walked.
+
+    Returns:
+        list: The paths of the manifest files (joined to root), in sorted depth-first order.
+
+    Description:
+    The directory tree is walked with `os.scandir` and excluded directories are pruned while descending,
+    so their contents are never listed. Hidden directories (like `.git`), `node_modules`, `vendor`,
+    virtualenvs (directories containing `pyvenv.cfg`) and `__pycache__` are always skipped.
+    A directory containing a `__manifest__.py` is a module, nothing below it is searched.
+    Symlinked directories are followed once.
+
+    Example:
+    ```
+    manifests = find_manifests("./", exclude=["tests/*"])
+    ```
+
+    """
+    return _walk([(root, "", [])], _compile_excludes(exclude), gitignore, on_dir)
+
+
+def find_manifests_below(
+    root: str,
+    path: str,
+    exclude: Iterable[str] = (),
+    gitignore: bool = True,
+    on_dir: Optional[Callable[[str], None]] = None,
+) -> list[str]:
+    """
+    Finds the manifest files which `find_manifests(root)` finds below a subdirectory of root.
+
+    Parameters:
+        root (str): The directory searched by `find_manifests`.
+        path (str): The subdirectory to search, joined to root.
+        exclude (Iterable[str]): Glob patterns of directories to skip (see `find_manifests`).
+        gitignore (bool): Whether to skip directories ignored by `.gitignore` files.
+        on_dir (Callable, optional): Called with every directory right before the walk lists it,
+            e.g. to watch it without missing entries created while the tree is walked.
+
+    Returns:
+        list: The paths of the manifest files (joined to root), in sorted depth-first order.
+            Empty if the subdirectory would not be searched by `find_manifests` at all.
+
+    Description:
+    Only the directories between root and the subdirectory are checked (and their `.gitignore` files read),
+    so a changed part of a large tree can be searched again without walking the whole tree.
+
+    Example:
+    ```
+    manifests = find_manifests_below("./", "./oca/server-tools")
+    ```
+
+    """
+    excludes = _compile_excludes(exclude)
+    rel = os.path.relpath(path, root)
+    if rel == ".":
+        return _walk([(path, "", [])], excludes, gitignore, on_dir)
+    if rel == ".." or rel.startswith(f"..{os.sep}"):
+        return []
+    current, currel = root, ""
+    rules: list[_IgnoreRule] = []
+    for name in rel.split(os.sep):
+        # nothing below a module or a virtualenv is searched
+        if os.path.isfile(os.path.join(current, MANIFEST)) or os.path.exists(
+            os.path.join(current, "pyvenv.cfg")
+        ):
+            return []
+        if gitignore:
+            rules = rules + _read_gitignore(os.path.join(current, ".gitignore"), currel)
+        subrel = f"{currel}/{name}" if currel != "" else name
+        if _is_pruned(name, subrel, excludes, rules):
+            return []
+        current, currel = os.path.join(current, name), subrel
+    return _walk([(path, currel, rules)], excludes, gitignore, on_dir)
+
+
+def glob_root(glob: str) -> Optional[str]:
+    """
+    Gets the directory searched for a glob by the walker.
+
+    Parameters:
+        glob (str): A glob like `./**/__manifest__.py`.
+
+    Returns:
+        Optional[str]: The directory for globs of the form `<directory>/**/__manifest__.py`, None for other globs.
+    """
+    prefix = glob.removesuffix(f"**/{MANIFEST}")
+    if (
+        prefix != glob
+        and (prefix == "" or prefix.endswith("/"))
+        and pyglob.escape(prefix) == prefix
+    ):
+        return prefix[:-1] if len(prefix) > 1 else "/" if prefix else "."
+    return None
+
+
+def find_manifests_glob(
+    glob: str, exclude: Iterable[str] = (), gitignore: bool = False
+) -> list[str]:
+    """
+    Finds the manifest files of Odoo modules matching a glob.
+
+    Parameters:
+        glob (str): A glob like `./**/__manifest__.py`.
+        exclude (Iterable[str]): Glob patterns of directories to skip (see `find_manifests`).
+        gitignore (bool): Whether the walker skips directories ignored by `.gitignore` files.
+
+    Returns:
+        list: The paths of the manifest files.
+
+    Description:
+    Globs of the form `<directory>/**/__manifest__.py` are searched with the pruning walker `find_manifests`.
+    Any other glob is expanded with `glob.glob`, only keeping `__manifest__.py` files.
+    Unlike `find_manifests` ignored directories are searched by default, like `glob.glob` does,
+    as addons are often checked out into directories listed in `.gitignore`.
+    """
+    root = glob_root(glob)
+    if root is not None:
+        return find_manifests(root, exclude, gitignore)
+    excludes = _compile_excludes(exclude)
+    return [
+        fname
+        for fname in pyglob.glob(glob, recursive=True)
+        if Path(fname).name == MANIFEST
+        and not any(
+            p.match(part) is not None
+            for part in Path(fname).parent.parts
+            for p in excludes
+        )
+    ]
+
+
+def find_manifests_git(root: str, exclude: Iterable[str] = ()) -> list[str]:
+    """
+    Finds the manifest files of all Odoo modules tracked in a git repository.
+
+    Parameters:
+        root (str): The working tree of the git repository.
+        exclude (Iterable[str]): Glob patterns of directories to skip (see `find_manifests`).
+
+    Returns:
+        list: The paths of the manifest files (joined to root), sorted by path.
+
+    Description:
+    The manifests are listed from the git index (`git ls-files`, including submodules) instead of walking
+    the working tree, so untracked and ignored files are never scanned and the cost only depends
+    on the number of tracked files. The same directories as in `find_manifests` are skipped and
+    manifests below another module are ignored. Manifests deleted from the working tree are skipped.
+
+    Example:
+    ```
+    manifests = find_manifests_git(repo.working_tree_dir)
+    ```
+
+    """
+    excludes = _compile_excludes(exclude)
+    out = subprocess.run(
+        [
+            "git",
+            "ls-files",
+            "-z",
+            "--cached",
+            "--recurse-submodules",
+            "--",
+            f"*{MANIFEST}",
+        ],
+        cwd=root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    ).stdout
+    paths = sorted(
+        set(
+            os.fsdecode(p)
+            for p in out.split(b"\0")
+            if os.path.basename(p) == os.fsencode(MANIFEST)
+        )
+    )
+    moduledirs = set(os.path.dirname(path) for path in paths)
+    manifests = []
+    for path in paths:
+        dirs = path.split("/")[:-1]
+        rels = ["/".join(dirs[: i + 1]) for i in range(len(dirs))]
+        if any(
+            name.startswith(".")
+            or name in _PRUNED_DIRS
+            or any(
+                p.match(rel) is not None or p.match(name) is not None for p in excludes
+            )
+            for name, rel in zip(dirs, rels)
+        ):
+            continue
+        # nothing below a module is searched for further modules
+        if any(rel in moduledirs for rel in ["", *rels][:-1]):
+            continue
+        fullpath = os.path.join(root, path)
+        if os.path.isfile(fullpath):
+            manifests.append(fullpath)
+    return manifests
@@ -0,0 +1,400 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Iterable, NamedTuple, Optional
+
+import hitchhiker.odoo.module as odoo_mod
+import hitchhiker.odoo.walk as walk
+from hitchhiker.odoo.graph import ModuleGraph
+from hitchhiker.odoo.index import ModuleIndex
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+# files whose changes affect which directories are searched for modules
+_WALK_FILES = frozenset([walk.MANIFEST, ".gitignore", "pyvenv.cfg"])
+# events arriving within this time are handled together, e.g. all files of a copied module
+_SETTLE_DELAY = 0.1
+
+
+class InotifyEvent(NamedTuple):
+    """An event read from an inotify instance"""
+
+    wd: int
+    mask: int
+    name: str
+
+
+class Inotify:
+    """A minimal ctypes binding of the Linux inotify API"""
+
+    def __init__(self) -> None:
+        """
+        Creates an inotify instance.
+
+        Raises:
+            OSError: If inotify is not available (e.g. not running on Linux).
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+            init = libc.inotify_init1
+        except (OSError, TypeError, AttributeError) as e:
+            # e.g. no C library found (Windows) or a C library without inotify (macOS)
+            raise OSError("inotify is not available") from e
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = init(os.O_CLOEXEC | os.O_NONBLOCK)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd: int = fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Watches a path.
+
+        Parameters:
+            path (str): The path to watch.
+            mask (int): The events to watch for.
+
+        Returns:
+            int: The watch descriptor, the same descriptor is returned for a path which is already watched.
+
+        Raises:
+            OSError: If the path cannot be watched (e.g. it was deleted or the watch limit is reached).
+        """
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        assert isinstance(wd, int)
+        return wd
+
+    def read(self, timeout: Optional[float]) -> list[InotifyEvent]:
+        """
+        Reads the pending events, waiting for them up to the timeout.
+
+        Parameters:
+            timeout (float, optional): The maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            list: The events, empty if the timeout expired.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if len(readable) == 0:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            end = pos + length
+            name = os.fsdecode(data[pos:end].rstrip(b"\0"))
+            pos = end
+            events.append(InotifyEvent(wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        """Closes the inotify instance, removing all watches"""
+        os.close(self.fd)
+
+
+class AddonsPathWatcher:
+    """Keeps the addons path of the Odoo modules below a directory up to date"""
+
+    def __init__(
+        self,
+        root: str,
+        exclude: Iterable[str] = (),
+        gitignore: bool = False,
+        index: Optional[ModuleIndex] = None,
+        jobs: int = 1,
+        errors: Optional[list[odoo_mod.ManifestError]] = None,
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+        targets: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Initializes a watcher of the modules below a directory.
+
+        Parameters:
+            root (str): The directory to search for modules (see `walk.find_manifests`).
+            exclude (Iterable[str]): Glob patterns of directories to skip.
+            gitignore (bool): Whether to skip directories ignored by `.gitignore` files.
+            index (ModuleIndex, optional): The module index used when parsing manifests.
+            jobs (int): The number of workers parsing manifests.
+            errors (list, optional): Manifests which cannot be parsed are skipped and appended to this list.
+            poll_interval (float): The number of seconds between two scans if inotify is not available.
+            use_inotify (bool): Whether to use inotify, if False or inotify is not available the tree is polled.
+            targets (Iterable[str], optional): Only include the directories needed by these modules and their dependencies.
+
+        Description:
+        `scan` searches the tree once and watches every searched directory with inotify.
+        `wait` then only searches the parts of the tree where directories, manifests or `.gitignore` files
+        were added, removed or moved, and only parses the manifests which changed, so updates are fast
+        and an idle watcher uses no CPU. Without inotify (not on Linux, or when the watch limit is reached)
+        the whole tree is scanned every `poll_interval` seconds instead.
+        With `targets` the dependencies are resolved again after every change, targets which are not found
+        yet are included as soon as they appear.
+
+        Example:
+        ```
+        watcher = AddonsPathWatcher("./")
+        print(",".join(watcher.scan()))
+        while True:
+            paths = watcher.wait()
+            if paths is not None:
+                print(",".join(paths))
+        ```
+
+        """
+        self._root = root
+        self._exclude = list(exclude)
+        self._gitignore = gitignore
+        self._index = index
+        self._jobs = jobs
+        self._errors = errors
+        self._poll_interval = poll_interval
+        self._targets = list(targets) if targets is not None else None
+        self._inotify: Optional[Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = Inotify()
+            except OSError:
+                self._inotify = None
+        self._wds: dict[int, str] = {}
+        # the modules of all found manifests, None for manifests which are not valid modules
+        self._modules: dict[str, Optional[odoo_mod.Module]] = {}
+        # stat signatures of the manifests, only used to find changed manifests when polling
+        self._signatures: dict[str, Optional[list[int]]] = {}
+        self._paths: list[str] = []
+
+    def is_polling(self) -> bool:
+        """
+        Checks whether the watcher polls the tree instead of using inotify.
+
+        Returns:
+            bool: True if the tree is polled.
+        """
+        return self._inotify is None
+
+    def close(self) -> None:
+        """Stops watching the tree"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._wds = {}
+
+    def scan(self) -> list[str]:
+        """
+        Searches the whole tree for modules.
+
+        Returns:
+            list: The addons path, the absolute paths of the directories containing modules.
+        """
+        self._modules = {}
+        self._signatures = {}
+        if self._inotify is None:
+            self._poll()
+        else:
+            self._update(self._walk(self._root), [])
+        return self._paths
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[list[str]]:
+        """
+        Waits until the addons path changes.
+
+        Parameters:
+            timeout (float, optional): The maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            Optional[list]: The new addons path, or None if it did not change before the timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            remaining = (
+                max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            )
+            previous = self._paths
+            if self._inotify is None:
+                time.sleep(
+                    min(self._poll_interval, remaining)
+                    if remaining is not None
+                    else self._poll_interval
+                )
+                self._poll()
+            else:
+                events = self._inotify.read(remaining)
+                if len(events) > 0:
+                    while True:
+                        more = self._inotify.read(_SETTLE_DELAY)
+                        if len(more) == 0:
+                            break
+                        events.extend(more)
+                    self._handle(events)
+            if self._paths != previous:
+                return self._paths
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def _walk(self, path: str) -> list[str]:
+        """
+        Searches a part of the tree for manifests and watches the searched directories.
+
+        Parameters:
+            path (str): The root or a directory below it.
+
+        Returns:
+            list: The found manifests.
+
+        Description:
+        Every directory is watched before it is listed, so an entry created while the tree is walked
+        is either listed or reported by an event.
+        """
+        return walk.find_manifests_below(
+            self._root, path, self._exclude, self._gitignore, on_dir=self._watch
+        )
+
+    def _watch(self, directory: str) -> None:
+        """
+        Watches a directory with inotify, falls back to polling if it cannot be watched.
+
+        Parameters:
+            directory (str): The directory.
+        """
+        if self._inotify is None:
+            return
+        try:
+            self._wds[self._inotify.add_watch(directory, _WATCH_MASK)] = directory
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.ENOTDIR):
+                # removed since its parent was listed, the parent reports the removal
+                return
+            # e.g. the watch limit is reached, poll instead
+            self.close()
+
+    def _poll(self) -> None:
+        """Searches the whole tree and parses new and changed manifests"""
+        found = self._walk(self._root)
+        current = set(found)
+        for manifest in list(self._modules.keys()):
+            if manifest not in current:
+                del self._modules[manifest]
+                self._signatures.pop(manifest, None)
+        changed = []
+        for manifest in found:
+            signature = ModuleIndex.stat(manifest)
+            if manifest in self._signatures and self._signatures[manifest] != signature:
+                changed.append(manifest)
+            self._signatures[manifest] = signature
+        self._update(found, changed)
+
+    def _handle(self, events: list[InotifyEvent]) -> None:
+        """
+        Updates the modules after inotify events.
+
+        Parameters:
+            events (list): The events read from inotify.
+        """
+        rescans: set[str] = set()
+        removed: set[str] = set()
+        changed: list[str] = []
+        for event in events:
+            if event.mask & IN_Q_OVERFLOW:
+                # events were lost, start over
+                rescans = {self._root}
+                break
+            if event.mask & IN_IGNORED:
+                self._wds.pop(event.wd, None)
+                continue
+            directory = self._wds.get(event.wd)
+            if directory is None or event.name == "":
+                continue
+            path = os.path.join(directory, event.name)
+            if event.mask & IN_ISDIR:
+                if event.mask & (IN_CREATE | IN_MOVED_TO):
+                    rescans.add(path)
+                else:
+                    removed.add(path)
+            elif event.name in _WALK_FILES:
+                if event.name == walk.MANIFEST and event.mask & IN_CLOSE_WRITE:
+                    changed.append(path)
+                else:
+                    rescans.add(directory)
+
+        # a rescanned directory is searched completely, nested rescans are redundant
+        dirs = sorted(rescans | removed)
+        outer: list[str] = []
+        for path in dirs:
+            if not any(path.startswith(f"{o}{os.sep}") for o in outer):
+                outer.append(path)
+        for path in outer:
+            if path == self._root:
+                self._modules = {}
+            else:
+                for manifest in list(self._modules.keys()):
+                    if manifest.startswith(f"{path}{os.sep}"):
+                        del self._modules[manifest]
+        found = []
+        for path in outer:
+            if path in rescans:
+                found.extend(self._walk(path))
+        self._update(found, changed)
+
+    def _update(self, found: list[str], changed: list[str]) -> None:
+        """
+        Parses new and changed manifests and computes the addons path.
+
+        Parameters:
+            found (list): Manifests found by a search, parsed if they are not known yet.
+            changed (list): Known manifests whose contents changed.
+        """
+        load = [m for m in found if m not in self._modules]
+        load.extend(m for m in changed if m in self._modules)
+        for manifest in load:
+            self._modules[manifest] = None
+        for module in odoo_mod.discover_modules(
+            load, self._index, jobs=self._jobs, errors=self._errors
+        ):
+            self._modules[os.path.join(module.get_dir(), walk.MANIFEST)] = module
+        # the same order as a new search of the whole tree
+        manifests = sorted(self._modules.keys(), key=lambda m: m.split(os.sep))
+        registry = odoo_mod.ModuleRegistry(
+            [m for m in (self._modules[manifest] for manifest in manifests) if m]
+        )
+        if self._targets is None:
+            self._paths = registry.get_addons_paths()
+        else:
+            graph = ModuleGraph(registry, self._index)
+            self._paths = registry.get_addons_paths(
+                graph.dependencies_closure(self._targets)
+            )
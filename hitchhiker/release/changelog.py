@@ -1,64 +1,46 @@
-from functools import cmp_to_key
 from typing import Any, Dict, Optional
 
-import git
-
 import hitchhiker.release.commitparser.conventional as conventional
 import hitchhiker.release.enums as enums
+import hitchhiker.release.version.history as history
 import hitchhiker.release.version.semver as semver
 
 
 # TODO: this could potentioally be moved to conventional.py??
-def _commit_cmp(
-    _a: tuple[conventional.ConventionalCommitParser, git.objects.commit.Commit],
-    _b: tuple[conventional.ConventionalCommitParser, git.objects.commit.Commit],
-) -> int:
+def _commit_sort_key(
+    commit: tuple[conventional.ConventionalCommitParser, history.HistoryCommit],
+) -> tuple[bool, enums.VersionBump, str]:
     """
-    Comparison function for sorting commits based on version bump and conventional commit properties.
+    Returns the key for sorting commits based on version bump and conventional commit properties.
 
     Parameters:
-        _a (tuple): A tuple containing a ConventionalCommitParser instance and a Git commit.
-        _b (tuple): A tuple containing a ConventionalCommitParser instance and a Git commit.
+        commit (tuple): A tuple containing a ConventionalCommitParser instance and a Git commit.
 
     Returns:
-        int: -1 if _a should come before _b, 1 if _a should come after _b, 0 if they are equal.
+        tuple: A tuple which sorts conventional commits after all others, then by version bump and
+            commits without a version bump by their type.
 
     Description:
-    This function compares two commits based on their version bump type and conventional commit properties.
-    It is intended to be used as a comparison function for sorting commits.
+    The key is computed once per commit, so sorting does not parse or compare commit messages repeatedly.
+    It is intended to be used with `reverse=True` to list the most important commits first.
     """
-    a, _ = _a
-    b, _ = _b
-    if a.is_conventional and b.is_conventional:
-        if a.get_version_bump() < b.get_version_bump():
-            return -1
-        elif a.get_version_bump() < b.get_version_bump():
-            return 1
-        elif (
-            a.get_version_bump() == b.get_version_bump()
-            and a.get_version_bump() == enums.VersionBump.NONE
-        ):
-            assert a.type is not None and b.type is not None
-            return -1 if a.type < b.type else 1
-        elif a.get_version_bump() == b.get_version_bump():
-            return 0
-    elif not a.is_conventional and not b.is_conventional:
-        return -1
-    elif not a.is_conventional:
-        return -1
-    elif not b.is_conventional:
-        return 1
-    return 0
+    parsed, _ = commit
+    if not parsed.is_conventional:
+        return (False, enums.VersionBump.NONE, "")
+    bump = parsed.get_version_bump()
+    assert parsed.type is not None
+    return (True, bump, parsed.type if bump == enums.VersionBump.NONE else "")
 
 
 # change_commits: {"projectname": [version, [commitmsgs]]}
 def gen_changelog(
-    change_commits: Dict[str, tuple[semver.Version, list[git.objects.commit.Commit]]],
+    change_commits: Dict[str, tuple[semver.Version, list[history.HistoryCommit]]],
     new_version: semver.Version,
     projects_old: list[Dict[str, Any]],
     projects_new: list[Dict[str, Any]],
     repo_owner: Optional[str] = None,
     repo_name: Optional[str] = None,
+    parsed_commits: Optional[Dict[str, conventional.ConventionalCommitParser]] = None,
 ) -> str:
     """
     Generates a changelog based on commit messages and project versions.
@@ -70,6 +52,8 @@ def gen_changelog(
         projects_new (list): A list of dictionaries representing the new project versions.
         repo_owner (str, optional): The owner of the repository (for commit links). Default is None.
         repo_name (str, optional): The name of the repository (for commit links). Default is None.
+        parsed_commits (dict, optional): Maps commit SHAs to already parsed commit messages,
+            commits which are not in it are parsed and added. Default is None.
 
     Returns:
         str: The generated changelog.
@@ -77,6 +61,8 @@ def gen_changelog(
     Description:
     This function generates a changelog based on the provided commit messages, new version, and project versions.
     It organizes commits by project and types, creating a structured changelog with commit messages and links.
+    Pass the memo used for the version bump (`config["parsed_commits"]`) as `parsed_commits`
+    to parse every commit message only once per run.
 
     Example:
     ```
@@ -84,6 +70,8 @@ def gen_changelog(
     print(changelog)
     ```
     """
+    if parsed_commits is None:
+        parsed_commits = {}
     out = f"\n## v{new_version}\n"
     out += "### Projects\n| module | version |\n| -------- | ----------- |\n"
     for oldp, newp in zip(projects_old, projects_new):
@@ -96,14 +84,19 @@ def gen_changelog(
         commits_types: Dict[
             str,
             list[
-                tuple[conventional.ConventionalCommitParser, git.objects.commit.Commit]
+                tuple[conventional.ConventionalCommitParser, history.HistoryCommit]
             ],
         ] = {}
         commits = [
-            (conventional.ConventionalCommitParser(str(commit.message)), commit)
+            (
+                conventional.ConventionalCommitParser.parse_memoized(
+                    parsed_commits, commit.hexsha, commit.message
+                ),
+                commit,
+            )
             for commit in change_commits[project][1]
         ]
-        commits.sort(key=cmp_to_key(_commit_cmp), reverse=True)
+        commits.sort(key=_commit_sort_key, reverse=True)
         for commit, gitcommit in commits:
             type = commit.type if commit.is_conventional else "unknown"
             type = (
@@ -1,20 +1,35 @@
 import re
-from typing import Optional
+from typing import Dict, Iterable, Optional
 import hitchhiker.release.enums as enums
 
 
 class ConventionalCommitParser:
     """Parses conventional commits"""
 
-    # constants
-    __FOOTER_REGEX = r"^((?:[a-zA-Z\-]+)|(?:BREAKING CHANGE))(?:(?:(: )(.+))|(?:( #)([0-9]+)))(?:[ ]*)$"
-    __SUBJECT_REGEX = r"^([a-zA-Z]+)(?:\(([a-zA-Z]+)\))?(!)?: (.+)$"
+    __slots__ = (
+        "is_conventional",
+        "type",
+        "scope",
+        "breaking",
+        "__message",
+        "__subject",
+        "__description",
+        "__body",
+        "__footers",
+    )
 
-    is_conventional: bool = False
-    type: Optional[str] = None
-    scope: Optional[str] = None
-    breaking: Optional[bool] = None
-    __message: str = ""
+    # constants
+    __FOOTER_REGEX = re.compile(
+        r"^((?:[a-zA-Z\-]+)|(?:BREAKING CHANGE))(?:(?:(: )(.+))|(?:( #)([0-9]+)))(?:[ ]*)$"
+    )
+    __SUBJECT_REGEX = re.compile(
+        r"^([a-zA-Z]+)(?:\(([a-zA-Z]+)\))?(!)?: (.+)$", re.DOTALL
+    )
+
+    is_conventional: bool
+    type: Optional[str]
+    scope: Optional[str]
+    breaking: Optional[bool]
 
     def __init__(self, msg: str) -> None:
         """
@@ -26,8 +41,45 @@ class ConventionalCommitParser:
         Returns:
             None
         """
+        # the lazily tokenized parts are declared here, `parse` resets them for every message
+        self.__description: Optional[str] = None
+        self.__body: Optional[str] = None
+        self.__footers: Optional[list[tuple[str, str, bool]]] = None
         self.parse(msg)
 
+    @classmethod
+    def parse_memoized(
+        cls, memo: Dict[str, "ConventionalCommitParser"], sha: str, msg: str
+    ) -> "ConventionalCommitParser":
+        """
+        Parses a commit message unless the commit was already parsed.
+
+        Parameters:
+            memo (dict): Maps commit SHAs to their parsed commit messages, updated in place.
+            sha (str): The hex SHA of the commit.
+            msg (str): The commit message, only parsed if the commit is not in the memo.
+
+        Returns:
+            ConventionalCommitParser: The parsed commit message, shared by all callers using the same memo.
+        """
+        parsed = memo.get(sha)
+        if parsed is None:
+            parsed = memo[sha] = cls(msg)
+        return parsed
+
+    @classmethod
+    def parse_many(cls, msgs: Iterable[str]) -> list["ConventionalCommitParser"]:
+        """
+        Parses many commit messages at once.
+
+        Parameters:
+            msgs (Iterable[str]): The commit messages to be parsed.
+
+        Returns:
+            list: A parser for every message, in the same order.
+        """
+        return [cls(msg) for msg in msgs]
+
     def __reset(self) -> None:
         """
         Reset the internal state of the object.
@@ -40,6 +92,46 @@ class ConventionalCommitParser:
         self.scope = None
         self.breaking = None
         self.__message = ""
+        self.__subject = ""
+        self.__description = None
+        self.__body = None
+        self.__footers = None
+
+    def __tokenize(self) -> None:
+        """
+        Splits the body of the stored commit message into the body text and the footers.
+
+        Returns:
+            None
+
+        Description:
+        The message is only split into lines once and every line is matched against the footer pattern once,
+        the results are cached for `get_body` and `get_footers`.
+        """
+        if self.__body is not None:
+            return
+        lines = self.__message.split("\n")
+        body_lines = lines[1:] if len(lines) > 1 else [""]
+        footers: list[tuple[str, list[str], bool]] = []  # (token, text lines, is_issue)
+        body_end = len(body_lines)
+        for i, line in enumerate(body_lines):
+            match = self.__FOOTER_REGEX.match(line)
+            if match is not None:
+                if len(footers) == 0:
+                    body_end = i
+                token = match.group(1)
+                text = match.group(3) if match.group(2) is not None else match.group(5)
+                is_issue = match.group(4) is not None
+                assert token is not None
+                footers.append((token, [text], is_issue))
+            # assuming issue footer cannot be multiline?? - is this correct?
+            # According to angular commit guidelines this is indeed the case but the conventional commits spec does not seem to mention this
+            elif len(footers) > 0 and not footers[-1][2]:
+                footers[-1][1].append(line)
+        self.__body = "".join(f"{line}\n" for line in body_lines[:body_end])
+        self.__footers = [
+            (token, "\n".join(text), is_issue) for token, text, is_issue in footers
+        ]
 
     def parse(self, msg: str) -> None:
         """
@@ -53,9 +145,11 @@ class ConventionalCommitParser:
         """
         self.__reset()
         self.__message = msg
-        match = re.match(self.__SUBJECT_REGEX, self.get_raw_subject(), re.DOTALL)
+        self.__subject = msg.split("\n", 1)[0]
+        match = self.__SUBJECT_REGEX.match(self.__subject)
         if not match:
             return
+        self.__description = match.group(4)
         self.type = match.group(1)
         if self.type is not None:
             self.is_conventional = True
@@ -77,7 +171,7 @@ class ConventionalCommitParser:
         Description:
         The subject is the first line of the commit message, typically summarizing the commit.
         """
-        return self.__message.split("\n", 1)[0]
+        return self.__subject
 
     def get_raw_body(self) -> str:
         """
@@ -90,11 +184,10 @@ class ConventionalCommitParser:
         The body is the part of the commit message that provides additional details or context
         beyond the subject, often describing the changes made in more detail.
         """
-        split = self.__message.split("\n")
+        split = self.__message.split("\n", 1)
         if len(split) <= 1:
             return ""
-        del split[0]
-        return "\n".join(split)
+        return split[1]
 
     def get_description(self) -> str:
         """
@@ -107,10 +200,9 @@ class ConventionalCommitParser:
         The description typically follows the subject in a conventional commit
         and provides additional information or details about the changes made.
         """
-        match = re.match(self.__SUBJECT_REGEX, self.get_raw_subject(), re.DOTALL)
-        if match is None:
-            return self.get_raw_subject()
-        return match.group(4)
+        if self.__description is None:
+            return self.__subject
+        return self.__description
 
     def get_body(self) -> str:
         """
@@ -123,12 +215,9 @@ class ConventionalCommitParser:
         The body of a conventional commit provides additional details or context
         beyond the subject and description, often describing the changes in more detail.
         """
-        body = ""
-        for line in self.get_raw_body().split("\n"):
-            if re.match(self.__FOOTER_REGEX, line) is not None:
-                break
-            body += line + "\n"
-        return body
+        self.__tokenize()
+        assert self.__body is not None
+        return self.__body
 
     def get_footers(self) -> list[tuple[str, str, bool]]:
         """
@@ -142,26 +231,9 @@ class ConventionalCommitParser:
         The footers of a conventional commit provide additional metadata or references related to the commit.
         The method parses the footers from the raw body and returns them in a structured format.
         """
-        footers = []  # (token, text, is_issue)
-        footer_started = False
-        for line in self.get_raw_body().split("\n"):
-            match = re.match(self.__FOOTER_REGEX, line)
-            if match is not None:
-                footer_started = True
-                token = match.group(1)
-                text = match.group(3) if match.group(2) is not None else match.group(5)
-                is_issue = match.group(4) is not None
-                assert token is not None
-                footers.append((token, text, is_issue))
-            # assuming issue footer cannot be multiline?? - is this correct?
-            # According to angular commit guidelines this is indeed the case but the conventional commits spec does not seem to mention this
-            elif footer_started and not footers[-1][2]:
-                footers[-1] = (
-                    footers[-1][0],
-                    footers[-1][1] + "\n" + line,
-                    footers[-1][2],
-                )
-        return footers
+        self.__tokenize()
+        assert self.__footers is not None
+        return list(self.__footers)
 
     def get_version_bump(self) -> enums.VersionBump:
         """
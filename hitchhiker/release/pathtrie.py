@@ -0,0 +1,87 @@
+import pathlib
+from typing import Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node[T]"] = {}
+        self.values: list[T] = []
+
+
+class PathTrie(Generic[T]):
+    """Maps file paths to the values of all directories containing them"""
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty path trie.
+
+        Description:
+        Directories are stored component by component, so looking up the owners of a path
+        costs O(path depth) no matter how many directories were added.
+
+        Example:
+        ```
+        trie = PathTrie()
+        trie.add("project1/", "project1")
+        trie.match("project1/src/main.py")  # ["project1"]
+        ```
+
+        """
+        self._root: _Node[T] = _Node()
+
+    @staticmethod
+    def normalize(path: str) -> Optional[str]:
+        """
+        Normalizes a directory path the same way `pathlib.Path` does.
+
+        Parameters:
+            path (str): The directory path.
+
+        Returns:
+            Optional[str]: The normalized path, or None if the path cannot contain any relative file path.
+        """
+        parts = pathlib.PurePosixPath(path).parts
+        if len(parts) == 0 or parts[0] == "/":
+            return None
+        return "/".join(parts)
+
+    def add(self, directory: str, value: T) -> None:
+        """
+        Adds a value for all paths below a directory.
+
+        Parameters:
+            directory (str): The directory path, relative to the repository root.
+            value (Any): The value returned for all paths below the directory.
+        """
+        normalized = self.normalize(directory)
+        if normalized is None:
+            return
+        node = self._root
+        for part in normalized.split("/"):
+            node = node.children.setdefault(part, _Node())
+        node.values.append(value)
+
+    def match(self, path: str) -> list[T]:
+        """
+        Returns the values of all directories containing a path.
+
+        Parameters:
+            path (str): The file path relative to the repository root, as listed by git.
+
+        Returns:
+            list: The values of all containing directories, outermost first.
+        """
+        matches: list[T] = []
+        node = self._root
+        # paths listed by git are already normalized
+        for part in path.split("/")[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            matches.extend(node.values)
+        return matches
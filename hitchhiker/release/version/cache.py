@@ -0,0 +1,70 @@
+from typing import Optional
+
+import hitchhiker.release.enums as enums
+from hitchhiker.cache_store import JsonCacheStore
+
+
+class CommitCache:
+    """Persistent cache of the changed paths and version bump of commits, keyed by commit SHA"""
+
+    # bump this whenever the format or the meaning of the cached entries changes
+    VERSION = 2
+
+    def __init__(self, path: str, max_entries: int = 100000) -> None:
+        """
+        Initializes a commit cache stored at the specified path.
+
+        Parameters:
+            path (str): The path to the cache file (usually below `.git/hitchhiker/`).
+            max_entries (int): The maximum number of commits kept in the cache.
+
+        Description:
+        The cache file is only read on first access. Commits are immutable, so an entry never has to be invalidated.
+        If the cache file is missing, unreadable or was written by another cache version it is ignored.
+        When there are more than `max_entries` entries the least recently used ones are evicted on save.
+
+        Example:
+        ```
+        cache = CommitCache(os.path.join(repo.git_dir, "hitchhiker", "commits.json"))
+        ```
+
+        """
+        self._store = JsonCacheStore(
+            path, self.VERSION, {"entries": max_entries}, "commit cache"
+        )
+
+    def get(self, sha: str) -> Optional[tuple[list[str], enums.VersionBump]]:
+        """
+        Looks up a commit in the cache.
+
+        Parameters:
+            sha (str): The hex SHA of the commit.
+
+        Returns:
+            tuple: A tuple containing the changed paths and the version bump, or None if the commit is not cached.
+        """
+        entry = self._store.get("entries", sha)
+        if entry is None:
+            return None
+        return (entry[0], enums.VersionBump(entry[1]))
+
+    def set(self, sha: str, paths: list[str], bump: enums.VersionBump) -> None:
+        """
+        Adds a commit to the cache.
+
+        Parameters:
+            sha (str): The hex SHA of the commit.
+            paths (list): The paths changed by the commit.
+            bump (enums.VersionBump): The version bump of the commit.
+        """
+        self._store.set("entries", sha, [paths, int(bump)])
+
+    def save(self) -> None:
+        """
+        Writes the cache to disk if it was changed, evicting the least recently used entries.
+
+        Description:
+        The cache is replaced atomically and a write error only issues a warning (see `JsonCacheStore.save`),
+        the cache never makes a command fail.
+        """
+        self._store.save()
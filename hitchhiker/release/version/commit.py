@@ -1,117 +1,207 @@
-import pathlib
-import subprocess
 from typing import Any, Dict, Optional
 
-import git
-
 import hitchhiker.cli.release.tagfix as tagfix
 import hitchhiker.release.enums as enums
-import hitchhiker.release.version.semver as semver
+import hitchhiker.release.pathtrie as pathtrie
+import hitchhiker.release.version.history as history
+import hitchhiker.release.version.tags as tags
 from hitchhiker.release.commitparser.conventional import ConventionalCommitParser
 
 # FIXME: this file needs a lot of cleanup
 
 
-def _find_latest_tag_in_commits(
-    tags: list[tuple[git.refs.tag.TagReference, semver.Version]],
-    commits: list[git.objects.commit.Commit],
-) -> tuple[Optional[list[git.objects.commit.Commit]], str]:
+def _find_latest_tag_sha(config: Dict[str, Any], tag_shas: set[str]) -> Optional[str]:
     """
-    Finds the latest tag in a list of commits.
+    Finds the nearest tagged commit in the history of the active branch.
 
     Parameters:
-        tags (list): A list of tuples containing tag references and their corresponding semver versions.
-        commits (list): A list of Git commit objects.
+        config (dict): Configuration information for the repository and versioning.
+        tag_shas (set): The SHAs of all commits with a matching tag.
 
     Returns:
-        tuple: A tuple containing the list of commits up to the latest tag and the hash of the latest tag.
+        Optional[str]: The SHA of the nearest tagged commit, or None if no tagged commit was found.
 
     Description:
-    This function searches for the latest tag in a list of commits. It returns the list of commits up to the latest tag
-    and the hash of the latest tag.
-
-    Note:
-    This function assumes the availability of the `git` command-line utility.
+    The history is walked lazily, newest commit first, and the walk stops at the first commit with a tag.
+    The history is never materialized, so the cost only depends on the number of commits since the tag.
 
     Example:
     ```
-    commits, latest_tag_sha = _find_latest_tag_in_commits(tags, commits_list)
-    print(f"The latest tag was at commit: {latest_tag_sha}")
+    tag_sha = _find_latest_tag_sha(config, {"2a5f9c0..."})
+    print(f"The latest tag was at commit: {tag_sha}")
     ```
 
     """
-    def search_commit(
-        commit: git.objects.commit.Commit, commits: list[git.objects.commit.Commit]
-    ) -> Optional[tuple[list[git.objects.commit.Commit], str]]:
-        i = 0
-        while i < len(commits):
-            if commits[i].binsha == commit.binsha:
-                return (commits[:i], commits[i].hexsha)
-            i += 1
+    if len(tag_shas) == 0:
         return None
+    revisions = history.iter_revisions(config["repo"].working_tree_dir, ["HEAD"])
+    try:
+        for sha in revisions:
+            if sha in tag_shas:
+                return sha
+    finally:
+        revisions.close()
+    return None
 
-    for tag in tags:
-        r = search_commit(tag[0].commit, commits)
-        if r is not None:
-            return r
-    # get empty tree SHA
-    emptysha = subprocess.run(
-        ["git", "hash-object", "-t", "tree", "/dev/null"],
-        capture_output=True,
-        text=True,
-        check=True,
-    ).stdout.strip()
-    return (None, emptysha)
-
-
-def _get_tag_versions(
-    config: Dict[str, Any],
-    tags: list[git.refs.tag.TagReference],
-) -> list[tuple[git.refs.tag.TagReference, semver.Version]]:
+
+def _get_tag_index(config: Dict[str, Any]) -> tags.TagIndex:
     """
-    Retrieves the versions associated with a list of Git tag references.
+    Returns the tag index of the repository, building it on first use.
 
     Parameters:
-        tags (list): A list of Git tag references.
+        config (dict): Configuration information for the repository and versioning.
 
     Returns:
-        list: A list of tuples containing tag references and their corresponding semver versions.
+        tags.TagIndex: The tag index, memoized in `config["tag_index"]` for the whole run.
+    """
+    if config["tag_index"] is None:
+        config["tag_index"] = tags.TagIndex.from_repo(config)
+    return config["tag_index"]  # type: ignore[no-any-return]
 
-    Description:
-    This function retrieves the versions associated with a list of Git tag references and returns them as tuples.
-    The tags are sorted in descending order based on their semver versions.
 
-    Example:
-    ```
-    tag_versions = _get_tag_versions(tag_references)
-    for tag, version in tag_versions:
-        print(f"Tag: {tag.name}, Version: {version}")
-    ```
+def _get_bump(
+    config: Dict[str, Any], commit: history.HistoryCommit
+) -> enums.VersionBump:
+    """
+    Returns the version bump of a commit.
+
+    Parameters:
+        config (dict): Configuration information for the repository and versioning.
+        commit (history.HistoryCommit): The commit.
+
+    Returns:
+        enums.VersionBump: The version bump of its conventional commit message, NONE if it is not conventional.
+    """
+    parsed = ConventionalCommitParser.parse_memoized(
+        config["parsed_commits"], commit.hexsha, commit.message
+    )
+    return (
+        parsed.get_version_bump() if parsed.is_conventional else enums.VersionBump.NONE
+    )
+
+
+def _get_commit_index(
+    config: Dict[str, Any], prerelease: bool
+) -> list[tuple[history.HistoryCommit, enums.VersionBump]]:
+    """
+    Returns all commits since the latest tag together with the files they changed and their version bump.
+
+    Parameters:
+        config (dict): Configuration information for the repository and versioning.
+        prerelease (bool): Whether to consider prerelease tags.
+
+    Returns:
+        list: A list of tuples containing commits (oldest first) and their version bump.
+
+    Description:
+    The history is walked only once per run, from the active branch back to the nearest matching tag
+    (see `_find_latest_tag_sha`). If `prepend_branch_to_tag` is set only tags of the active branch
+    and tags without a branch prefix are considered. The result is memoized in `config["commit_index"]`,
+    so every project reads its commits from the same index instead of walking the history again.
+    The commits and their changed files are streamed from a single `git log` process, or read by
+    `config["jobs"]` worker processes on long histories (see `history.read_history`).
+    Each commit is compared to its first parent, so the result only depends on the commit itself and is
+    stored in the persistent commit cache (`config["commit_cache"]`) if there is one.
+    With a cache the commits are listed without diffing them first (`history.iter_messages`),
+    the changed files and version bump of cached commits are taken from the cache
+    and only the other commits are diffed (`history.read_commits`).
+    Commit messages found in the cache are not parsed again, all others are parsed once per run
+    and shared with the changelog through `config["parsed_commits"]`.
 
     """
-    tag_ver = []
-    for tag in tags:
-        tag_ver.append(
-            (
-                tag,
-                semver.Version().parse(
-                    tagfix.get_tag_without_branch(config, str(tag.name))
-                ),
+    if prerelease in config["commit_index"]:
+        return config["commit_index"][prerelease]  # type: ignore[no-any-return]
+    # the branch partition of the tags this branch creates (None if prepend_branch_to_tag is not set)
+    branch = tagfix.get_branch_from_tag(
+        config, tagfix.add_branch_to_tag(config, "v0.0.0")
+    )
+    tag_sha = _find_latest_tag_sha(
+        config, _get_tag_index(config).commit_shas(prerelease, branch)
+    )
+    revs = ["HEAD"] if tag_sha is None else ["HEAD", f"^{tag_sha}"]
+    workdir = config["repo"].working_tree_dir
+    cache = config["commit_cache"]
+    index = []
+    if cache is None:
+        for commit in history.read_history(workdir, revs, config["jobs"]):
+            index.append((commit, _get_bump(config, commit)))
+    else:
+        listed = list(history.iter_messages(workdir, revs))
+        cached = {sha: cache.get(sha) for sha, _ in listed}
+        # only the commits which are not cached are diffed
+        read = {
+            commit.hexsha: commit
+            for commit in history.read_commits(
+                workdir,
+                [sha for sha, _ in listed if cached[sha] is None],
+                config["jobs"],
             )
-        )
-    tag_ver.sort(reverse=True, key=lambda t: t[1])
-    return tag_ver
+        }
+        for sha, message in listed:
+            hit = cached[sha]
+            if hit is not None:
+                index.append((history.HistoryCommit(sha, message, hit[0]), hit[1]))
+            else:
+                commit = read[sha]
+                bump = _get_bump(config, commit)
+                cache.set(sha, commit.paths, bump)
+                index.append((commit, bump))
+    index.reverse()
+    if cache is not None:
+        cache.save()
+    config["commit_index"][prerelease] = index
+    return index
+
+
+def _get_project_commits(
+    config: Dict[str, Any], prerelease: bool
+) -> Dict[str, list[tuple[history.HistoryCommit, list[str], enums.VersionBump]]]:
+    """
+    Attributes the changed files of all commits since the latest tag to the projects containing them.
+
+    Parameters:
+        config (dict): Configuration information for the repository and versioning.
+        prerelease (bool): Whether to consider prerelease tags.
+
+    Returns:
+        dict: A dictionary mapping normalized project paths to tuples of commits (oldest first),
+            the files of the project they changed and their version bump.
+
+    Description:
+    A path trie is built once from all projects in `config["projects"]`, so attributing a changed file costs
+    O(path depth) instead of one comparison per project. The result is memoized in `config["project_commits"]`.
+
+    """
+    if prerelease in config["project_commits"]:
+        return config["project_commits"][prerelease]  # type: ignore[no-any-return]
+    trie: pathtrie.PathTrie[str] = pathtrie.PathTrie()
+    for project in config["projects"]:
+        normalized = trie.normalize(project["path"])
+        if normalized is not None:
+            trie.add(normalized, normalized)
+    project_commits: Dict[
+        str, list[tuple[history.HistoryCommit, list[str], enums.VersionBump]]
+    ] = {}
+    for commit, bump in _get_commit_index(config, prerelease):
+        changed_files: Dict[str, list[str]] = {}
+        for path in commit.paths:
+            for project_path in trie.match(path):
+                changed_files.setdefault(project_path, []).append(path)
+        for project_path, files in changed_files.items():
+            project_commits.setdefault(project_path, []).append((commit, files, bump))
+    config["project_commits"][prerelease] = project_commits
+    return project_commits
 
 
 def find_next_version(
     config: Dict[str, Any], project: Dict[str, Any], prerelease: bool
-) -> tuple[enums.VersionBump, list[tuple[git.objects.commit.Commit, list[str]]]]:
+) -> tuple[enums.VersionBump, list[tuple[history.HistoryCommit, list[str]]]]:
     """
     Finds the next version bump and associated commits for a project.
 
     Parameters:
         config (dict): Configuration information for the repository and versioning.
-        project (dict): Project information including path and other details.
+        project (dict): Project information including path and other details, must be one of `config["projects"]`.
         prerelease (bool): Whether to consider prerelease versions.
 
     Returns:
@@ -120,6 +210,7 @@ def find_next_version(
     Description:
     This function determines the next version bump based on conventional commit messages in the project.
     It analyzes commits, identifies changes relevant to the project, and associates them with version bumps.
+    The commits and their changed files are read from the run-wide commit index (see `_get_project_commits`).
 
     Example:
     ```
@@ -131,31 +222,15 @@ def find_next_version(
     ```
 
     """
-    tags = [
-        (t, v)
-        for t, v in _get_tag_versions(config, config["repo"].tags)
-        if (True if prerelease else v.prerelease is None)
-    ]
-    commit_list, lastsha = _find_latest_tag_in_commits(
-        tags, list(config["repo"].iter_commits(config["repo"].active_branch))
-    )
-    if commit_list is None:
-        commit_list = list(config["repo"].iter_commits(config["repo"].active_branch))
-    commits = []
+    commits: list[tuple[history.HistoryCommit, list[str]]] = []
     bump = enums.VersionBump.NONE
-
-    for commit in reversed(commit_list):
-        changed_files = [
-            item.a_path
-            for item in commit.tree.diff(lastsha)
-            if str(pathlib.Path(item.a_path)).startswith(
-                str(pathlib.Path(project["path"])) + "/"
-            )
-        ]
-        if len(changed_files) > 0:
-            parsed = ConventionalCommitParser(str(commit.message))
-            if parsed.is_conventional and bump < parsed.get_version_bump():
-                bump = parsed.get_version_bump()
-            commits.append((commit, changed_files))
-        lastsha = commit.hexsha
+    normalized = pathtrie.PathTrie.normalize(project["path"])
+    if normalized is None:
+        return (bump, commits)
+
+    for commit, changed_files, commit_bump in _get_project_commits(
+        config, prerelease
+    ).get(normalized, []):
+        bump = commit_bump if bump < commit_bump else bump
+        commits.append((commit, changed_files))
     return (bump, commits)
@@ -0,0 +1,307 @@
+import math
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Generator, Iterator, NamedTuple, Optional
+
+# every record starts with an empty token, git never outputs empty paths
+_LOG_FORMAT = "--format=%x00%H%x00%B"
+_READ_SIZE = 65536
+# below this many commits per job spawning worker processes costs more than it saves
+_MIN_COMMITS_PER_JOB = 1000
+
+
+class HistoryCommit(NamedTuple):
+    """A commit read from the history together with the paths it changed"""
+
+    hexsha: str
+    message: str
+    paths: list[str]
+
+
+def _iter_tokens(stream: IO[bytes], sep: bytes = b"\0") -> Iterator[bytes]:
+    """
+    Splits a byte stream into separator terminated tokens while reading it.
+
+    Parameters:
+        stream (IO[bytes]): The stream to read from.
+        sep (bytes): The separator terminating every token.
+
+    Returns:
+        Iterator[bytes]: The tokens without their separator.
+    """
+    pending: list[bytes] = []
+    while True:
+        chunk = stream.read1(_READ_SIZE)  # type: ignore[attr-defined]
+        if not chunk:
+            break
+        pending.append(chunk)
+        if sep not in chunk:
+            continue
+        tokens = b"".join(pending).split(sep)
+        pending = [tokens.pop()]
+        yield from tokens
+    tail = b"".join(pending)
+    if len(tail) > 0:
+        yield tail
+
+
+def _iter_git(
+    workdir: str, args: list[str], sep: bytes, stdin: Optional[bytes] = None
+) -> Iterator[bytes]:
+    """
+    Runs a git command and streams its output as separator terminated tokens.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        args (list): The arguments to pass to git.
+        sep (bytes): The separator terminating every token.
+        stdin (bytes, optional): Input written to the standard input of git before reading its output.
+
+    Returns:
+        Iterator[bytes]: The tokens without their separator.
+
+    Description:
+    If the generator is closed early the git process is terminated.
+    A `subprocess.CalledProcessError` is raised if git fails.
+    """
+    # stderr goes to a file, a full stderr pipe would block git while stdout is read
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            ["git", *args],
+            cwd=workdir,
+            stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        assert proc.stdout is not None
+        finished = False
+        try:
+            if stdin is not None:
+                # only used for commands that read all of their input before writing any output
+                assert proc.stdin is not None
+                proc.stdin.write(stdin)
+                proc.stdin.close()
+            yield from _iter_tokens(proc.stdout, sep)
+            finished = True
+        finally:
+            proc.stdout.close()
+            if not finished:
+                proc.terminate()
+            returncode = proc.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode,
+                proc.args,
+                stderr=stderr.read().decode("utf-8", errors="replace"),
+            )
+
+
+def iter_revisions(workdir: str, revs: list[str]) -> Generator[str, None, None]:
+    """
+    Lazily lists the commit SHAs reachable from the given revisions.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        revs (list): The revisions to pass to `git rev-list`, for example `["HEAD"]`.
+
+    Returns:
+        Generator[str]: The commit SHAs in `git rev-list` order (newest first).
+
+    Description:
+    The SHAs are streamed from `git rev-list` while it walks the history, nothing is kept in memory.
+    Closing the generator early stops the walk.
+
+    Example:
+    ```
+    for sha in iter_revisions(repo.working_tree_dir, ["HEAD"]):
+        if sha in tagged:
+            break
+    ```
+
+    """
+    for line in _iter_git(workdir, ["rev-list", *revs, "--"], b"\n"):
+        yield line.decode("ascii")
+
+
+def iter_messages(
+    workdir: str, revs: list[str]
+) -> Generator[tuple[str, str], None, None]:
+    """
+    Lazily lists the commits reachable from the given revisions together with their messages.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        revs (list): The revisions to pass to `git log`, for example `["HEAD", "^v1.0.0"]`.
+
+    Returns:
+        Generator[tuple]: Tuples of commit SHA and message in `git log` order (newest first).
+
+    Description:
+    Unlike `iter_history` no commit is diffed, so this costs about as much as `iter_revisions`.
+    It is used to look up commits in the commit cache, only the commits which are not cached are diffed.
+
+    Example:
+    ```
+    for sha, message in iter_messages(repo.working_tree_dir, ["HEAD", "^v1.0.0"]):
+        print(f"{sha}: {message.splitlines()[0]}")
+    ```
+
+    """
+    args = ["log", "-z", "--no-show-signature", "--no-color", _LOG_FORMAT, *revs, "--"]
+    sha = ""
+    # 0: expecting a record start, 1: expecting the SHA, 2: expecting the message
+    state = 0
+    for token in _iter_git(workdir, args, b"\0"):
+        if state == 2:
+            yield (sha, token.decode("utf-8", errors="replace"))
+            state = 0
+        elif state == 1:
+            sha = token.decode("ascii")
+            state = 2
+        elif len(token) == 0:
+            state = 1
+
+
+def iter_history(
+    workdir: str, revs: list[str], walk: bool = True
+) -> Generator[HistoryCommit, None, None]:
+    """
+    Streams commits and the paths they changed from a single `git log` process.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        revs (list): The revisions to pass to `git log`, for example `["HEAD", "^v1.0.0"]`.
+        walk (bool): If False, only the given commit SHAs are read (in the given order) instead of walking the history.
+
+    Returns:
+        Generator[HistoryCommit]: The commits in `git log` order (newest first).
+
+    Description:
+    This function spawns `git log --name-only -z` and parses its output incrementally,
+    so commits are yielded while git is still walking the history.
+    The paths of merge commits are the ones changed compared to their first parent.
+    Renames are listed as a deletion of the old path and an addition of the new path.
+    If the generator is closed early the git process is terminated.
+
+    Example:
+    ```
+    for commit in iter_history(repo.working_tree_dir, ["HEAD", "^v1.0.0"]):
+        print(f"{commit.hexsha}: {', '.join(commit.paths)}")
+    ```
+
+    """
+    args = [
+        "log",
+        "-z",
+        "--name-only",
+        "--no-renames",
+        "--diff-merges=first-parent",
+        "--no-show-signature",
+        "--no-color",
+        _LOG_FORMAT,
+        *(revs if walk else ["--no-walk=unsorted", "--stdin"]),
+        "--",
+    ]
+    sha = ""
+    message = ""
+    paths: list[str] = []
+    # 0: expecting a record start, 1: expecting the SHA, 2: expecting the message, 3: reading paths
+    state = 0
+    stdin = None if walk else "".join(f"{rev}\n" for rev in revs).encode("ascii")
+    for token in _iter_git(workdir, args, b"\0", stdin):
+        if state == 3 and len(token) > 0:
+            # the first path is separated from the message by a newline
+            paths.append(os.fsdecode(token[1:] if len(paths) == 0 else token))
+        elif state == 2:
+            message = token.decode("utf-8", errors="replace")
+            state = 3
+        elif state == 1:
+            sha = token.decode("ascii")
+            state = 2
+        else:
+            if state == 3:
+                yield HistoryCommit(sha, message, paths)
+                paths = []
+            state = 1
+    if state == 3:
+        yield HistoryCommit(sha, message, paths)
+
+
+def _read_commits(workdir: str, shas: list[str]) -> list[HistoryCommit]:
+    """
+    Reads the given commits and the paths they changed, runs in a worker process of `read_commits`.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        shas (list): The commit SHAs to read.
+
+    Returns:
+        list: The commits in the given order.
+    """
+    return list(iter_history(workdir, shas, walk=False))
+
+
+def read_commits(workdir: str, shas: list[str], jobs: int = 1) -> list[HistoryCommit]:
+    """
+    Reads the given commits and the paths they changed, optionally in parallel.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        shas (list): The commit SHAs to read.
+        jobs (int): The number of worker processes to use.
+
+    Returns:
+        list: The commits in the given order.
+
+    Description:
+    The SHAs are split into chunks. The changed paths of each chunk are read by a `git log --no-walk` process
+    in a `ProcessPoolExecutor` worker and the chunks are merged back in order.
+    Fewer commits than `_MIN_COMMITS_PER_JOB` per job are read serially by a single process.
+    """
+    if len(shas) == 0:
+        return []
+    jobs = min(jobs, len(shas) // _MIN_COMMITS_PER_JOB)
+    if jobs <= 1:
+        return list(iter_history(workdir, shas, walk=False))
+    # more chunks than workers so a slow chunk (large diffs) does not stall the others
+    chunk_size = math.ceil(len(shas) / (jobs * 4))
+    chunks = []
+    while len(shas) > 0:
+        chunks.append(shas[:chunk_size])
+        shas = shas[chunk_size:]
+    commits: list[HistoryCommit] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for chunk in executor.map(_read_commits, [workdir] * len(chunks), chunks):
+            commits.extend(chunk)
+    return commits
+
+
+def read_history(workdir: str, revs: list[str], jobs: int = 1) -> list[HistoryCommit]:
+    """
+    Reads commits and the paths they changed, optionally in parallel.
+
+    Parameters:
+        workdir (str): The working directory of the git repository.
+        revs (list): The revisions to walk, for example `["HEAD", "^v1.0.0"]`.
+        jobs (int): The number of worker processes to use.
+
+    Returns:
+        list: The commits in `git log` order (newest first).
+
+    Description:
+    With a single job this is `iter_history`. With more jobs the commit SHAs are listed first
+    (which is cheap as nothing has to be diffed) and read by `read_commits`.
+    This is meant for cold runs on long histories, short ranges are always read serially.
+
+    Example:
+    ```
+    commits = read_history(repo.working_tree_dir, ["HEAD"], jobs=os.cpu_count() or 1)
+    ```
+
+    """
+    if jobs <= 1:
+        return list(iter_history(workdir, revs))
+    return read_commits(workdir, list(iter_revisions(workdir, revs)), jobs)
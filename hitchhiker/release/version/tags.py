@@ -0,0 +1,146 @@
+import subprocess
+import warnings
+from typing import Any, Dict, NamedTuple, Optional
+
+import hitchhiker.cli.release.tagfix as tagfix
+import hitchhiker.release.version.semver as semver
+
+_REF_PREFIX = "refs/tags/"
+
+
+def _peel_nested(workdir: str, refnames: list[str]) -> list[Optional[str]]:
+    """
+    Resolves tags of tags to the commit they finally point to.
+
+    Parameters:
+        workdir (str): The working directory of the repository.
+        refnames (list): The full ref names of the tags.
+
+    Returns:
+        list: The commit SHA of each tag, None if a tag does not point to a commit.
+    """
+    peeled = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname)"],
+        cwd=workdir,
+        input="".join(f"{refname}^{{commit}}\n" for refname in refnames),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    # refs that cannot be resolved to a commit are printed as "<ref> missing"
+    return [None if sha.endswith(" missing") else sha for sha in peeled]
+
+
+class TagInfo(NamedTuple):
+    """A release tag together with the commit it points to and its parsed version"""
+
+    name: str
+    commit_sha: str
+    branch: Optional[str]
+    version: semver.Version
+
+
+class TagIndex:
+    """Index of all release tags of a repository, built once per run"""
+
+    def __init__(self, tags: list[TagInfo]) -> None:
+        """
+        Initializes a tag index from a list of tags.
+
+        Parameters:
+            tags (list): The release tags to index.
+
+        Description:
+        The tags are sorted in descending order based on their versions and partitioned by their branch prefix.
+        Tags without a branch prefix are kept in the `None` partition.
+
+        Example:
+        ```
+        index = TagIndex.from_repo(config)
+        ```
+
+        """
+        self.tags = sorted(tags, reverse=True, key=lambda t: t.version)
+        self.by_branch: Dict[Optional[str], list[TagInfo]] = {}
+        for tag in self.tags:
+            self.by_branch.setdefault(tag.branch, []).append(tag)
+
+    @classmethod
+    def from_repo(cls, config: Dict[str, Any]) -> "TagIndex":
+        """
+        Builds a tag index from the tags of the repository.
+
+        Parameters:
+            config (dict): Configuration information for the repository and versioning.
+
+        Returns:
+            TagIndex: The tag index.
+
+        Description:
+        All tags are read with a single `git for-each-ref` call, which also resolves annotated tags
+        to the commit they point to. Tags of tags are resolved with a single `git cat-file` call.
+        Tags that are not semantic versions (after removing the branch prefix
+        if `prepend_branch_to_tag` is set) and tags that do not point to a commit are skipped,
+        a warning is issued for skipped tags of the active branch.
+
+        """
+        refs = subprocess.run(
+            [
+                "git",
+                "for-each-ref",
+                "--format=%(refname) %(objecttype) %(objectname) %(*objecttype) %(*objectname)",
+                _REF_PREFIX,
+            ],
+            cwd=config["repo"].working_tree_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        active_branch = tagfix.get_active_branch(config)
+        tags = []
+        nested = []
+        for line in refs.splitlines():
+            refname, objecttype, objectname, peeledtype, peeled = line.split(" ")
+            name = refname.removeprefix(_REF_PREFIX)
+            branch, tag = tagfix.split_tag(config, name, active_branch)
+            try:
+                version = semver.Version().parse(tag)
+            except RuntimeError:
+                if branch is not None and branch == active_branch:
+                    warnings.warn(
+                        f"ignoring tag {name}: {tag} is not a semantic version"
+                    )
+                continue
+            if objecttype == "commit":
+                tags.append(TagInfo(name, objectname, branch, version))
+            elif peeledtype == "commit":
+                tags.append(TagInfo(name, peeled, branch, version))
+            elif peeledtype == "tag":
+                nested.append((refname, name, branch, version))
+        if len(nested) > 0:
+            workdir = config["repo"].working_tree_dir
+            shas = _peel_nested(workdir, [refname for refname, *_ in nested])
+            for (_, name, branch, version), sha in zip(nested, shas):
+                if sha is not None:
+                    tags.append(TagInfo(name, sha, branch, version))
+        return cls(tags)
+
+    def commit_shas(self, prerelease: bool, branch: Optional[str] = None) -> set[str]:
+        """
+        Returns the SHAs of all commits with a matching release tag.
+
+        Parameters:
+            prerelease (bool): Whether to include prerelease tags.
+            branch (str, optional): Only include tags of this branch and tags without a branch prefix.
+
+        Returns:
+            set: The commit SHAs.
+        """
+        tags = self.by_branch.get(None, [])
+        if branch is not None:
+            tags = tags + self.by_branch.get(branch, [])
+        return {
+            tag.commit_sha
+            for tag in tags
+            if prerelease or tag.version.prerelease is None
+        }
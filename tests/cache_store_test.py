@@ -0,0 +1,48 @@
+"""tests for the JsonCacheStore class"""
+
+import json
+import os
+
+import pytest
+
+from hitchhiker.cache_store import JsonCacheStore
+
+
+def test_cache_store_tables(tmp_path):
+    """entries are evicted per table, least recently used first"""
+    path = tmp_path / "store.json"
+    store = JsonCacheStore(str(path), 1, {"a": 2, "b": 1}, "test store")
+    store.set("a", "x", [1])
+    store.set("a", "y", [2])
+    store.set("b", "x", {"b": True})
+    store.set("b", "y", {"b": False})
+    # x becomes the most recently used entry of table a
+    assert store.get("a", "x") == [1]
+    store.set("a", "z", [3])
+    store.save()
+
+    with open(path, encoding="utf-8") as f:
+        assert json.loads(f.read()) == {
+            "version": 1,
+            "a": {"x": [1], "z": [3]},
+            "b": {"y": {"b": False}},
+        }
+    store = JsonCacheStore(str(path), 1, {"a": 2, "b": 1}, "test store")
+    assert store.get("a", "y") is None
+    store.remove("a", "x")
+    store.save()
+    assert JsonCacheStore(str(path), 1, {"a": 2, "b": 1}, "test").get("a", "x") is None
+    # files with another version or missing tables are ignored
+    assert JsonCacheStore(str(path), 2, {"a": 2, "b": 1}, "test").get("a", "z") is None
+    assert JsonCacheStore(str(path), 1, {"a": 2, "c": 1}, "test").get("a", "z") is None
+
+
+def test_cache_store_write_error(tmp_path):
+    """a write error only issues a warning and leaves no temporary file behind"""
+    # the cache file cannot replace a directory
+    os.mkdir(tmp_path / "store.json")
+    store = JsonCacheStore(str(tmp_path / "store.json"), 1, {"a": 1}, "test store")
+    store.set("a", "x", 1)
+    with pytest.warns(UserWarning, match="cannot write the test store"):
+        store.save()
+    assert os.listdir(tmp_path) == ["store.json"]
@@ -0,0 +1,90 @@
+"""tests for lazily loaded subcommands"""
+
+import subprocess
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from hitchhiker.cli.cli import cli
+from hitchhiker.cli.lazy import LazyGroup
+from hitchhiker.cli.modules.commands import modules as modules_cmd
+
+
+def test_help_lists_lazy_commands():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name in ["auth", "modules", "odoo", "release", "update"]:
+        assert f"  {name}" in result.output
+    assert "Prepares the release context for a git repository." in result.output
+
+
+@pytest.mark.parametrize(
+    "group,name",
+    [
+        (cli, "auth"),
+        (cli, "modules"),
+        (cli, "odoo"),
+        (cli, "release"),
+        (cli, "update"),
+        (modules_cmd, "new"),
+    ],
+)
+def test_lazy_help_matches_command(group, name):
+    lazy_help = group.lazy_subcommands[name][1]
+    assert lazy_help != ""
+    module = group.lazy_subcommands[name][0].split(":")[0]
+    if name == "new":
+        pytest.importorskip("copier")
+    pytest.importorskip(module)
+    cmd = group.get_command(click.Context(group), name)
+    assert cmd.get_short_help_str() == lazy_help
+
+
+def test_help_does_not_import_commands():
+    code = (
+        "import sys\n"
+        "from hitchhiker.cli.cli import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "loaded = [m for m in ['git', 'github', 'requests', 'copier', 'hitchhiker.cli.release.commands'] if m in sys.modules]\n"
+        "print(loaded, file=sys.stderr)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stderr.strip() == "[]"
+
+
+def test_lazy_group_missing_dependency():
+    @click.group(
+        cls=LazyGroup,
+        lazy_subcommands={"broken": ("hitchhiker_nonexistent_module:cmd", "Broken")},
+    )
+    def group():
+        pass
+
+    result = CliRunner().invoke(group, ["broken"])
+    assert result.exit_code != 0
+    assert "Please install hitchhiker_nonexistent_module" in result.output
+
+
+def test_list_commands_after_load():
+    @click.group(
+        cls=LazyGroup,
+        lazy_subcommands={"lazy": ("hitchhiker.cli.cli:cli", "Lazy")},
+    )
+    def group():
+        pass
+
+    @group.command()
+    def eager():
+        pass
+
+    ctx = click.Context(group)
+    assert group.list_commands(ctx) == ["eager", "lazy"]
+    assert group.get_command(ctx, "lazy") is cli
+    assert group.list_commands(ctx) == ["eager", "lazy"]
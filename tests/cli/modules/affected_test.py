@@ -0,0 +1,62 @@
+import os
+import subprocess
+
+from click.testing import CliRunner
+
+from hitchhiker.cli.cli import cli
+from tests.cli.modules.mod_fixtures import *  # noqa: F403, F401
+from tests.cli.modules.mod_fixtures import create_odoo_mod
+
+
+def git(path, *args):
+    subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+
+def test_affected(no_mods):
+    git(no_mods, "init", "-q")
+    git(no_mods, "config", "user.email", "test@example.com")
+    git(no_mods, "config", "user.name", "test")
+    create_odoo_mod(no_mods / "addons", "base_ext", depends=[])
+    create_odoo_mod(no_mods / "addons", "sale_ext", depends=["base_ext", "sale"])
+    create_odoo_mod(no_mods / "custom", "report_ext", depends=["sale_ext"])
+    create_odoo_mod(no_mods / "custom", "other", depends=[])
+    with open(no_mods / "README.md", "w") as f:
+        f.write("readme\n")
+    git(no_mods, "add", ".")
+    git(no_mods, "commit", "-q", "-m", "initial")
+    os.chdir(no_mods)
+
+    result = CliRunner().invoke(cli, ["modules", "affected", "--since", "HEAD"])
+    assert result.exit_code == 0
+    assert result.output == ""
+
+    with open(no_mods / "README.md", "a") as f:
+        f.write("changed\n")
+    with open(no_mods / "addons" / "base_ext" / "models.py", "w") as f:
+        f.write("# new file\n")
+    git(no_mods, "add", ".")
+    result = CliRunner().invoke(cli, ["modules", "affected", "--since", "HEAD"])
+    assert result.exit_code == 0
+    assert result.output == "base_ext\nsale_ext\nreport_ext\n"
+
+    git(no_mods, "commit", "-q", "-m", "change")
+    os.chdir(no_mods / "custom")
+    result = CliRunner().invoke(
+        cli,
+        [
+            "modules",
+            "affected",
+            "--since",
+            "HEAD~1",
+            "--glob",
+            "../**/__manifest__.py",
+            "--output-format",
+            "comma",
+        ],
+    )
+    assert result.exit_code == 0
+    assert result.output == "base_ext,sale_ext,report_ext\n"
+
+    result = CliRunner().invoke(cli, ["modules", "affected", "--since", "nope"])
+    assert result.exit_code == 1
+    assert "git diff failed" in result.output
@@ -0,0 +1,117 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from hitchhiker.cli.cli import cli
+from tests.cli.modules.mod_fixtures import *  # noqa: F403, F401
+
+
+def test_generate_addons_path(dupe_mods):
+    os.chdir(dupe_mods)
+    result = CliRunner().invoke(cli, ["modules", "generate_addons_path"])
+    assert result.exit_code == 0
+    assert result.output == f"{dupe_mods},{dupe_mods / 'somedir'}\n"
+
+
+def test_generate_addons_path_gitignore(dupe_mods):
+    # addons checked out into an ignored directory are part of the addons path
+    os.chdir(dupe_mods)
+    with open(".gitignore", "w") as f:
+        f.write("somedir/\n")
+    result = CliRunner().invoke(cli, ["modules", "generate_addons_path"])
+    assert result.exit_code == 0
+    assert result.output == f"{dupe_mods},{dupe_mods / 'somedir'}\n"
+
+    result = CliRunner().invoke(cli, ["modules", "--gitignore", "generate_addons_path"])
+    assert result.exit_code == 0
+    assert result.output == f"{dupe_mods}\n"
+
+
+def test_generate_addons_path_unwritable_index(one_mod, tmp_path, monkeypatch):
+    # the cache directory cannot be created below a file
+    with open(tmp_path / "cache", "w") as f:
+        f.write("")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    os.chdir(one_mod)
+    with pytest.warns(UserWarning, match="cannot write the module index"):
+        result = CliRunner().invoke(cli, ["modules", "generate_addons_path"])
+    assert result.exit_code == 0
+    assert result.output == f"{one_mod}\n"
+
+
+def test_generate_addons_path_output(one_mod):
+    os.chdir(one_mod)
+    with open("odoo.conf", "w") as f:
+        f.write("[options]\n; comment\naddons_path = /old\ndb_name = test\n")
+    result = CliRunner().invoke(
+        cli, ["modules", "generate_addons_path", "--output", "odoo.conf"]
+    )
+    assert result.exit_code == 0
+    assert result.output == ""
+    with open("odoo.conf") as f:
+        assert (
+            f.read()
+            == f"[options]\n; comment\naddons_path = {one_mod}\ndb_name = test\n"
+        )
+    mtime = os.stat("odoo.conf").st_mtime_ns
+
+    # unchanged files are not written
+    result = CliRunner().invoke(
+        cli, ["modules", "generate_addons_path", "--output", "odoo.conf"]
+    )
+    assert result.exit_code == 0
+    assert os.stat("odoo.conf").st_mtime_ns == mtime
+
+    result = CliRunner().invoke(
+        cli, ["modules", "generate_addons_path", "--output", "addons_path.txt"]
+    )
+    assert result.exit_code == 0
+    with open("addons_path.txt") as f:
+        assert f.read() == f"{one_mod}\n"
+
+
+def test_generate_addons_path_for(no_mods):
+    for path, depends in [
+        ("core/base_ext", ["base"]),
+        ("oca/repo/sale_ext", ["base_ext", "sale"]),
+        ("custom/report_ext", ["sale_ext"]),
+        ("other/unrelated", []),
+    ]:
+        os.makedirs(no_mods / path)
+        with open(no_mods / path / "__manifest__.py", "w") as f:
+            f.write(repr({"version": "1.0.0", "depends": depends}))
+    os.chdir(no_mods)
+
+    result = CliRunner().invoke(
+        cli, ["modules", "generate_addons_path", "--for", "report_ext"]
+    )
+    assert result.exit_code == 0
+    paths = [no_mods / "core", no_mods / "custom", no_mods / "oca" / "repo"]
+    assert result.output == (
+        "dependencies not found: base, sale\n" f"{','.join(map(str, paths))}\n"
+    )
+
+    result = CliRunner().invoke(
+        cli, ["modules", "generate_addons_path", "--for", "unrelated, base_ext"]
+    )
+    assert result.exit_code == 0
+    assert result.output == (
+        "dependencies not found: base\n" f"{no_mods / 'core'},{no_mods / 'other'}\n"
+    )
+
+    result = CliRunner().invoke(
+        cli, ["modules", "generate_addons_path", "--for", "report_ext,sale"]
+    )
+    assert result.exit_code == 1
+    assert "unknown module(s): sale" in result.output
+
+
+def test_generate_addons_path_watch_glob(one_mod):
+    os.chdir(one_mod)
+    result = CliRunner().invoke(
+        cli,
+        ["modules", "generate_addons_path", "--watch", "--glob", "*/__manifest__.py"],
+    )
+    assert result.exit_code == 1
+    assert "--watch requires a glob" in result.output
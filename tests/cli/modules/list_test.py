@@ -251,3 +251,30 @@ hello
     assert result.output == expected_output
     with open(testf) as f:
         assert f.read() == expect_f_out
+
+
+def test_list_module_index(ten_mods, module_index):
+    os.chdir(ten_mods)
+    result = CliRunner().invoke(cli, ["modules", "--no-cache", "list"])
+    assert result.exit_code == 0
+    assert not module_index.exists()
+
+    uncached = result.output
+    result = CliRunner().invoke(cli, ["modules", "list"])
+    assert result.exit_code == 0
+    assert module_index.exists()
+    assert result.output == uncached
+    result = CliRunner().invoke(cli, ["modules", "list"])
+    assert result.exit_code == 0
+    assert result.output == uncached
+
+
+def test_list_invalid_manifest(one_mod):
+    os.chdir(one_mod)
+    os.mkdir("broken_mod")
+    with open("broken_mod/__manifest__.py", "w") as f:
+        f.write("{")
+    result = CliRunner().invoke(cli, ["modules", "-j", "2", "list"])
+    assert result.exit_code == 0
+    assert result.output.startswith("invalid manifest ./broken_mod/__manifest__.py: ")
+    assert result.output.endswith("some_cool_odoo_module 1.5.3\n")
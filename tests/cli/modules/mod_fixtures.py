@@ -15,15 +15,27 @@ def dict2str(dictionary):
         value = dictionary[key]
         st += "    "
         st += f'"{key}": '
-        st += f'"{value}",'
+        st += f'"{value}",' if isinstance(value, str) else f"{value!r},"
     st += "}\n"
     return st
 
 
-def create_odoo_mod(bpath, name, version):
-    os.mkdir(f"{bpath}/{name}")
+@pytest.fixture(autouse=True)
+def module_index(tmp_path_factory, monkeypatch):
+    """keeps the module index of the CLI out of the user's cache directory"""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(path))
+    return path / "hitchhiker" / "modules.json"
+
+
+def create_odoo_mod(bpath, name, version="1.0.0", depends=None, content=None):
+    """creates (or overwrites) a module, content replaces the generated manifest"""
+    os.makedirs(f"{bpath}/{name}", exist_ok=True)
+    manifest = {"name": get_human_name(name), "version": version}
+    if depends is not None:
+        manifest["depends"] = depends
     with open(f"{bpath}/{name}/__manifest__.py", "w") as f:
-        f.write(dict2str({"name": get_human_name(name), "version": version}))
+        f.write(content if content is not None else dict2str(manifest))
 
 
 @pytest.fixture
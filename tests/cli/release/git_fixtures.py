@@ -69,6 +69,7 @@ version_cfg = setup.cfg:tool.hitchhiker:project_version
         if is_odoo:
             with open(f"{repo.working_tree_dir}/{project}/__manifest__.py", "w") as f:
                 f.write(f'{{\n    "version": "{version}"\n}}')
+            repo.git.add(f"{project}/__manifest__.py")
 
 
 def create_random_file(repo, path=""):
@@ -1,4 +1,8 @@
-from hitchhiker.cli.release.tagfix import get_tag_without_branch, add_branch_to_tag
+from hitchhiker.cli.release.tagfix import (
+    add_branch_to_tag,
+    get_branch_from_tag,
+    get_tag_without_branch,
+)
 
 
 class _mockclass:
@@ -45,3 +49,25 @@ def test_add_branch_to_tag():
     conf = {"prepend_branch_to_tag": True, "repo": _mockclass("branch")}
     assert add_branch_to_tag(conf, "v1.2.3") == "branch-v1.2.3"
     assert add_branch_to_tag(conf, "v1.2.3-rc.1") == "branch-v1.2.3-rc.1"
+
+
+def test_get_branch_from_tag():
+    conf = {"prepend_branch_to_tag": False, "repo": _mockclass("somebranch")}
+    assert get_branch_from_tag(conf, "somebranch-v1.2.3") is None
+    conf = {"prepend_branch_to_tag": True, "repo": _mockclass("somebranch")}
+    assert get_branch_from_tag(conf, "somebranch-v1.2.3") == "somebranch"
+    assert get_branch_from_tag(conf, "somebranch-v1.2.3-rc.1") == "somebranch"
+    assert get_branch_from_tag(conf, "v1.2.3") is None
+    assert (
+        get_branch_from_tag(conf, add_branch_to_tag(conf, "v1.2.3")) == "somebranch"
+    )
+
+
+def test_branch_with_dashes():
+    conf = {"prepend_branch_to_tag": True, "repo": _mockclass("release-16")}
+    assert get_tag_without_branch(conf, "release-16-v1.2.3") == "v1.2.3"
+    assert get_branch_from_tag(conf, "release-16-v1.2.3-rc.1") == "release-16"
+    assert get_branch_from_tag(conf, "feature-x-1.2.3") == "feature-x"
+    assert get_tag_without_branch(conf, "feature-x-1.2.3") == "1.2.3"
+    assert get_branch_from_tag(conf, "v1.2.3-rc.1") is None
+    assert get_tag_without_branch(conf, "v1.2.3-rc.1") == "v1.2.3-rc.1"
@@ -1,4 +1,7 @@
 """Tests for ConfigManager class"""
+
+from concurrent.futures import ProcessPoolExecutor
+
 from hitchhiker.config.config import ConfigManager
 
 
@@ -85,3 +88,82 @@ def test_configmanager(tmp_path_factory):
         assert False
     except KeyError:
         pass
+
+
+def test_configmanager_lazy(tmp_path_factory):
+    tmpf = tmp_path_factory.mktemp("conf") / "subdir" / "config.json"
+    cfg = ConfigManager(tmpf, {})
+    assert not cfg.has_key("somekey")
+    assert not tmpf.parent.exists()
+
+    cfg = ConfigManager(tmpf, {"testkey1": "x"})
+    assert not tmpf.exists()
+    assert cfg.get_key("testkey1") == "x"
+    assert tmpf.exists()
+
+
+def test_configmanager_transaction(tmp_path_factory):
+    tmpf = tmp_path_factory.mktemp("conf") / "config.json"
+    cfg = ConfigManager(tmpf, {})
+    with cfg.transaction():
+        cfg.set_key("testkey1", "x")
+        with cfg.transaction():
+            cfg.set_key("testkey2", "y")
+        assert not tmpf.exists()
+    assert ConfigManager(tmpf, {}).get_key("testkey2") == "y"
+    assert not any(p.name.endswith(".tmp") for p in tmpf.parent.iterdir())
+
+    try:
+        with cfg.transaction():
+            cfg.set_key("testkey1", "z")
+            raise RuntimeError()
+    except RuntimeError:
+        pass
+    assert cfg.get_key("testkey1") == "x"
+    assert ConfigManager(tmpf, {}).get_key("testkey1") == "x"
+
+
+def _set_keys(args):
+    path, worker = args
+    cfg = ConfigManager(path, {"shared": worker})
+    for i in range(20):
+        cfg.set_key(f"worker{worker}_{i}", i)
+        assert cfg.get_key(f"worker{worker}_{i}") == i
+
+
+def test_configmanager_concurrent(tmp_path_factory):
+    tmpf = str(tmp_path_factory.mktemp("conf") / "config.json")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_set_keys, [(tmpf, worker) for worker in range(8)]))
+    cfg = ConfigManager(tmpf, {})
+    for worker in range(8):
+        for i in range(20):
+            assert cfg.get_key(f"worker{worker}_{i}") == i
+    assert cfg.get_key("shared") in range(8)
+
+
+def test_configmanager_reload(tmp_path_factory):
+    tmpf = tmp_path_factory.mktemp("conf") / "config.json"
+    cfg1 = ConfigManager(tmpf, {})
+    cfg2 = ConfigManager(tmpf, {})
+    cfg1.set_key("testkey1", "x")
+    assert cfg2.get_key("testkey1") == "x"
+    cfg2.set_key("testkey2", "y")
+    assert cfg1.get_key("testkey2") == "y"
+    cfg1.set_key("testkey1", "z")
+    assert cfg2.get_key("testkey1") == "z"
+    assert cfg2.get_key("testkey2") == "y"
+
+
+def test_configmanager_corrupt(tmp_path_factory):
+    tmpf = tmp_path_factory.mktemp("conf") / "config.json"
+    with open(tmpf, "w") as f:
+        f.write('{"testkey1": "x", "test')
+    cfg = ConfigManager(tmpf, {})
+    assert not cfg.has_key("testkey1")
+    with open(tmpf, "r") as f:
+        assert f.read() == '{"testkey1": "x", "test'
+    cfg.set_key("testkey2", "y")
+    assert ConfigManager(tmpf, {}).get_key("testkey2") == "y"
+    with open(f"{tmpf}.corrupt", "r") as f:
+        assert f.read() == '{"testkey1": "x", "test'
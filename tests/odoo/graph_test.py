@@ -0,0 +1,99 @@
+"""tests for the module dependency graph"""
+
+import os
+
+from hitchhiker.odoo.graph import ModuleGraph
+from hitchhiker.odoo.index import ModuleIndex
+from hitchhiker.odoo.module import discover_modules
+
+
+def create_graph(tmp_path, depends, index=None):
+    fnames = []
+    for name, deps in depends.items():
+        os.makedirs(tmp_path / name)
+        fname = str(tmp_path / name / "__manifest__.py")
+        with open(fname, "w") as f:
+            f.write(repr({"version": "1.0.0", "depends": deps}))
+        fnames.append(fname)
+    return ModuleGraph(discover_modules(fnames), index)
+
+
+def test_module_graph(tmp_path):
+    graph = create_graph(
+        tmp_path,
+        {
+            "sale_ext": ["sale_base", "web"],
+            "sale_base": ["base"],
+            "report": ["sale_ext", "sale_base"],
+            "other": [],
+        },
+    )
+    assert graph.get_names() == ["sale_ext", "sale_base", "report", "other"]
+    assert graph.get_depends("sale_ext") == ["sale_base"]
+    assert graph.get_dependents("sale_base") == ["sale_ext", "report"]
+    assert graph.get_missing() == {"sale_ext": ["web"], "sale_base": ["base"]}
+    assert graph.dependents_closure(["sale_ext", "unknown"]) == {"sale_ext", "report"}
+    assert graph.dependents_closure(["sale_base"]) == {
+        "sale_base",
+        "sale_ext",
+        "report",
+    }
+    assert graph.topological_order() == ["other", "sale_base", "sale_ext", "report"]
+    assert graph.topological_order(["report", "sale_base"]) == ["sale_base", "report"]
+    assert graph.dependencies_closure(["report"]) == {"report", "sale_ext", "sale_base"}
+    assert graph.dependencies_closure(["sale_ext", "other", "unknown"]) == {
+        "sale_ext",
+        "sale_base",
+        "other",
+    }
+    assert graph.get_levels() == {
+        "other": 0,
+        "sale_base": 0,
+        "sale_ext": 1,
+        "report": 2,
+    }
+    assert graph.find_cycles() == []
+
+
+def test_module_graph_order_through_unselected(tmp_path):
+    graph = create_graph(tmp_path, {"a": ["b"], "b": ["c"], "c": []})
+    assert graph.topological_order(["a", "c"]) == ["c", "a"]
+
+
+def test_module_graph_cycle(tmp_path):
+    graph = create_graph(
+        tmp_path, {"a": ["c"], "b": ["a"], "c": ["b"], "d": [], "e": ["d"]}
+    )
+    # the cycle does not depend on anything, it is ordered as a whole by its smallest name
+    assert graph.topological_order() == ["a", "b", "c", "d", "e"]
+    assert graph.find_cycles() == [["a", "b", "c"]]
+    assert graph.get_levels() == {"a": 0, "b": 0, "c": 0, "d": 0, "e": 1}
+    assert graph.dependencies_closure(["b"]) == {"a", "b", "c"}
+
+
+def test_module_graph_cycle_dependents(tmp_path):
+    graph = create_graph(tmp_path, {"z": [], "y": ["z", "x"], "x": ["y"], "a": ["x"]})
+    assert graph.topological_order() == ["z", "x", "y", "a"]
+    assert graph.find_cycles() == [["x", "y"]]
+    assert graph.get_levels() == {"z": 0, "x": 1, "y": 1, "a": 2}
+
+
+def test_module_graph_index(tmp_path):
+    index_path = str(tmp_path / "modules.json")
+    depends = {"a": ["b"], "b": []}
+    graph = create_graph(tmp_path / "mods", depends, ModuleIndex(index_path))
+    assert graph.topological_order() == ["b", "a"]
+
+    # the results are read from the index, as long as the dependencies are the same
+    index = ModuleIndex(index_path)
+    stored = index.get_graph(graph.fingerprint())
+    assert stored == {"order": ["b", "a"], "levels": {"b": 0, "a": 1}, "cycles": []}
+    stored["order"] = ["a", "b"]
+    manifests = [str(tmp_path / "mods" / m / "__manifest__.py") for m in ["a", "b"]]
+    graph = ModuleGraph(discover_modules(manifests), index)
+    assert graph.topological_order() == ["a", "b"]
+
+    with open(tmp_path / "mods" / "b" / "__manifest__.py", "w") as f:
+        f.write(repr({"version": "1.0.0", "depends": ["a"]}))
+    graph = ModuleGraph(discover_modules(manifests), index)
+    assert graph.find_cycles() == [["a", "b"]]
@@ -0,0 +1,120 @@
+"""tests for the ModuleIndex class"""
+
+import json
+import os
+
+import pytest
+
+from hitchhiker.odoo.index import ModuleIndex
+from hitchhiker.odoo.module import discover_modules
+
+
+def create_manifest(path, version):
+    os.makedirs(path, exist_ok=True)
+    fname = os.path.join(path, "__manifest__.py")
+    with open(fname, "w") as f:
+        f.write(f'{{"name": "Test", "version": "{version}", "data": [b"x"]}}')
+    return fname
+
+
+def test_module_index_roundtrip(tmp_path):
+    fname = create_manifest(tmp_path / "mod", "16.0.1.0.0")
+    path = str(tmp_path / "cache" / "modules.json")
+    index = ModuleIndex(path)
+    assert index.get(fname) is None
+    index.set(fname, ModuleIndex.stat(fname), {"int_name": "mod"})
+    index.save()
+
+    index = ModuleIndex(path)
+    assert index.get(fname) == {"int_name": "mod"}
+    assert index.get(str(tmp_path / "other" / "__manifest__.py")) is None
+
+    # changed manifests are not looked up from the index
+    create_manifest(tmp_path / "mod", "16.0.1.0.10")
+    assert ModuleIndex(path).get(fname) is None
+
+
+def test_module_index_invalid(tmp_path):
+    fname = create_manifest(tmp_path / "mod", "1.0.0")
+    path = tmp_path / "modules.json"
+    signature = ModuleIndex.stat(fname)
+    with open(path, "w") as f:
+        f.write(json.dumps({"version": -1, "entries": {fname: [*signature, {}]}}))
+    assert ModuleIndex(str(path)).get(fname) is None
+
+    with open(path, "w") as f:
+        f.write("{this is not json")
+    assert ModuleIndex(str(path)).get(fname) is None
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() == 0,
+    reason="permissions are not enforced for root",
+)
+def test_module_index_read_only(tmp_path):
+    fname = create_manifest(tmp_path / "mod", "1.0.0")
+    cachedir = tmp_path / "cache"
+    os.mkdir(cachedir)
+    index = ModuleIndex(str(cachedir / "modules.json"))
+    index.set(fname, ModuleIndex.stat(fname), {})
+    os.chmod(cachedir, 0o555)
+    try:
+        with pytest.warns(UserWarning, match="cannot write the module index"):
+            index.save()
+        assert os.listdir(cachedir) == []
+    finally:
+        os.chmod(cachedir, 0o755)
+
+
+def test_module_index_write_error(tmp_path):
+    fname = create_manifest(tmp_path / "mod", "1.0.0")
+    cachedir = tmp_path / "cache"
+    # the index file cannot be replaced by the temporary file
+    os.makedirs(cachedir / "modules.json")
+    index = ModuleIndex(str(cachedir / "modules.json"))
+    index.set(fname, ModuleIndex.stat(fname), {})
+    with pytest.warns(UserWarning, match="cannot write the module index"):
+        index.save()
+    assert os.listdir(cachedir) == ["modules.json"]
+
+
+def test_module_index_eviction(tmp_path):
+    fnames = [create_manifest(tmp_path / f"mod{i}", "1.0.0") for i in range(3)]
+    path = str(tmp_path / "modules.json")
+    index = ModuleIndex(path, max_entries=2)
+    index.set(fnames[0], ModuleIndex.stat(fnames[0]), {"i": 0})
+    index.set(fnames[1], ModuleIndex.stat(fnames[1]), {"i": 1})
+    index.get(fnames[0])
+    index.set(fnames[2], ModuleIndex.stat(fnames[2]), {"i": 2})
+    index.save()
+
+    index = ModuleIndex(path, max_entries=2)
+    assert index.get(fnames[0]) == {"i": 0}
+    assert index.get(fnames[1]) is None
+    assert index.get(fnames[2]) == {"i": 2}
+
+
+def test_discover_modules_index(tmp_path, monkeypatch):
+    fnames = [create_manifest(tmp_path / f"mod{i}", f"16.0.{i}.0.0") for i in range(3)]
+    path = str(tmp_path / "modules.json")
+    modules = discover_modules(fnames, ModuleIndex(path))
+    assert [(m.get_int_name(), str(m.get_version())) for m in modules] == [
+        ("mod0", "0.0.0"),
+        ("mod1", "1.0.0"),
+        ("mod2", "2.0.0"),
+    ]
+
+    # unchanged manifests are not read again
+    create_manifest(tmp_path / "mod1", "16.0.1.1.0")
+    opened = []
+    real_open = open
+
+    def tracking_open(file, *args, **kwargs):
+        opened.append(str(file))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    modules = discover_modules(fnames, ModuleIndex(path))
+    assert [str(m.get_version()) for m in modules] == ["0.0.0", "1.1.0", "2.0.0"]
+    assert [m.get_readable_name() for m in modules] == ["Test"] * 3
+    assert [f for f in opened if f.endswith("__manifest__.py")] == [fnames[1]]
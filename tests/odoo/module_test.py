@@ -0,0 +1,132 @@
+"""tests for the discovery of Odoo modules"""
+
+import os
+
+import pytest
+
+from hitchhiker.odoo.module import ManifestError, Module, discover_modules
+
+
+def create_manifest(path, content):
+    os.makedirs(path, exist_ok=True)
+    fname = os.path.join(path, "__manifest__.py")
+    with open(fname, "w") as f:
+        f.write(content)
+    return fname
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_discover_modules_parallel(tmp_path, processes, monkeypatch):
+    monkeypatch.setattr("hitchhiker.odoo.module._MIN_MANIFESTS_PER_THREAD", 1)
+    monkeypatch.setattr("hitchhiker.odoo.module._MIN_MANIFESTS_PER_PROCESS", 1)
+    fnames = [
+        create_manifest(tmp_path / f"mod_{i:02}", f'{{"version": "16.0.{i}.0.0"}}')
+        for i in range(40)
+    ]
+    fnames.reverse()
+    modules = discover_modules(fnames, jobs=4, processes=processes)
+    assert [m.get_int_name() for m in modules] == [
+        f"mod_{i:02}" for i in range(39, -1, -1)
+    ]
+    assert [str(m.get_version()) for m in modules][:2] == ["39.0.0", "38.0.0"]
+
+
+def test_discover_modules_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr("hitchhiker.odoo.module._MIN_MANIFESTS_PER_THREAD", 1)
+    fnames = [
+        create_manifest(tmp_path / "a", '{"version": "1.0.0"}'),
+        create_manifest(tmp_path / "b", '{"version": '),
+        create_manifest(tmp_path / "c", '["not", "a", "dict"]'),
+        create_manifest(tmp_path / "d", "{'version': open('x')}"),
+        str(tmp_path / "e" / "__manifest__.py"),
+    ]
+
+    errors = []
+    modules = discover_modules(fnames, jobs=4, errors=errors)
+    assert [m.get_int_name() for m in modules] == ["a"]
+    assert [e.manifest_path for e in errors] == [fnames[1], fnames[3], fnames[4]]
+    assert str(errors[0]).startswith(f"{fnames[1]}: ")
+
+    with pytest.raises(ManifestError) as e:
+        discover_modules(fnames, jobs=4)
+    assert e.value.manifest_path == fnames[1]
+
+
+def test_module_fields(tmp_path):
+    fname = create_manifest(
+        tmp_path / "my_mod",
+        '{"name": "My Module", "version": "16.0.1.2.3", "depends": ("base", "web"),'
+        ' "data": ["views/view.xml"], "description": "' + "x" * 1000 + '"}',
+    )
+    module = Module(fname)
+    assert not hasattr(module, "__dict__")
+    assert module.get_int_name() == "my_mod"
+    assert module.get_readable_name() == "My Module"
+    assert module.get_depends() == ["base", "web"]
+    assert module.is_installable()
+    assert module.get_version() is module.get_version()
+    assert str(module.get_version()) == "1.2.3"
+    assert module.to_index() == {
+        "int_name": "my_mod",
+        "manifest": {
+            "name": "My Module",
+            "version": "16.0.1.2.3",
+            "depends": ["base", "web"],
+        },
+    }
+
+    # the full manifest is read on demand, also for modules loaded from the index
+    module = Module(fname, module.to_index())
+    assert module.get_manifest()["data"] == ["views/view.xml"]
+    assert module.get_depends() == ["base", "web"]
+
+    fname = create_manifest(tmp_path / "other", '{"installable": False}')
+    module = Module(fname)
+    assert module.get_version() is None
+    assert module.get_readable_name() is None
+    assert module.get_depends() == []
+    assert not module.is_installable()
+
+
+def test_module_registry(tmp_path):
+    fnames = [
+        create_manifest(tmp_path / path, '{"version": "1.0.0"}')
+        for path in ["b/mod_b", "a/mod_b", "a/mod_a", "c/mod_b", "c/mod_c"]
+    ]
+    registry = discover_modules(fnames)
+    assert len(registry) == 5
+    assert [m.get_int_name() for m in registry] == [
+        "mod_b",
+        "mod_b",
+        "mod_a",
+        "mod_b",
+        "mod_c",
+    ]
+    assert [os.path.relpath(m.get_dir(), tmp_path) for m in registry.sorted()] == [
+        "a/mod_a",
+        "b/mod_b",
+        "a/mod_b",
+        "c/mod_b",
+        "c/mod_c",
+    ]
+    assert registry.get_names() == ["mod_b", "mod_a", "mod_c"]
+    assert registry.get("mod_x") == []
+    module = registry.get("mod_b")[1]
+    assert [
+        os.path.relpath(m.get_dir(), tmp_path) for m in registry.get_duplicates(module)
+    ] == [
+        "b/mod_b",
+        "c/mod_b",
+    ]
+    assert registry.get_duplicates(registry.get("mod_a")[0]) == []
+    assert registry.get_addons_paths() == [str(tmp_path / d) for d in ["b", "a", "c"]]
+    # only the first mod_b is needed, unknown names are ignored
+    assert registry.get_addons_paths(["mod_c", "mod_b", "mod_x"]) == [
+        str(tmp_path / d) for d in ["b", "c"]
+    ]
+    assert [
+        m.get_int_name() for m in registry.get_addons_dir_modules(str(tmp_path / "c"))
+    ] == [
+        "mod_b",
+        "mod_c",
+    ]
@@ -0,0 +1,136 @@
+"""tests for the Odoo module discovery walker"""
+
+import os
+import subprocess
+
+from hitchhiker.odoo.walk import (
+    find_manifests,
+    find_manifests_below,
+    find_manifests_git,
+    find_manifests_glob,
+)
+
+
+def create_manifest(path):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "__manifest__.py"), "w") as f:
+        f.write('{"name": "test", "version": "1.0.0"}')
+
+
+def rel_manifests(root, manifests):
+    return [os.path.relpath(m, root) for m in manifests]
+
+
+def test_find_manifests_prune(tmp_path):
+    for path in [
+        "addons/mod_b",
+        "addons/mod_a",
+        "addons/mod_a/tests/nested_mod",
+        "mod_c",
+        ".git/mod",
+        ".hidden/mod",
+        "node_modules/mod",
+        "vendor/mod",
+        "some/deep/dir/mod_d",
+        "env/lib/mod",
+        "__pycache__/mod",
+    ]:
+        create_manifest(tmp_path / path)
+    open(tmp_path / "env" / "pyvenv.cfg", "w").close()
+
+    assert rel_manifests(tmp_path, find_manifests(str(tmp_path))) == [
+        "addons/mod_a/__manifest__.py",
+        "addons/mod_b/__manifest__.py",
+        "mod_c/__manifest__.py",
+        "some/deep/dir/mod_d/__manifest__.py",
+    ]
+    assert rel_manifests(
+        tmp_path, find_manifests(str(tmp_path), exclude=["some/*", "mod_c"])
+    ) == ["addons/mod_a/__manifest__.py", "addons/mod_b/__manifest__.py"]
+
+
+def test_find_manifests_gitignore(tmp_path):
+    for path in ["build/mod", "keep/build/mod", "sub/out/mod", "sub/other/mod"]:
+        create_manifest(tmp_path / path)
+    create_manifest(tmp_path / "logs" / "important")
+    with open(tmp_path / ".gitignore", "w") as f:
+        f.write("# comment\n/build/\nlogs/*\n!logs/important\n")
+    with open(tmp_path / "sub" / ".gitignore", "w") as f:
+        f.write("out\n")
+
+    assert rel_manifests(tmp_path, find_manifests(str(tmp_path))) == [
+        "keep/build/mod/__manifest__.py",
+        "logs/important/__manifest__.py",
+        "sub/other/mod/__manifest__.py",
+    ]
+    assert len(find_manifests(str(tmp_path), gitignore=False)) == 5
+
+
+def test_find_manifests_glob(tmp_path):
+    create_manifest(tmp_path / "a" / "mod")
+    create_manifest(tmp_path / "b" / "mod")
+    create_manifest(tmp_path / "vendor" / "mod")
+
+    walked = find_manifests_glob(f"{tmp_path}/**/__manifest__.py")
+    assert rel_manifests(tmp_path, walked) == [
+        "a/mod/__manifest__.py",
+        "b/mod/__manifest__.py",
+    ]
+    # ignored directories are only skipped on request
+    with open(tmp_path / ".gitignore", "w") as f:
+        f.write("b\n")
+    glob = f"{tmp_path}/**/__manifest__.py"
+    assert find_manifests_glob(glob) == walked
+    assert rel_manifests(tmp_path, find_manifests_glob(glob, gitignore=True)) == [
+        "a/mod/__manifest__.py"
+    ]
+    globbed = find_manifests_glob(f"{tmp_path}/*/mod/__manifest__.py", exclude=["b"])
+    assert sorted(rel_manifests(tmp_path, globbed)) == [
+        "a/mod/__manifest__.py",
+        "vendor/mod/__manifest__.py",
+    ]
+
+
+def test_find_manifests_below(tmp_path):
+    for path in ["sub/a/mod", "sub/b/mod", "ignored/mod", "mod", "mod/tests/nested"]:
+        create_manifest(tmp_path / path)
+    with open(tmp_path / ".gitignore", "w") as f:
+        f.write("ignored\n")
+
+    dirs = []
+    manifests = find_manifests_below(
+        str(tmp_path), str(tmp_path / "sub"), on_dir=dirs.append
+    )
+    assert rel_manifests(tmp_path, manifests) == [
+        "sub/a/mod/__manifest__.py",
+        "sub/b/mod/__manifest__.py",
+    ]
+    assert rel_manifests(tmp_path, dirs) == [
+        "sub",
+        "sub/a",
+        "sub/a/mod",
+        "sub/b",
+        "sub/b/mod",
+    ]
+    assert find_manifests_below(str(tmp_path), str(tmp_path / "ignored")) == []
+    assert find_manifests_below(str(tmp_path), str(tmp_path / "mod" / "tests")) == []
+    assert find_manifests_below(str(tmp_path), str(tmp_path)) == find_manifests(
+        str(tmp_path)
+    )
+
+
+def test_find_manifests_git(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    for path in ["b/mod", "a/mod", "a/mod/A/nested", "vendor/mod", "deleted/mod"]:
+        create_manifest(tmp_path / path)
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    create_manifest(tmp_path / "untracked" / "mod")
+    os.remove(tmp_path / "deleted" / "mod" / "__manifest__.py")
+
+    assert rel_manifests(tmp_path, find_manifests_git(str(tmp_path))) == [
+        "a/mod/__manifest__.py",
+        "b/mod/__manifest__.py",
+    ]
+    assert rel_manifests(tmp_path, find_manifests_git(str(tmp_path), ["b"])) == [
+        "a/mod/__manifest__.py"
+    ]
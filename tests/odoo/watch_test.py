@@ -0,0 +1,138 @@
+"""tests for the addons path watcher"""
+
+import ctypes
+import os
+import shutil
+
+import pytest
+
+from hitchhiker.odoo.watch import AddonsPathWatcher, Inotify
+from tests.cli.modules.mod_fixtures import create_odoo_mod
+
+
+def inotify_available():
+    try:
+        Inotify().close()
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not inotify_available(), reason="inotify is not available"
+            ),
+        ),
+        False,
+    ],
+)
+def test_addons_path_watcher(tmp_path, use_inotify):
+    create_odoo_mod(tmp_path / "addons", "mod_a")
+    create_odoo_mod(tmp_path / "oca" / "repo", "mod_b")
+    root = str(tmp_path)
+    watcher = AddonsPathWatcher(
+        root, gitignore=True, poll_interval=0.1, use_inotify=use_inotify
+    )
+    assert watcher.is_polling() != use_inotify
+    try:
+        assert watcher.scan() == [
+            str(tmp_path / "addons"),
+            str(tmp_path / "oca" / "repo"),
+        ]
+
+        # a module in an existing addons directory does not change the addons path
+        create_odoo_mod(tmp_path / "addons", "mod_c")
+        assert watcher.wait(0.5) is None
+
+        create_odoo_mod(tmp_path / "custom" / "deep", "mod_d")
+        assert watcher.wait(2) == [
+            str(tmp_path / "addons"),
+            str(tmp_path / "custom" / "deep"),
+            str(tmp_path / "oca" / "repo"),
+        ]
+
+        shutil.rmtree(tmp_path / "oca")
+        assert watcher.wait(2) == [
+            str(tmp_path / "addons"),
+            str(tmp_path / "custom" / "deep"),
+        ]
+
+        # ignored and invalid modules are not part of the addons path
+        with open(tmp_path / ".gitignore", "w") as f:
+            f.write("custom\n")
+        assert watcher.wait(2) == [str(tmp_path / "addons")]
+        os.rename(tmp_path / "addons" / "mod_a", tmp_path / "mod_a")
+        create_odoo_mod(tmp_path / "addons", "mod_c", content="[]")
+        assert watcher.wait(2) == [str(tmp_path)]
+    finally:
+        watcher.close()
+
+
+class _Listing:
+    """the result of os.scandir, already read"""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __enter__(self):
+        return iter(self.entries)
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+def test_addons_path_watcher_created_while_walking(tmp_path, monkeypatch):
+    create_odoo_mod(tmp_path / "addons", "mod_a")
+    root = str(tmp_path)
+    scandir = os.scandir
+
+    def racing_scandir(path):
+        entries = list(scandir(path))
+        if path == root:
+            # created after the root was listed, before the walk is finished
+            create_odoo_mod(tmp_path / "custom", "mod_b")
+        return _Listing(entries)
+
+    watcher = AddonsPathWatcher(root)
+    try:
+        monkeypatch.setattr(os, "scandir", racing_scandir)
+        assert watcher.scan() == [str(tmp_path / "addons")]
+        monkeypatch.undo()
+        assert watcher.wait(2) == [str(tmp_path / "addons"), str(tmp_path / "custom")]
+    finally:
+        watcher.close()
+
+
+def test_addons_path_watcher_no_libc(tmp_path, monkeypatch):
+    def no_libc(name, *args, **kwargs):
+        # what CDLL(None) does where find_library("c") finds nothing (Windows)
+        raise TypeError("LoadLibrary() argument 1 must be str, not None")
+
+    monkeypatch.setattr(ctypes, "CDLL", no_libc)
+    with pytest.raises(OSError, match="inotify is not available"):
+        Inotify()
+    create_odoo_mod(tmp_path / "addons", "mod_a")
+    watcher = AddonsPathWatcher(str(tmp_path), poll_interval=0.1)
+    assert watcher.is_polling()
+    assert watcher.scan() == [str(tmp_path / "addons")]
+
+
+def test_addons_path_watcher_targets(tmp_path):
+    create_odoo_mod(tmp_path / "addons", "mod_a", depends=["mod_b"])
+    create_odoo_mod(tmp_path / "oca", "mod_b")
+    create_odoo_mod(tmp_path / "other", "mod_c")
+    watcher = AddonsPathWatcher(
+        str(tmp_path), poll_interval=0.1, use_inotify=False, targets=["mod_a"]
+    )
+    try:
+        assert watcher.scan() == [str(tmp_path / "addons"), str(tmp_path / "oca")]
+
+        create_odoo_mod(tmp_path / "addons", "mod_a", depends=["mod_c"])
+        assert watcher.wait(2) == [str(tmp_path / "addons"), str(tmp_path / "other")]
+    finally:
+        watcher.close()
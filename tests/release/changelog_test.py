@@ -0,0 +1,51 @@
+"""tests for the changelog generator"""
+
+import pytest
+
+changelog = pytest.importorskip("hitchhiker.release.changelog")
+conventional = pytest.importorskip("hitchhiker.release.commitparser.conventional")
+history = pytest.importorskip("hitchhiker.release.version.history")
+semver = pytest.importorskip("hitchhiker.release.version.semver")
+
+
+def test_gen_changelog_order():
+    messages = [
+        "not conventional",
+        "docs: readme",
+        "fix: bug",
+        "chore: deps",
+        "feat: thing",
+        "fix!: api",
+    ]
+    commits = [
+        history.HistoryCommit(f"{i:040x}", msg, []) for i, msg in enumerate(messages)
+    ]
+    version = semver.Version().parse("1.0.0")
+    project = {"name": "project1", "version": version}
+    parsed = {}
+    out = changelog.gen_changelog(
+        {"project1": (version, commits)},
+        version,
+        [project],
+        [project],
+        parsed_commits=parsed,
+    )
+    assert out.split("### project1 (v1.0.0)\n")[1] == (
+        "#### breaking\n- fix!: api\n"
+        "#### feat\n- feat: thing\n"
+        "#### fix\n- fix: bug\n"
+        "#### docs\n- docs: readme\n"
+        "#### chore\n- chore: deps\n"
+        "#### unknown\n- not conventional\n"
+    )
+    assert sorted(parsed.keys()) == sorted(c.hexsha for c in commits)
+
+
+def test_gen_changelog_memo():
+    commit = history.HistoryCommit("0" * 40, "fix: bug", [])
+    memo = {commit.hexsha: conventional.ConventionalCommitParser("feat: cached")}
+    version = semver.Version().parse("1.0.0")
+    out = changelog.gen_changelog(
+        {"project1": (version, [commit])}, version, [], [], parsed_commits=memo
+    )
+    assert "#### feat\n- feat: cached\n" in out
@@ -174,3 +174,28 @@ def test_conventional_commit_parser():
         assert commit.get_body() == ex["get_body"]
         assert commit.get_footers() == ex["get_footers"]
         assert commit.get_version_bump() == ex["get_version_bump"]
+
+
+def test_conventional_commit_parser_parse_many():
+    """test for ConventionalCommitParser.parse_many"""
+    commits = conventional.ConventionalCommitParser.parse_many(
+        [ex["input"] for ex in expect]
+    )
+    assert len(commits) == len(expect)
+    for commit, ex in zip(commits, expect):
+        assert commit.is_conventional == ex["is_conventional"]
+        assert commit.get_body() == ex["get_body"]
+        assert commit.get_footers() == ex["get_footers"]
+        assert commit.get_version_bump() == ex["get_version_bump"]
+
+
+def test_conventional_commit_parser_large_body():
+    """the body and footers of large commit messages are split in linear time"""
+    lines = [f"line {i} of a generated commit body" for i in range(100000)]
+    footer = [f"Refs: {i}" for i in range(1000)]
+    commit = conventional.ConventionalCommitParser(
+        "\n".join(["feat: large", *lines, *footer, "BREAKING CHANGE: yes"])
+    )
+    assert commit.breaking
+    assert commit.get_body() == "".join(f"{line}\n" for line in lines)
+    assert len(commit.get_footers()) == 1001
@@ -0,0 +1,30 @@
+"""tests for the PathTrie class"""
+
+from hitchhiker.release.pathtrie import PathTrie
+
+
+def test_pathtrie():
+    trie = PathTrie()
+    trie.add("project1/", "project1")
+    trie.add("./project2", "project2")
+    trie.add("project2/sub//", "sub")
+    trie.add("project", "project")
+    trie.add(".", "root")
+    trie.add("/abs", "abs")
+
+    assert trie.match("project1/file.py") == ["project1"]
+    assert trie.match("project1/a/b/c/file.py") == ["project1"]
+    assert trie.match("project1") == []
+    assert trie.match("project10/file.py") == []
+    assert trie.match("project2/sub/file.py") == ["project2", "sub"]
+    assert trie.match("project2/subfile.py") == ["project2"]
+    assert trie.match("file.py") == []
+    assert trie.match("abs/file.py") == []
+
+
+def test_pathtrie_normalize():
+    assert PathTrie.normalize("project1/") == "project1"
+    assert PathTrie.normalize("./a//b/./c/") == "a/b/c"
+    assert PathTrie.normalize(".") is None
+    assert PathTrie.normalize("") is None
+    assert PathTrie.normalize("/abs") is None
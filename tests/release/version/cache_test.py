@@ -0,0 +1,75 @@
+"""tests for the CommitCache class"""
+
+import json
+import os
+
+import pytest
+
+import hitchhiker.release.enums as enums
+from hitchhiker.release.version.cache import CommitCache
+
+
+def test_commit_cache_roundtrip(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cache") / "hitchhiker" / "commits.json"
+    cache = CommitCache(str(path))
+    assert cache.get("abcd") is None
+    cache.set("abcd", ["a/b.py", "c.py"], enums.VersionBump.MINOR)
+    cache.save()
+
+    cache = CommitCache(str(path))
+    assert cache.get("abcd") == (["a/b.py", "c.py"], enums.VersionBump.MINOR)
+    assert cache.get("efgh") is None
+
+
+def test_commit_cache_version_mismatch(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cache") / "commits.json"
+    with open(path, "w") as f:
+        f.write(json.dumps({"version": -1, "entries": {"abcd": [["x"], 3]}}))
+    assert CommitCache(str(path)).get("abcd") is None
+
+    with open(path, "w") as f:
+        f.write("{this is not json")
+    assert CommitCache(str(path)).get("abcd") is None
+
+
+def test_commit_cache_eviction(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cache") / "commits.json"
+    cache = CommitCache(str(path), max_entries=2)
+    cache.set("1", [], enums.VersionBump.NONE)
+    cache.set("2", [], enums.VersionBump.PATCH)
+    cache.get("1")
+    cache.set("3", [], enums.VersionBump.MAJOR)
+    cache.save()
+
+    cache = CommitCache(str(path), max_entries=2)
+    assert cache.get("1") == ([], enums.VersionBump.NONE)
+    assert cache.get("2") is None
+    assert cache.get("3") == ([], enums.VersionBump.MAJOR)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() == 0,
+    reason="permissions are not enforced for root",
+)
+def test_commit_cache_read_only(tmp_path_factory):
+    cachedir = tmp_path_factory.mktemp("cache")
+    cache = CommitCache(str(cachedir / "commits.json"))
+    cache.set("abcd", [], enums.VersionBump.NONE)
+    os.chmod(cachedir, 0o555)
+    try:
+        with pytest.warns(UserWarning, match="cannot write the commit cache"):
+            cache.save()
+        assert os.listdir(cachedir) == []
+    finally:
+        os.chmod(cachedir, 0o755)
+
+
+def test_commit_cache_write_error(tmp_path_factory):
+    cachedir = tmp_path_factory.mktemp("cache")
+    # the cache file cannot be replaced by the temporary file
+    os.mkdir(cachedir / "commits.json")
+    cache = CommitCache(str(cachedir / "commits.json"))
+    cache.set("abcd", [], enums.VersionBump.NONE)
+    with pytest.warns(UserWarning, match="cannot write the commit cache"):
+        cache.save()
+    assert os.listdir(cachedir) == ["commits.json"]
@@ -0,0 +1,95 @@
+"""tests for the release commit index"""
+
+import os
+
+import pytest
+
+from tests.cli.release.git_fixtures import *  # noqa: F403, F401
+
+conf = pytest.importorskip("hitchhiker.cli.release.config")
+commit = pytest.importorskip("hitchhiker.release.version.commit")
+enums = pytest.importorskip("hitchhiker.release.enums")
+history = pytest.importorskip("hitchhiker.release.version.history")
+
+
+def test_commit_index_shared(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    config = conf.create_context_from_raw_config(
+        os.path.join(repo.working_tree_dir, "pyproject.toml"), repo, False
+    )
+    results = {
+        project["name"]: commit.find_next_version(config, project, False)
+        for project in config["projects"]
+    }
+    assert list(config["commit_index"].keys()) == [False]
+    assert len(config["commit_index"][False]) == 2
+
+    assert results["project1"][0] == enums.VersionBump.PATCH
+    assert results["project2"][0] == enums.VersionBump.PATCH
+    assert results["1another_project"][0] == enums.VersionBump.NONE
+    assert results["2another_project"][0] == enums.VersionBump.NONE
+    assert [str(c.message).strip() for c, _ in results["project1"][1]] == [
+        "fix: something"
+    ]
+    assert all(f.startswith("project1/") for f in results["project1"][1][0][1])
+
+
+def test_commit_index_cached(repo_multi_project_commits):
+    repo = repo_multi_project_commits
+    cfgpath = os.path.join(repo.working_tree_dir, "pyproject.toml")
+    config = conf.create_context_from_raw_config(cfgpath, repo, False)
+    expected = [
+        commit.find_next_version(config, project, False)[0]
+        for project in config["projects"]
+    ]
+    assert os.path.isfile(os.path.join(repo.git_dir, "hitchhiker", "commits.json"))
+
+    config = conf.create_context_from_raw_config(cfgpath, repo, False)
+    for sha in [c.hexsha for c in repo.iter_commits()]:
+        assert config["commit_cache"].get(sha) is not None
+    assert [
+        commit.find_next_version(config, project, False)[0]
+        for project in config["projects"]
+    ] == expected
+
+
+def test_commit_index_cached_not_diffed(repo_multi_project_commits, monkeypatch):
+    repo = repo_multi_project_commits
+    cfgpath = os.path.join(repo.working_tree_dir, "pyproject.toml")
+    config = conf.create_context_from_raw_config(cfgpath, repo, False)
+    expected = commit._get_commit_index(config, False)
+
+    create_commits(repo, [["feat: new", "project1"]])  # noqa: F405
+    diffed = []
+    iter_git = history._iter_git
+
+    def record(workdir, args, sep, stdin=None):
+        if "--name-only" in args:
+            diffed.append(stdin.decode("ascii").split() if stdin else args)
+        return iter_git(workdir, args, sep, stdin)
+
+    monkeypatch.setattr(history, "_iter_git", record)
+    config = conf.create_context_from_raw_config(cfgpath, repo, False)
+    index = commit._get_commit_index(config, False)
+    # only the new commit is diffed, the others are read from the cache
+    assert diffed == [[repo.head.commit.hexsha]]
+    assert index[:-1] == expected
+    assert len(index[-1][0].paths) == 10
+    assert index[-1][1] == enums.VersionBump.MINOR
+
+
+def test_commit_index_nearest_tag(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.tag("v0.5.0", "HEAD~1", m="v0.5.0")
+    config = conf.create_context_from_raw_config(
+        os.path.join(repo.working_tree_dir, "pyproject.toml"), repo, False
+    )
+    config["commit_cache"] = None
+    project1 = [p for p in config["projects"] if p["name"] == "project1"][0]
+    assert commit.find_next_version(config, project1, False) == (
+        enums.VersionBump.NONE,
+        [],
+    )
+    assert [c.message.strip() for c, _ in config["commit_index"][False]] == [
+        "fix: something else"
+    ]
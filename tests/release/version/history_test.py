@@ -0,0 +1,102 @@
+"""tests for the git history reader"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.cli.release.git_fixtures import *  # noqa: F403, F401
+
+history = pytest.importorskip("hitchhiker.release.version.history")
+
+
+def test_iter_history(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.commit("--allow-empty", m="chore: empty")
+    repo.git.commit("--allow-empty", "--allow-empty-message", m="")
+
+    commits = list(history.iter_history(repo.working_tree_dir, ["HEAD"]))
+    assert [c.hexsha for c in commits] == [c.hexsha for c in repo.iter_commits()]
+    assert [c.message for c in commits] == [str(c.message) for c in repo.iter_commits()]
+    assert commits[0].paths == []
+    assert commits[1].paths == []
+    assert len(commits[2].paths) == 10
+    assert all(p.startswith("project2/") for p in commits[2].paths)
+    assert "pyproject.toml" in commits[-1].paths
+
+    commits = list(history.iter_history(repo.working_tree_dir, ["HEAD", "^v1.0.0"]))
+    assert [c.message.strip() for c in commits] == [
+        "",
+        "chore: empty",
+        "fix: something else",
+        "fix: something",
+    ]
+
+
+def test_iter_messages(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.commit("--allow-empty", "--allow-empty-message", m="")
+
+    commits = list(history.iter_history(repo.working_tree_dir, ["HEAD"]))
+    assert list(history.iter_messages(repo.working_tree_dir, ["HEAD"])) == [
+        (c.hexsha, c.message) for c in commits
+    ]
+
+
+def test_iter_history_merge(repo_one_fix):
+    repo = repo_one_fix
+    repo.git.checkout("-b", "feature", "HEAD~1")
+    create_commits(repo, [["feat: on branch", "project1"]])  # noqa: F405
+    repo.git.checkout("main")
+    repo.git.merge("feature", "--no-ff", m="Merge feature")
+
+    commits = list(history.iter_history(repo.working_tree_dir, ["HEAD"]))
+    assert commits[0].message.strip() == "Merge feature"
+    assert len(commits[0].paths) == 10
+    assert all(p.startswith("project1/") for p in commits[0].paths)
+
+
+def test_iter_history_close(repo_multi_project_commits):
+    repo = repo_multi_project_commits
+    commits = history.iter_history(repo.working_tree_dir, ["HEAD"])
+    assert next(commits).hexsha == repo.head.commit.hexsha
+    commits.close()
+
+
+def test_iter_history_error(repo_empty):
+    with pytest.raises(
+        subprocess.CalledProcessError, match="returned non-zero exit status 128"
+    ) as e:
+        list(history.iter_history(repo_empty.working_tree_dir, ["doesnotexist"]))
+    assert "doesnotexist" in e.value.stderr
+
+
+def test_iter_git_stderr(tmp_path, monkeypatch):
+    # more warnings than fit into a pipe must not block git
+    script = "import sys; sys.stderr.write('w' * 1000000); sys.stdout.write('a\\0b\\0')"
+    with open(tmp_path / "git", "w") as f:
+        f.write(f"#!{sys.executable}\n{script}\n")
+    os.chmod(tmp_path / "git", 0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    assert list(history._iter_git(str(tmp_path), [], b"\0")) == [b"a", b"b"]
+
+
+def test_iter_revisions(repo_multi_project_commits):
+    repo = repo_multi_project_commits
+    assert list(history.iter_revisions(repo.working_tree_dir, ["HEAD"])) == [
+        c.hexsha for c in repo.iter_commits()
+    ]
+    revisions = history.iter_revisions(repo.working_tree_dir, ["HEAD"])
+    assert next(revisions) == repo.head.commit.hexsha
+    revisions.close()
+
+
+def test_read_history_parallel(repo_multi_project_commits, monkeypatch):
+    repo = repo_multi_project_commits
+    expected = list(history.iter_history(repo.working_tree_dir, ["HEAD"]))
+    assert history.read_history(repo.working_tree_dir, ["HEAD"], 4) == expected
+
+    monkeypatch.setattr(history, "_MIN_COMMITS_PER_JOB", 1)
+    assert history.read_history(repo.working_tree_dir, ["HEAD"], 4) == expected
+    assert history.read_history(repo.working_tree_dir, ["HEAD~2"], 2) == expected[2:]
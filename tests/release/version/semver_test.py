@@ -1,4 +1,5 @@
 """tests for the Version class"""
+
 import hitchhiker.release.version.semver as semver
 import hitchhiker.release.enums as enums
 
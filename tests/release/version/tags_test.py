@@ -0,0 +1,90 @@
+"""tests for the TagIndex class"""
+
+import pytest
+
+from tests.cli.release.git_fixtures import *  # noqa: F403, F401
+
+tags = pytest.importorskip("hitchhiker.release.version.tags")
+
+
+def test_tag_index(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.tag("v1.1.0-rc.1")
+    repo.git.tag("not-a-version", m="not-a-version")
+    config = {"repo": repo, "prepend_branch_to_tag": False}
+
+    index = tags.TagIndex.from_repo(config)
+    assert [t.name for t in index.tags] == ["v1.1.0-rc.1", "v1.0.0", "v0.0.0"]
+    assert list(index.by_branch.keys()) == [None]
+    assert index.tags[0].commit_sha == repo.head.commit.hexsha
+    assert index.tags[1].commit_sha == repo.commit("v1.0.0").hexsha
+    assert index.tags[2].commit_sha == repo.commit("v0.0.0").hexsha
+    assert index.commit_shas(False) == {
+        repo.commit("v1.0.0").hexsha,
+        repo.commit("v0.0.0").hexsha,
+    }
+    assert len(index.commit_shas(True)) == 3
+
+
+def test_tag_index_branches(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.tag("main-v1.0.1", m="main-v1.0.1")
+    repo.git.tag("develop-v1.1.0", "HEAD~1", m="develop-v1.1.0")
+    config = {"repo": repo, "prepend_branch_to_tag": True}
+
+    index = tags.TagIndex.from_repo(config)
+    assert [t.name for t in index.by_branch["main"]] == ["main-v1.0.1"]
+    assert [t.name for t in index.by_branch["develop"]] == ["develop-v1.1.0"]
+    assert [t.name for t in index.by_branch[None]] == ["v1.0.0", "v0.0.0"]
+    assert index.commit_shas(False, "main") == {
+        repo.head.commit.hexsha,
+        repo.commit("v1.0.0").hexsha,
+        repo.commit("v0.0.0").hexsha,
+    }
+    assert repo.head.commit.hexsha not in index.commit_shas(False, "develop")
+
+
+def test_tag_index_hyphenated_branch(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.checkout("-b", "release-16")
+    repo.git.tag("release-16-v1.0.1", m="release-16-v1.0.1")
+    repo.git.tag("feature-x-v1.1.0", "HEAD~1")
+    config = {"repo": repo, "prepend_branch_to_tag": True}
+
+    index = tags.TagIndex.from_repo(config)
+    assert [t.name for t in index.by_branch["release-16"]] == ["release-16-v1.0.1"]
+    assert str(index.by_branch["release-16"][0].version) == "1.0.1"
+    assert [t.name for t in index.by_branch["feature-x"]] == ["feature-x-v1.1.0"]
+    assert repo.head.commit.hexsha in index.commit_shas(False, "release-16")
+
+
+def test_tag_index_warns(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.checkout("-b", "release-16")
+    repo.git.tag("release-16-garbage")
+    repo.git.tag("other-garbage")
+    config = {"repo": repo, "prepend_branch_to_tag": True}
+
+    with pytest.warns(UserWarning, match="ignoring tag release-16-garbage") as record:
+        index = tags.TagIndex.from_repo(config)
+    assert len(record) == 1
+    assert [t.name for t in index.tags] == ["v1.0.0", "v0.0.0"]
+
+
+def test_tag_index_nested_tags(repo_multi_project_commits_before_tag_fix_after):
+    repo = repo_multi_project_commits_before_tag_fix_after
+    repo.git.tag("v1.0.1-rc.1", "HEAD~1", m="v1.0.1-rc.1")
+    repo.git.tag("v1.0.1", "v1.0.1-rc.1", m="v1.0.1")
+    repo.git.tag("v1.0.2", "v1.0.1", m="v1.0.2")
+    repo.git.tag("v2.0.0", "HEAD^{tree}")
+    config = {"repo": repo, "prepend_branch_to_tag": False}
+
+    index = tags.TagIndex.from_repo(config)
+    sha = repo.commit("HEAD~1").hexsha
+    assert {t.name: t.commit_sha for t in index.tags if t.name.startswith("v1.0.")} == {
+        "v1.0.2": sha,
+        "v1.0.1": sha,
+        "v1.0.1-rc.1": sha,
+        "v1.0.0": repo.commit("v1.0.0").hexsha,
+    }
+    assert "v2.0.0" not in [t.name for t in index.tags]